@@ -1,3 +1,4 @@
+from .clock import Clock, WallClock, MonotonicClock, VirtualClock
 from .dispatcher import Dispatcher
 from .elevator import Elevator
 from .models import ElevatorState, DoorState, MoveDirection, Task, MoveRequest
@@ -5,6 +6,10 @@ from .simulator import Simulator
 from .utility import find_available_port
 
 __all__ = [
+    "Clock",
+    "WallClock",
+    "MonotonicClock",
+    "VirtualClock",
     "Dispatcher",
     "Elevator",
     "ElevatorState",
@@ -5,11 +5,13 @@ from backend.models import (
     MoveDirection,
 )  # Assuming this is the correct import for MoveDirection
 from ..models import (
+    BuildingConfig,
+    DEFAULT_BUILDING,
     validate_floor,
     validate_elevator_id,
-    MIN_FLOOR,
-    MAX_FLOOR,
 )
+from ..eta import TABLE_DIRECTIONS, estimate_table, estimate_time
+from ..fleet import numpy_available
 from .zmq import (
     ZmqClientThread,
 )  # Changed from ZmqCoordinator and other specific command/error types
@@ -62,6 +64,8 @@ class ElevatorAPI:
         - open_door#1
         - close_door#1
         - reset
+        - step@500 (lockstep mode: advance simulated time by 500 ms)
+        - eta_table (answered with eta_table@{JSON of fetch_eta_table()})
         """
         print(f"API: Received command: {command}")
 
@@ -153,6 +157,24 @@ class ElevatorAPI:
                 # However, if a success message is desired: return "system_reset_acknowledged" or similar.
                 return None
 
+            elif operation_full == "step":
+                if not args_str:  # Ensure duration is provided
+                    return self._format_failure_for_zmq(
+                        command, "Missing duration for step command"
+                    )
+                milliseconds = int(args_str)
+                response_dict = self._handle_step(milliseconds)
+                if response_dict.get("status") == "error":
+                    return self._format_failure_for_zmq(
+                        command, response_dict.get("message", "step_failed")
+                    )
+                # Messages emitted inside the window were already sent in order;
+                # this acknowledgement closes the window.
+                return f"step_done@{response_dict['time_ms']}"
+
+            elif operation_full == "eta_table":
+                return f"eta_table@{json.dumps(self.fetch_eta_table())}"
+
             else:
                 return self._format_failure_for_zmq(
                     command, f"Unknown operation: {operation_full}"
@@ -192,8 +214,25 @@ class ElevatorAPI:
         self.zmq_client.join()  # Wait for the thread to finish
         print("Elevator: ZMQ client stopped.")
 
+    def _notify_world(self) -> None:
+        """Wake the simulation event loop after a command changed elevator state."""
+        if self.world:
+            self.world.notify()
+
     # Internal handlers, previously part of Dispatcher or direct calls from old API methods
     # Modified to return Dict instead of JSON string
+    def _building_config(self) -> BuildingConfig:
+        """Building geometry of the attached world (the default building if it has none)."""
+        config = getattr(self.world, "config", None)
+        return config if isinstance(config, BuildingConfig) else DEFAULT_BUILDING
+
+    def _invalid_floor_message(self, floor: int, config: BuildingConfig) -> str:
+        message = f"Invalid floor: {floor}. Must be between {config.min_floor} and {config.max_floor}"
+        if config.skipped_floors:
+            skipped = ", ".join(str(f) for f in sorted(config.skipped_floors))
+            message += f" (excluding {skipped})"
+        return message
+
     def _handle_call_elevator(self, floor: int, direction: str) -> Dict[str, Any]:
         """Internal handler for elevator calls from a floor."""
         if not self.world or not self.world.dispatcher:
@@ -201,10 +240,11 @@ class ElevatorAPI:
                 "status": "error",
                 "message": "World or Dispatcher not initialized",
             }  # Validate floor bounds
-        if not validate_floor(floor):
+        config = self._building_config()
+        if not validate_floor(floor, config):
             return {
                 "status": "error",
-                "message": f"Invalid floor: {floor}. Must be between {MIN_FLOOR} and {MAX_FLOOR}",
+                "message": self._invalid_floor_message(floor, config),
             }
 
         print(f"API: Calling elevator at floor {floor}, direction {direction}")
@@ -212,6 +252,7 @@ class ElevatorAPI:
         # but rather queues the request. So, we assume success at this stage if no exceptions.
         try:
             self.world.dispatcher.add_call(floor, direction)
+            self._notify_world()
             return {
                 "status": "success",
                 "action": "call_elevator",
@@ -225,15 +266,16 @@ class ElevatorAPI:
         if not self.world or not self.world.dispatcher:
             return {"status": "error", "message": "World or Dispatcher not initialized"}
         # Validate floor bounds
-        if not validate_floor(floor):
+        config = self._building_config()
+        if not validate_floor(floor, config):
             return {
                 "status": "error",
-                "message": f"Invalid floor: {floor}. Must be between {MIN_FLOOR} and {MAX_FLOOR}",
+                "message": self._invalid_floor_message(floor, config),
             }  # Validate elevator ID
-        if not validate_elevator_id(elevator_id):
+        if not validate_elevator_id(elevator_id, config):
             return {
                 "status": "error",
-                "message": f"Invalid elevator ID: {elevator_id}. Must be between 1 and 2",
+                "message": f"Invalid elevator ID: {elevator_id}. Must be between 1 and {config.max_elevator_id}",
             }
 
         print(f"API: Elevator {elevator_id} selecting floor {floor}")
@@ -241,6 +283,7 @@ class ElevatorAPI:
             # Dispatcher's add_target_task expects 0-based elevator_idx
             # For inside calls, call_id should be None
             self.world.dispatcher.assign_task(elevator_id - 1, floor, None)
+            self._notify_world()
             return {
                 "status": "success",
                 "action": "select_floor",
@@ -262,6 +305,7 @@ class ElevatorAPI:
                 self.world.elevators[
                     elevator_id - 1
                 ].open_door()  # Assume this might raise an error or return status
+                self._notify_world()
                 return {
                     "status": "success",
                     "action": "open_door",
@@ -286,6 +330,7 @@ class ElevatorAPI:
                 self.world.elevators[
                     elevator_id - 1
                 ].close_door()  # Assume this might raise an error or return status
+                self._notify_world()
                 return {
                     "status": "success",
                     "action": "close_door",
@@ -310,6 +355,7 @@ class ElevatorAPI:
                 elevator.reset()
             if self.world.dispatcher:
                 self.world.dispatcher.reset()  # Assuming dispatcher has a reset method
+            self._notify_world()
             return {
                 "status": "success",
                 "action": "reset",
@@ -321,6 +367,26 @@ class ElevatorAPI:
                 "message": f"Failed to reset simulation: {str(e)}",
             }
 
+    def _handle_step(self, milliseconds: int) -> Dict[str, Any]:
+        """Internal handler for advancing a lockstep simulation by a fixed amount of time."""
+        if not self.world:
+            return {"status": "error", "message": "World not initialized"}
+        if milliseconds < 0:
+            return {
+                "status": "error",
+                "message": f"Invalid step duration: {milliseconds}. Must be non-negative",
+            }
+        try:
+            self.world.step(milliseconds / 1000.0)
+        except RuntimeError as e:
+            return {"status": "error", "message": str(e)}
+        self._notify_world()
+        return {
+            "status": "success",
+            "action": "step",
+            "time_ms": int(round(self.world.clock.now() * 1000)),
+        }
+
     # Methods to send messages/updates to the ZMQ client (test server)
     # These are now called by the ZmqClientThread directly if _parse_and_execute returns a message,
     # or can be called by other parts of the system (e.g. Simulator for floor_arrived)
@@ -477,3 +543,35 @@ class ElevatorAPI:
 
             elevator_states.append(elevator_state)
         return elevator_states
+
+    def fetch_eta_table(self) -> Dict[str, Any]:
+        """Get the estimated arrival time of every elevator for every hall call.
+
+        "up" and "down" hold one row per floor (in the order of "floors") with
+        the time in seconds of each elevator (in the order of "elevator_ids")
+        to answer a call in that direction. Computed in one vectorized pass
+        when NumPy is available.
+        """
+        table: Dict[str, Any] = {"floors": [], "elevator_ids": [], "up": [], "down": []}
+
+        if not self.world:
+            print("API: World not initialized, cannot fetch ETA table.")
+            return table
+
+        floors = self._building_config().floors
+        snapshots = [elevator.snapshot() for elevator in self.world.elevators]
+        if numpy_available():
+            etas = estimate_table(snapshots, floors).tolist()
+        else:
+            etas = [
+                [[estimate_time(s, floor, d) for d in TABLE_DIRECTIONS] for floor in floors]
+                for s in snapshots
+            ]
+
+        table["floors"] = list(floors)
+        table["elevator_ids"] = [s.elevator_id for s in snapshots]
+        for d, direction in enumerate(TABLE_DIRECTIONS):
+            table[direction.value] = [
+                [car[j][d] for car in etas] for j in range(len(floors))
+            ]
+        return table
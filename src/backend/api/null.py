@@ -0,0 +1,27 @@
+"""ElevatorAPI stand-in for simulations that must not send messages."""
+
+from typing import Optional
+
+from ..models import MoveDirection
+
+
+class NullAPI:
+    """ElevatorAPI stand-in that drops every outgoing message.
+
+    Used by simulator copies (Simulator.clone), so rollouts never reach ZMQ,
+    and by the benchmarks.
+    """
+
+    def send_door_opened_message(self, elevator_id: int) -> None:
+        pass
+
+    def send_door_closed_message(self, elevator_id: int) -> None:
+        pass
+
+    def send_floor_arrived_message(
+        self, elevator_id: int, floor: int, direction: Optional[MoveDirection]
+    ) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
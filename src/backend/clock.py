@@ -0,0 +1,136 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class Clock(ABC):
+    """Source of simulation time shared by the simulator and its components.
+
+    All timing decisions (door timers, floor travel, arrival delays) read time
+    through a Clock instead of calling time.time() directly, so the same code can
+    run against real time or against a virtual timeline.
+    """
+
+    @abstractmethod
+    def now(self) -> float:
+        """Return the current time in seconds."""
+
+    @abstractmethod
+    def sleep(self, seconds: float) -> None:
+        """Let `seconds` of clock time pass."""
+
+    def wait(self, event: threading.Event, timeout: Optional[float]) -> bool:
+        """Block until `event` is set or `timeout` seconds of clock time pass.
+
+        Returns True if the event was set. A timeout of None waits for the event only.
+        """
+        return event.wait(timeout)
+
+
+class SteppableClock(Clock):
+    """Clock that can skip time, as lockstep stepping and fast-forward need."""
+
+    @abstractmethod
+    def advance_to(self, timestamp: float) -> float:
+        """Jump forward to `timestamp` (no-op if already past it) and return the new time."""
+
+
+class WallClock(Clock):
+    """Wall-clock time (time.time). Default for standalone components."""
+
+    def now(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class MonotonicClock(Clock):
+    """Real time that never jumps backwards (immune to NTP clock steps)."""
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class ScaledClock(SteppableClock):
+    """Monotonic real time running `scale` times faster, with forward jumps.
+
+    A scale of 10 plays ten simulated seconds per real second. advance_to()
+    skips dead time (fast-forward) without affecting the pace afterwards.
+    """
+
+    def __init__(self, scale: float = 1.0) -> None:
+        if scale <= 0:
+            raise ValueError("Time scale must be positive")
+        self.scale: float = scale
+        self._origin: float = time.monotonic()
+        self._offset: float = 0.0
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return (time.monotonic() - self._origin) * self.scale + self._offset
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds / self.scale)
+
+    def wait(self, event: threading.Event, timeout: Optional[float]) -> bool:
+        return event.wait(None if timeout is None else timeout / self.scale)
+
+    def advance_to(self, timestamp: float) -> float:
+        with self._lock:
+            current = self.now()
+            if timestamp > current:
+                self._offset += timestamp - current
+                current = timestamp
+            return current
+
+
+class VirtualClock(SteppableClock):
+    """Manually driven clock. Time only moves when advance() or sleep() is called."""
+
+    def __init__(self, start: float = 0.0) -> None:
+        self._now: float = start
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> float:
+        """Move the clock forward by `seconds` and return the new time."""
+        if seconds < 0:
+            raise ValueError("Virtual clock cannot move backwards")
+        with self._lock:
+            self._now += seconds
+            return self._now
+
+    def advance_to(self, timestamp: float) -> float:
+        """Move the clock forward to `timestamp` (no-op if already past it)."""
+        with self._lock:
+            if timestamp > self._now:
+                self._now = timestamp
+            return self._now
+
+    def sleep(self, seconds: float) -> None:
+        # Sleeping on a virtual clock just advances it; nothing blocks.
+        if seconds > 0:
+            self.advance(seconds)
+
+    def __getstate__(self) -> dict:
+        return {"_now": self._now}  # The lock is not picklable
+
+    def __setstate__(self, state: dict) -> None:
+        self._now = state["_now"]
+        self._lock = threading.Lock()
+
+    def wait(self, event: threading.Event, timeout: Optional[float]) -> bool:
+        # Jump straight to the timeout unless something is already waiting to be handled
+        if not event.is_set() and timeout is not None:
+            self.sleep(timeout)
+        return event.is_set()
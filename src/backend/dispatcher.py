@@ -1,23 +1,80 @@
-from typing import List, Optional, TYPE_CHECKING, Tuple, Dict, Any
-from uuid import uuid4
-from .models import ElevatorState, DoorState, MoveDirection, Task, CallState, Call
+import contextlib
+import copy
+from typing import ContextManager, List, Optional, Sequence, TYPE_CHECKING, Tuple, Dict, Any
+from .clock import Clock, WallClock
+from .models import ElevatorState, DoorState, MoveDirection, Task, CallState, Call, CallAssignment
+from .models import CallId, CallIdAllocator
+from .models import BuildingConfig, DEFAULT_BUILDING
+from .assignment import min_cost_assignment
 from .elevator import Elevator
+from .fleet import numpy_available
+from .strategies import DispatchStrategy, create_strategy
+from .task_queue import TaskQueue
 
 
 if TYPE_CHECKING:
     from .simulator import Simulator
     from .api.core import ElevatorAPI  # Added API import
+    from .rollout import RolloutPlanner
 
 
 class Dispatcher:
     # Added api parameter to __init__
-    def __init__(self, world: "Simulator", api: "ElevatorAPI") -> None:
+    def __init__(
+        self,
+        world: "Simulator",
+        api: "ElevatorAPI",
+        clock: Optional[Clock] = None,
+        config: Optional[BuildingConfig] = None,
+        call_ids: Optional[CallIdAllocator] = None,
+        batch_assignment: bool = False,
+        strategy: Optional[DispatchStrategy] = None,
+        en_route_pickup: Optional[bool] = None,
+        rollout: Optional["RolloutPlanner"] = None,
+        elevator_indices: Optional[Sequence[int]] = None,
+    ) -> None:
+        if batch_assignment and not numpy_available():
+            raise ImportError("Batch call assignment requires NumPy (pip install .[fast])")
         self.world: "Simulator" = world
         self.api: "ElevatorAPI" = api  # Store API instance
-        self.pending_calls: Dict[str, Call] = {}  # {call_id: Call}
-        self.all_calls_log: Dict[str, Call] = {} # Log of all calls
+        self.clock: Clock = clock if clock is not None else WallClock()
+        self.config: BuildingConfig = config if config is not None else DEFAULT_BUILDING
+        # Source of call ids; give side-by-side simulators distinct prefixes
+        self.call_ids: CallIdAllocator = call_ids if call_ids is not None else CallIdAllocator()
+        self.pending_calls: Dict[CallId, Call] = {}  # {call_id: Call}
+        self.all_calls_log: Dict[CallId, Call] = {} # Log of all calls
+        # Calls not yet assigned to an elevator, in arrival order
+        self.waiting: Dict[CallId, Call] = {}
+        # Assigned outside calls by call_id, until they are completed
+        self.call_index: Dict[CallId, CallAssignment] = {}
+        # Active hall calls by (floor, direction), until they are completed
+        self.hall_calls: Dict[Tuple[int, MoveDirection], CallId] = {}
+        # Assign waiting hall calls together by minimum-cost matching instead of one by one
+        self.batch_assignment: bool = batch_assignment
+        # Which cars may take a call and how they rank; defaults to the building's strategy
+        self.strategy: DispatchStrategy = (
+            strategy if strategy is not None else create_strategy(self.config.dispatch_strategy)
+        )
+        # Let cars on their way take hall calls ahead of them in their direction
+        self.en_route_pickup: bool = (
+            en_route_pickup if en_route_pickup is not None else self.config.en_route_pickup
+        )
+        # Choose between suitable cars by simulating each choice ahead (greedy mode only)
+        self.rollout: Optional["RolloutPlanner"] = rollout
+        # Indices of the cars this dispatcher gives hall calls to (one zone's cars); None for all
+        self.elevator_indices: Optional[List[int]] = (
+            list(elevator_indices) if elevator_indices is not None else None
+        )
 
-    def add_call(self, floor: int, direction: str) -> str: # Return call_id, raise on error
+    @property
+    def elevators(self) -> List["Elevator"]:
+        """The cars this dispatcher gives hall calls to."""
+        elevators = self.world.elevators
+        if self.elevator_indices is None:
+            return elevators
+        return [elevators[index] for index in self.elevator_indices]
+
+    def add_call(self, floor: int, direction: str) -> CallId: # Return call_id, raise on error
         try:
             # This will raise AttributeError if direction is not a string (e.g., None)
             # This will raise KeyError if direction.upper() is not 'UP' or 'DOWN'
@@ -26,83 +83,199 @@ class Dispatcher:
              raise ValueError("Direction must be a string.")
         except KeyError:
              raise ValueError(f"Invalid direction value: '{direction}'. Must be 'UP' or 'DOWN'.")
+        if not self.config.is_valid_floor(floor):
+            raise ValueError(f"Invalid floor: {floor}. Not served by this building.")
+
+        # A press of a hall button that is already lit joins the active call
+        active = self.pending_calls.get(self.hall_calls.get((floor, move_direction)))
+        if active is not None:
+            active.presses += 1
+            return active.call_id
 
         call_id = self.add_outside_call(floor, move_direction)
         self._process_pending_calls() # This might complete and pop the call from pending_calls
         return call_id
 
-    def _process_pending_calls(self) -> None:
-        for call_id, call in list(self.pending_calls.items()):
-            # Skip calls that are already assigned or completed
+    def _process_pending_calls(self) -> List[Tuple[CallId, int]]:
+        """Try to assign every waiting call; calls without a suitable elevator keep waiting.
+
+        Returns the (call id, elevator index) assignments in the order they were made.
+        """
+        with self._dispatch_pass():
+            if self.batch_assignment:
+                return self._assign_batch()
+            assigned: List[Tuple[CallId, int]] = []
+            for call_id, call in list(self.waiting.items()):
+                # Drop calls that are already assigned or completed
+                if not call.is_pending() or call.is_assigned():
+                    self.waiting.pop(call_id, None)
+                    continue
+                elevator_idx = self._assign_greedy(call_id, call)
+                if elevator_idx is not None:
+                    assigned.append((call_id, elevator_idx))
+            return assigned
+
+    def _dispatch_pass(self) -> ContextManager[None]:
+        """Context of one dispatch pass: its rollout decisions share one budget."""
+        if self.rollout is None:
+            return contextlib.nullcontext()
+        return self.rollout.dispatch_pass()
+
+    def _assign_greedy(self, call_id: CallId, call: Call) -> Optional[int]:
+        """Assign one call to the suitable elevator with the lowest estimated time.
+
+        Returns the index of that elevator, or None if the call keeps waiting.
+        """
+        floor = call.floor
+        direction = call.direction
+        best_elevator: Optional["Elevator"] = None
+        min_time: float = float("inf")
+
+        # Check if any elevator can serve this call without direction conflict
+        suitable_elevators = []
+
+        for elevator in self.elevators:
+            # Check if this elevator can serve the call without conflicting with its direction
+            if self._can_elevator_serve_call(elevator, floor, direction):
+                est_time: float = self.strategy.cost(self, elevator, floor, direction)
+                suitable_elevators.append((elevator, est_time))
+
+        # If we have suitable elevators, pick the one with minimum time
+        if suitable_elevators:
+            suitable_elevators.sort(key=lambda x: x[1])
+            best_elevator = suitable_elevators[0][0]
+            min_time = suitable_elevators[0][1]
+            if self.rollout is not None and len(suitable_elevators) > 1:
+                # Keep the strategy's choice if no rollout finishes within the budget
+                chosen = self.rollout.choose(
+                    self.world, call_id, [elevator.id - 1 for elevator, _ in suitable_elevators]
+                )
+                if chosen is not None:
+                    best_elevator = self.world.elevators[chosen]
+                # The API thread may have changed the car during the rollouts
+                if not self._can_elevator_serve_call(best_elevator, floor, direction):
+                    return None
+        else:
+            # No suitable elevator found, defer this call for later processing
+            return None
+
+        if best_elevator and self.assign_call(call_id, best_elevator.id - 1):
+            return best_elevator.id - 1
+        return None
+
+    def _assign_batch(self) -> List[Tuple[CallId, int]]:
+        """Assign the waiting hall calls in one minimum-cost matching (batch mode).
+
+        The cost of a (call, elevator) pair is the elevator's estimated time,
+        or inf if it cannot serve the call. Each elevator takes at most one
+        call per pass and the total estimated time of the pass is minimal;
+        unmatched calls keep waiting. Calls without a direction are not
+        limited to one per car and are assigned greedily first. Returns the
+        (call id, elevator index) assignments in the order they were made.
+        """
+        assigned: List[Tuple[CallId, int]] = []
+        calls: List[Call] = []
+        for call_id, call in list(self.waiting.items()):
             if not call.is_pending() or call.is_assigned():
-                continue
-
-            floor = call.floor
-            direction = call.direction
-            best_elevator: Optional["Elevator"] = None
-            min_time: float = float("inf")
-
-            # Check if any elevator can serve this call without direction conflict
-            suitable_elevators = []
-
-            for elevator in self.world.elevators:
-                # Check if this elevator can serve the call without conflicting with its direction
-                if self._can_elevator_serve_call(elevator, floor, direction):
-                    est_time: float = elevator.calculate_estimated_time(
-                        floor, direction
-                    )
-                    suitable_elevators.append((elevator, est_time))
-
-            # If we have suitable elevators, pick the one with minimum time
-            if suitable_elevators:
-                suitable_elevators.sort(key=lambda x: x[1])
-                best_elevator = suitable_elevators[0][0]
-                min_time = suitable_elevators[0][1]
+                self.waiting.pop(call_id, None)
+            elif call.direction is None:
+                elevator_idx = self._assign_greedy(call_id, call)
+                if elevator_idx is not None:
+                    assigned.append((call_id, elevator_idx))
             else:
-                # No suitable elevator found, defer this call for later processing
-                continue
+                calls.append(call)
+        if not calls:
+            return assigned
 
-            if best_elevator:
-                # Mark call as assigned before processing to prevent duplicates
-                call.assign_to_elevator(best_elevator.id - 1)
-                self.assign_task(best_elevator.id - 1, floor, call_id)
+        inf = float("inf")
+        columns: List[List[float]] = []
+        eligible: List["Elevator"] = []
+        for elevator in self.elevators:
+            column = [
+                self.strategy.cost(self, elevator, call.floor, call.direction)
+                if self._can_elevator_serve_call(elevator, call.floor, call.direction)
+                else inf
+                for call in calls
+            ]
+            if any(eta < inf for eta in column):
+                columns.append(column)
+                eligible.append(elevator)
+        if not eligible:
+            return assigned
 
-    def add_outside_call(self, floor: int, direction: Optional[MoveDirection]) -> str:
+        cost = [list(row) for row in zip(*columns)]  # calls x eligible elevators
+        for row, col in min_cost_assignment(cost):
+            call_id, elevator_idx = calls[row].call_id, eligible[col].id - 1
+            if self.assign_call(call_id, elevator_idx):
+                assigned.append((call_id, elevator_idx))
+        return assigned
+
+    def assign_call(self, call_id: CallId, elevator_idx: int) -> bool:
+        """Give a waiting call to an elevator and queue the stop for it.
+
+        Returns False, doing nothing, if the call no longer waits (it was
+        assigned or completed meanwhile, e.g. from the API thread).
+        """
+        # Mark call as assigned before processing to prevent duplicates
+        call = self.waiting.pop(call_id, None)
+        if call is None or not call.is_pending():
+            return False
+        call.assign_to_elevator(elevator_idx)
+        self.assign_task(elevator_idx, call.floor, call_id)
+        return True
+
+    def add_outside_call(self, floor: int, direction: Optional[MoveDirection]) -> CallId:
         """Add an outside call and return its call_id."""
-        call_id = str(uuid4())
-        call = Call(call_id, floor, direction) # Create Call object
+        call_id = self.call_ids.next_id()
+        call = Call(call_id, floor, direction, self.clock.now()) # Create Call object
         self.pending_calls[call_id] = call
         self.all_calls_log[call_id] = call # Store in the log
+        self.waiting[call_id] = call
+        if direction is not None:
+            self.hall_calls[(floor, direction)] = call_id
         return call_id
 
-    def get_call_direction(self, call_id: str) -> Optional[MoveDirection]:
+    def get_call_direction(self, call_id: CallId) -> Optional[MoveDirection]:
         """Get the direction for a pending call."""
-        if call_id in self.pending_calls:
-            return self.pending_calls[call_id].direction
-        return None
+        assignment = self.call_index.get(call_id)
+        if assignment is not None:
+            return assignment.direction
+        call = self.pending_calls.get(call_id)
+        return call.direction if call is not None else None
 
-    def complete_call(self, call_id: str) -> None:
-        """Mark a call as completed and remove it from pending."""
-        if call_id in self.pending_calls:
-            self.pending_calls[call_id].complete()
-            # Remove completed calls to free up memory
-            self.pending_calls.pop(call_id, None)
+    def serving_elevator(self, call_id: CallId) -> Optional[int]:
+        """Index of the elevator serving an assigned call, or None."""
+        assignment = self.call_index.get(call_id)
+        return assignment.elevator_idx if assignment is not None else None
+
+    def complete_call(self, call_id: CallId) -> Optional[MoveDirection]:
+        """Mark a call as completed, remove it from pending and return its direction."""
+        assignment = self.call_index.pop(call_id, None)
+        self.waiting.pop(call_id, None)
+        # Remove completed calls to free up memory
+        call = self.pending_calls.pop(call_id, None)
+        if call is not None:
+            call.complete()
+            # The hall button goes dark; the next press starts a new call
+            if self.hall_calls.get((call.floor, call.direction)) == call_id:
+                del self.hall_calls[(call.floor, call.direction)]
+            return call.direction
+        return assignment.direction if assignment is not None else None
 
     def assign_task(
         self,
         elevator_idx: int,
         floor: int,
-        call_id: Optional[str] = None,
+        call_id: Optional[CallId] = None,
     ) -> None:
         elevator = self.world.elevators[elevator_idx]
         # If already at the floor and doors closed, open doors and send message
         if floor == elevator.current_floor and elevator.door_state == DoorState.CLOSED:
             # Get direction from call_id if it's an outside call
             direction_to_send = None
-            if call_id:
-                direction_to_send = self.get_call_direction(call_id)
+            if call_id is not None:
                 # Mark the call as completed since we're already at the floor
-                self.complete_call(call_id)
+                direction_to_send = self.complete_call(call_id)
 
             self.api.send_floor_arrived_message(
                 elevator.id, elevator.current_floor, direction_to_send
@@ -111,21 +284,27 @@ class Dispatcher:
             return  # Skip if already in queue or currently at this floor with doors open
         # For outside calls (with call_id), prevent duplicates by call_id
         # For inside calls (no call_id), prevent duplicates by floor
-        if call_id:
-            # Outside call - check if same call_id already exists
-            if any(t.call_id == call_id for t in elevator.task_queue):
+        queue = self._task_queue(elevator)
+        if call_id is not None:
+            # Outside call - check if same call_id already exists (the queue check
+            # also covers tasks put into the queue without the dispatcher)
+            if self.serving_elevator(call_id) == elevator_idx or queue.has_call(call_id):
                 return
         else:
             # Inside call - check if same floor already exists for inside calls
-            if any(t.floor == floor and t.call_id is None for t in elevator.task_queue):
+            if queue.has_inside_stop(floor):
                 return
 
         # Skip if currently at this floor with doors open
         if floor == elevator.current_floor and elevator.door_state != DoorState.CLOSED:
             return
 
-        # Add new task with call_id
-        elevator.task_queue.append(Task(floor, call_id))
+        # Add new task with call_id (and the call's direction, for the hall stop index)
+        direction = self.get_call_direction(call_id) if call_id is not None else None
+        task = Task(floor, call_id, direction)
+        queue.append(task)
+        if call_id is not None:
+            self.call_index[call_id] = CallAssignment(elevator_idx, task, direction)
         self._optimize_task_queue(elevator)
 
         # If door is open, close it to start moving
@@ -134,58 +313,104 @@ class Dispatcher:
         else:
             elevator.request_movement_if_needed()
 
+    def _task_queue(self, elevator: "Elevator") -> TaskQueue:
+        """The elevator's task queue. A plain list (set on a stand-in elevator) is adopted as a TaskQueue."""
+        queue = elevator.task_queue
+        if not isinstance(queue, TaskQueue):
+            queue = elevator.task_queue = TaskQueue(
+                queue, self.config.min_floor, elevator.current_floor
+            )
+        return queue
+
     def _optimize_task_queue(self, elevator: "Elevator") -> None:
-        if not elevator.task_queue or len(elevator.task_queue) <= 1:
-            return
-        current_direction = None
+        """Order the elevator's stops as a LOOK sweep from its current floor.
+
+        A moving car keeps its direction; an idle car heads for the closest
+        stop (on a tie it keeps its current sweep).
+        """
+        queue = self._task_queue(elevator)
+        floor = elevator.current_floor
         if elevator.state == ElevatorState.MOVING_UP:
-            current_direction = "up"
+            sweep = MoveDirection.UP
         elif elevator.state == ElevatorState.MOVING_DOWN:
-            current_direction = "down"
-        if current_direction == "up":
-            above = [t for t in elevator.task_queue if t.floor > elevator.current_floor]
-            below = [t for t in elevator.task_queue if t.floor < elevator.current_floor]
-            elevator.task_queue = sorted(above, key=lambda t: t.floor) + sorted(
-                below, key=lambda t: t.floor
-            )
-        elif current_direction == "down":
-            above = [t for t in elevator.task_queue if t.floor > elevator.current_floor]
-            below = [t for t in elevator.task_queue if t.floor < elevator.current_floor]
-            elevator.task_queue = sorted(below, key=lambda t: -t.floor) + sorted(
-                above, key=lambda t: t.floor
-            )
+            sweep = MoveDirection.DOWN
         else:
-            closest = min(
-                elevator.task_queue, key=lambda t: abs(elevator.current_floor - t.floor)
-            )
-            if closest.floor > elevator.current_floor:
-                above = [
-                    t for t in elevator.task_queue if t.floor > elevator.current_floor
-                ]
-                below = [
-                    t for t in elevator.task_queue if t.floor < elevator.current_floor
-                ]
-                elevator.task_queue = sorted(above, key=lambda t: t.floor) + sorted(
-                    below, key=lambda t: t.floor
-                )
+            queue.move_to(floor)
+            sweep = queue.sweep
+            closest_above = queue.next_above
+            closest_below = queue.next_below
+            if queue.count_here:
+                pass  # The closest stop is here
+            elif closest_below is None:
+                if closest_above is not None:
+                    sweep = MoveDirection.UP
+            elif closest_above is None:
+                sweep = MoveDirection.DOWN
             else:
-                above = [
-                    t for t in elevator.task_queue if t.floor > elevator.current_floor
-                ]
-                below = [
-                    t for t in elevator.task_queue if t.floor < elevator.current_floor
-                ]
-                elevator.task_queue = sorted(below, key=lambda t: -t.floor) + sorted(
-                    above, key=lambda t: t.floor
-                )
+                to_above = self.config.distance(floor, closest_above)
+                to_below = self.config.distance(floor, closest_below)
+                if to_above < to_below:
+                    sweep = MoveDirection.UP
+                elif to_below < to_above:
+                    sweep = MoveDirection.DOWN
+        queue.schedule(floor, sweep)
+
+    def update(self) -> bool:
+        """Assign waiting calls if an elevator has become able to take them.
 
-    def update(self) -> None:
-        """Process all pending calls and assign them to the most suitable elevators."""
+        New calls are dispatched when they arrive, so a call only waits while
+        no elevator can serve it. Until the strategy reports a car that may
+        serve hall calls (DispatchStrategy.may_serve; a free car for the
+        default strategy, or any car with a committed direction under
+        en-route pickup) the update does no dispatch work. Returns True if
+        any call was assigned.
+        """
+        if not self._has_work():
+            return False
+        waiting = len(self.waiting)
         self._process_pending_calls()
+        return len(self.waiting) < waiting
+
+    def _has_work(self) -> bool:
+        """True if calls are waiting and one of the cars may take a hall call now."""
+        return bool(self.waiting) and any(self._may_serve(e) for e in self.elevators)
+
+    def clone(self, world: "Simulator", api: "ElevatorAPI", clock: Clock) -> "Dispatcher":
+        """Copy of the call bookkeeping for a cloned building (see Simulator.clone).
+
+        Open calls are copied, so the copy can assign and complete them
+        without touching this dispatcher; the copy's call log holds only
+        them. The copy uses the same strategy and options but no rollouts.
+        """
+        twin = Dispatcher(
+            world, api, clock, self.config, copy.copy(self.call_ids),
+            self.batch_assignment, self.strategy, self.en_route_pickup,
+            elevator_indices=self.elevator_indices,
+        )
+        self._copy_calls(twin)
+        return twin
+
+    def _copy_calls(self, twin: "Dispatcher") -> Dict[CallId, Call]:
+        """Fill the twin's (empty) call bookkeeping with copies of the open calls; returns them."""
+        calls = twin.pending_calls
+        for call_id, call in self.pending_calls.items():
+            twin_call = calls[call_id] = Call(call.call_id, call.floor, call.direction, call.created_at)
+            twin_call.state = call.state
+            twin_call.assigned_elevator = call.assigned_elevator
+            twin_call.presses = call.presses
+        # Updated in place: zone dispatchers share these dicts with their coordinator
+        twin.all_calls_log.update(calls)
+        twin.waiting.update((call_id, calls[call_id]) for call_id in self.waiting if call_id in calls)
+        twin.call_index.update(self.call_index)  # Assignments are immutable
+        twin.hall_calls.update(self.hall_calls)
+        return calls
 
     def reset(self) -> None:
         """Resets the dispatcher state, clearing all pending calls."""
         self.pending_calls.clear()
+        self.waiting.clear()
+        self.call_index.clear()
+        self.hall_calls.clear()
         print("Dispatcher: Reset successful, all pending calls cleared.")
 
     def _get_elevator_committed_direction(
@@ -210,11 +435,11 @@ class Dispatcher:
             and elevator.current_floor == elevator.task_queue[0].floor
         ):
             first_task = elevator.task_queue[0]
-            if first_task.call_id:
-                # Check the original call object from pending_calls
-                call_obj = self.pending_calls.get(first_task.call_id)
-                if call_obj and call_obj.direction:
-                    return call_obj.direction
+            if first_task.call_id is not None:
+                # Direction of the call being served
+                call_direction = self.get_call_direction(first_task.call_id)
+                if call_direction:
+                    return call_direction
 
         # Priority 4: Fallback to next task in queue if not covered above
         if elevator.task_queue:
@@ -234,25 +459,52 @@ class Dispatcher:
 
         return None
 
+    def is_free(self, elevator: "Elevator") -> bool:
+        """True if the elevator is idle with closed doors and no tasks, ready for a hall call."""
+        return (
+            elevator.state == ElevatorState.IDLE
+            and elevator.door_state == DoorState.CLOSED
+            and not elevator.task_queue
+        )
+
     def _can_elevator_serve_call(
         self, elevator: "Elevator", floor: int, direction: Optional[MoveDirection]
     ) -> bool:
         """
-        Determine if an elevator can take an outside call only when it's fully idle (no tasks, doors closed, not moving), otherwise defer.
+        Determine if an elevator can take an outside call now, as decided by the dispatch strategy.
+        The default strategy only gives hall calls to fully idle cars (no tasks, doors closed, not moving).
+        With en-route pickup, a car on its way may also take a call ahead of it in its direction.
         """
-        # For outside calls, only assign to completely idle and ready elevators
-        if direction is not None:
-            if (
-                elevator.state != ElevatorState.IDLE
-                or elevator.door_state != DoorState.CLOSED
-                or elevator.task_queue
-            ):
-                return False
+        if self.strategy.can_serve(self, elevator, floor, direction):
             return True
+        return (
+            self.en_route_pickup
+            and direction is not None
+            and self._can_pick_up_en_route(elevator, floor, direction)
+        )
 
-        # For inside calls (direction is None), prevent duplicates but allow assignment
-        # existing logic for internal requests
-        if not elevator.task_queue:
+    def _may_serve(self, elevator: "Elevator") -> bool:
+        """Cheap check whether the elevator could take any hall call now."""
+        if self.strategy.may_serve(self, elevator):
             return True
-        else:
-            return True  # no further restriction for inside calls
+        return self.en_route_pickup and self._get_elevator_committed_direction(elevator) is not None
+
+    def _can_pick_up_en_route(
+        self, elevator: "Elevator", floor: int, direction: MoveDirection
+    ) -> bool:
+        """
+        Determine if a busy elevator passes `floor` in `direction` on its way, so it can stop there.
+        The floor must lie ahead of the car in its committed direction, and the car must not
+        already stop there for a hall call the other way (one door opening serves both).
+        """
+        if self._get_elevator_committed_direction(elevator) != direction:
+            return False
+        here = elevator.current_floor
+        if floor <= here if direction == MoveDirection.UP else floor >= here:
+            return False
+        return not any(
+            task.floor == floor
+            and task.call_id is not None
+            and self.get_call_direction(task.call_id) not in (None, direction)
+            for task in elevator.task_queue
+        )
@@ -1,40 +1,89 @@
 import time
-from typing import List, Optional, Dict, TYPE_CHECKING
+from collections import OrderedDict
+from typing import Iterable, Optional, Dict, Tuple, TYPE_CHECKING
 
+from .clock import Clock, WallClock
 from .models import ElevatorState, DoorState, MoveDirection, Task
+from .models import BuildingConfig, DEFAULT_BUILDING
+from . import transitions
+from .eta import ElevatorSnapshot, EtaStats, estimate_time
+from .task_queue import TaskQueue
 from .models import MoveRequest
 
 if TYPE_CHECKING:
     from .simulator import Simulator
     from .api.core import ElevatorAPI  # Added API import
 
+# Most (floor, direction) ETAs memoized per elevator and state version
+ETA_CACHE_SIZE = 256
+
+# Per-car state and timing copied by Elevator.clone(); the task queue is cloned separately
+_CLONED_FIELDS = (
+    "id", "config", "current_floor", "previous_floor", "state", "door_state", "direction",
+    "last_state_change", "last_door_change", "door_timeout", "floor_travel_time",
+    "door_operation_time", "floor_arrival_delay", "moving_since", "floor_changed",
+    "floor_arrival_announced", "arrival_time", "serviced_current_arrival",
+)
+
+
+_UNSET = object()
+
+
+class _Versioned:
+    """Attribute that increments the elevator's state version when it changes.
+
+    Only assignment goes through the descriptor: it has no __get__, so reads
+    find the value in the instance __dict__ like any plain attribute.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __set__(self, elevator: "Elevator", value) -> None:
+        values = elevator.__dict__
+        if values.get(self.name, _UNSET) != value:
+            values[self.name] = value
+            elevator._version += 1
+
 
 class Elevator:
+    # State ETA estimates depend on; see state_version
+    current_floor = _Versioned()
+    state = _Versioned()
+    door_state = _Versioned()
+    direction = _Versioned()
+
     # Added api parameter to __init__
     def __init__(
-        self, elevator_id: int, world: "Simulator", api: "ElevatorAPI"
+        self,
+        elevator_id: int,
+        world: "Simulator",
+        api: "ElevatorAPI",
+        clock: Optional[Clock] = None,
+        config: Optional[BuildingConfig] = None,
     ) -> None:
+        self._version: int = 0  # Bumped by the versioned attributes and queue swaps
         self.id: int = elevator_id
         self.world: "Simulator" = world
         self.api: "ElevatorAPI" = api  # Store API instance
-        self.current_floor: int = 1  # Initial floor is 1
-        self.previous_floor: int = 1  # Track previous floor for change detection
-        self.task_queue: List[Task] = (
-            []
-        )  # Replaces target_floors and target_floors_origin
+        self.clock: Clock = clock if clock is not None else WallClock()
+        self.config: BuildingConfig = config if config is not None else DEFAULT_BUILDING
+        self.current_floor: int = self.config.home_floor  # Initial floor
+        self.previous_floor: int = self.config.home_floor  # Track previous floor for change detection
+        self.task_queue = []  # Replaces target_floors and target_floors_origin
         self.state: ElevatorState = ElevatorState.IDLE  # Movement state
         self.door_state: DoorState = DoorState.CLOSED  # Door state
         self.direction: Optional[MoveDirection] = None  # Use MoveDirection enum
-        self.last_state_change: float = time.time()
+        self.last_state_change: float = self.clock.now()
         self.last_door_change: float = (
-            time.time()
+            self.clock.now()
         )  # Separate timestamp for door changes
-        self.door_timeout: float = 3.0  # seconds before automatically closing doors
-        self.floor_travel_time: float = 2.0  # seconds to travel between floors
-        self.door_operation_time: float = 1.0  # seconds to open or close doors
-        self.floor_arrival_delay: float = (
-            0.5  # reduced delay after arrival before door opening
-        )
+        # Timing parameters (seconds), see DEFAULT_TIMING in models
+        timing = self.config.timing_for(elevator_id)
+        self.door_timeout: float = timing["door_timeout"]
+        self.floor_travel_time: float = timing["floor_travel_time"]
+        self.door_operation_time: float = timing["door_operation_time"]
+        self.floor_arrival_delay: float = timing["floor_arrival_delay"]
         self.moving_since: Optional[float] = None  # Timestamp when movement started
         self.floor_changed: bool = False  # Flag to detect floor changes
         self.floor_arrival_announced: bool = (
@@ -46,107 +95,71 @@ class Elevator:
         self.serviced_current_arrival: bool = (
             False  # Flag to prevent door reopening at same floor
         )
+        # ETA memo: (state version, floor, direction) -> ETA, oldest first
+        self._eta_memo: "OrderedDict[Tuple[int, int, Optional[MoveDirection]], float]" = OrderedDict()
+        self.eta_stats: EtaStats = EtaStats()
+
+    @property
+    def task_queue(self) -> TaskQueue:
+        """Stops in service (LOOK) order, with bitset indexes for stop lookups."""
+        return self._task_queue
+
+    @task_queue.setter
+    def task_queue(self, tasks: Iterable[Task]) -> None:
+        if not isinstance(tasks, TaskQueue):
+            tasks = TaskQueue(tasks, self.config.min_floor, self.current_floor)
+        old = getattr(self, "_task_queue", None)
+        # Keep state_version increasing although the new queue counts from its own version
+        self._version += (old.version if old is not None else 0) + 1
+        self._task_queue = tasks
+
+    @property
+    def state_version(self) -> int:
+        """Counter that increases on every change of floor, door, state, direction or queue.
+
+        Anything computed from the car state (such as ETAs) stays valid while
+        the version is unchanged.
+        """
+        return self._version + self._task_queue.version
 
     def update(self) -> None:
-        current_time: float = time.time()
-
-        # Check if floor has changed (previously set by Engine, now internal)
-        if self.floor_changed:
-            self.floor_changed = False
-            self.arrival_time = current_time
-            self.floor_arrival_announced = False
-            self.serviced_current_arrival = False  # Reset serviced flag on floor change
-            self.last_state_change = current_time  # Handle floor announcements (regardless of movement state)
-        if (
-            self.arrival_time  # This is set when floor_changed is true
-            and not self.floor_arrival_announced
-            and current_time - self.arrival_time
-            >= 0.5  # Original delay for announcement
-        ):
-            self.floor_arrival_announced = True
-
-            # Check if we've reached a target floor in the task_queue (only when moving)
-            if (
-                self._is_moving()
-                and self.task_queue
-                and self.current_floor == self.task_queue[0].floor
-            ):
-                self._handle_arrival_at_target_floor(current_time)
-
-        # First, check if elevator is moving
-        if self._is_moving():
-            # Handle movement logic previously in Engine
-            if (
-                self.moving_since is not None
-                and current_time - self.moving_since >= self.floor_travel_time
-            ):
-                current_direction_value = self._get_movement_direction()
-                next_floor = self.current_floor + current_direction_value
-                if next_floor == 0:  # Skip floor 0
-                    next_floor += current_direction_value
-                self._set_floor(next_floor)  # This will set floor_changed = True
-
-            return  # Skip other processing while moving or just after floor change
-
-        # Check if delay is time up before proceeding with door operations
-        if (
-            self.floor_arrival_announced
-            and not self.serviced_current_arrival
-            and self.arrival_time
-            and current_time - self.arrival_time < self.floor_arrival_delay
-        ):
-            return  # Wait for delay to complete
-
-        # Handle door state transitions
-        if self.door_state == DoorState.OPENING:
-            if current_time - self.last_door_change > self.door_operation_time:
-                self.door_state = DoorState.OPEN
-                self.last_door_change = current_time
-                # Use API to send message
-                self.api.send_door_opened_message(self.id)
-
-        elif self.door_state == DoorState.CLOSING:
-            if current_time - self.last_door_change > self.door_operation_time:
-                self.door_state = DoorState.CLOSED
-                self.last_door_change = current_time
-                # Use API to send message
-                self.api.send_door_closed_message(self.id)
-
-                # After door is closed, check if we need to move
-                if current_time - self.last_door_change >= 0.3:
-                    self.request_movement_if_needed()
-
-        elif self.door_state == DoorState.OPEN:
-            # Auto-close doors after timeout
-            if current_time - self.last_door_change > self.door_timeout:
-                self.close_door()  # If idle with closed doors, check if we arrived at a target floor
-        elif (
-            self.state == ElevatorState.IDLE
-            and self.door_state == DoorState.CLOSED
-            and self.floor_arrival_announced
-            and not self.serviced_current_arrival
-        ):
-            if self.task_queue and self.current_floor == self.task_queue[0].floor:
-                # Handle arrival at target floor
-                self._handle_arrival_at_target_floor(current_time)
-                # Open doors for target floor
-                self.open_door()
-                self.serviced_current_arrival = True
-                # Remove this task from the queue
-                self.task_queue.pop(0)
-            elif not self.task_queue:
-                # Open doors if we have no targets (e.g., initial floor)
-                self.open_door()
-                self.serviced_current_arrival = True
-
-        # Check if we have remaining target floors and need to move
-        elif (
-            self.state == ElevatorState.IDLE
-            and self.door_state == DoorState.CLOSED
-            and self.task_queue
-            and current_time - self.last_state_change >= 0.5
-        ):
-            self.request_movement_if_needed()
+        """Advance the elevator: fire every transition whose deadline has passed.
+
+        The behaviour (arrival announcement, floor travel, arrival delay, door
+        operation, door timeout, departure) is the transition table in
+        backend.transitions.
+        """
+        transitions.step(self, self.clock.now())
+
+    def next_deadline(self) -> Optional[float]:
+        """Return the clock time at which update() next has work to do.
+
+        Derived from the same transition table as update(). Returns None when
+        the elevator is quiescent and only an external command (new task, door
+        button, reset) can change its state.
+        """
+        return transitions.next_deadline(self, self.clock.now())
+
+    def _service_current_arrival(self, current_time: float) -> None:
+        """Open the doors for an announced arrival of an idle car with closed doors."""
+        if self.task_queue and self.current_floor == self.task_queue[0].floor:
+            # Handle arrival at target floor
+            self._handle_arrival_at_target_floor(current_time)
+            # Open doors for target floor
+            self.open_door()
+            self.serviced_current_arrival = True
+            # Remove this task from the queue
+            self.task_queue.pop(0)
+            # Other stops at this floor (e.g. an inside stop and a hall call) are
+            # served by the same door opening
+            for task in [t for t in self.task_queue if t.floor == self.current_floor]:
+                self.task_queue.remove(task)
+                if task.call_id is not None:
+                    self.world.dispatcher.complete_call(task.call_id)
+        elif not self.task_queue:
+            # Open doors if we have no targets (e.g., initial floor)
+            self.open_door()
+            self.serviced_current_arrival = True
 
     def _handle_arrival_at_target_floor(self, current_time: float) -> None:
         """Handles logic when elevator arrives at a target floor in its task queue."""
@@ -156,11 +169,9 @@ class Elevator:
         task = self.task_queue[0]
         direction_to_send = None
 
-        if task.call_id:
-            # For outside calls, get direction from dispatcher
-            direction_to_send = self.world.dispatcher.get_call_direction(task.call_id)
-            # Mark call as completed
-            self.world.dispatcher.complete_call(task.call_id)
+        if task.call_id is not None:
+            # For outside calls, mark the call completed; the dispatcher returns its direction
+            direction_to_send = self.world.dispatcher.complete_call(task.call_id)
         elif len(self.task_queue) > 1:  # For inside calls, determine from next stop
             next_task_floor = self.task_queue[1].floor
             if next_task_floor > self.current_floor:
@@ -184,7 +195,7 @@ class Elevator:
             if self.state != ElevatorState.IDLE:  # Ensure it becomes IDLE if no tasks
                 self.state = ElevatorState.IDLE
                 self.moving_since = None  # Clear moving_since when becoming IDLE
-                self.last_state_change = time.time()
+                self.last_state_change = self.clock.now()
 
     def _set_floor(self, new_floor: int) -> None:
         """Called internally to update the elevator's floor position"""
@@ -193,7 +204,7 @@ class Elevator:
             self.current_floor = new_floor
             self.floor_changed = True  # Set flag to process floor change in next update
             self.moving_since = (
-                time.time()
+                self.clock.now()
             )  # Reset moving timer for next floor travel segment
             # last_state_change is updated in update() when floor_changed is processed or state changes
 
@@ -205,7 +216,7 @@ class Elevator:
         elif direction_value == MoveDirection.DOWN.value:
             new_state = ElevatorState.MOVING_DOWN
 
-        current_time = time.time()  # Get current time for state change
+        current_time = self.clock.now()  # Get current time for state change
         if (
             self.state != new_state or new_state == ElevatorState.IDLE
         ):  # Update if state changes OR if it's set to IDLE (even if already IDLE)
@@ -234,7 +245,7 @@ class Elevator:
             and not self._is_moving()
         ):
             self.door_state = DoorState.OPENING
-            self.last_door_change = time.time()
+            self.last_door_change = self.clock.now()
 
     def close_door(self) -> None:
         if (
@@ -243,273 +254,102 @@ class Elevator:
             and not self._is_moving()
         ):
             self.door_state = DoorState.CLOSING
-            self.last_door_change = time.time()
+            self.last_door_change = self.clock.now()
 
     def _determine_direction(self) -> None:
-        if not self.task_queue:
-            self.direction = None
-            return
-        # If all target floors are above current floor
-        if all(task.floor > self.current_floor for task in self.task_queue):
-            self.direction = MoveDirection.UP
-        # If all target floors are below current floor
-        elif all(task.floor < self.current_floor for task in self.task_queue):
-            self.direction = MoveDirection.DOWN
-        # If current direction is up, keep going up until no more floors above
-        elif self.direction == MoveDirection.UP and any(
-            task.floor > self.current_floor for task in self.task_queue
-        ):
-            self.direction = MoveDirection.UP
-        # If current direction is down, keep going down until no more floors below
-        elif self.direction == MoveDirection.DOWN and any(
-            task.floor < self.current_floor for task in self.task_queue
-        ):
+        queue = self.task_queue
+        floor = self.current_floor
+        queue.move_to(floor)  # No-op unless the car moved since the last decision
+        closest_above = queue.next_above
+        closest_below = queue.next_below
+        # Only floors above (or below) the current floor: go there
+        if closest_below is None:
+            self.direction = MoveDirection.UP if closest_above is not None else None
+        elif closest_above is None:
             self.direction = MoveDirection.DOWN
-        # Otherwise pick the closest floor
+        # Floors on both sides: keep the current direction, else pick the closest floor
+        elif self.direction in (MoveDirection.UP, MoveDirection.DOWN):
+            pass
         else:
-            closest_above: Optional[int] = min(
-                [
-                    task.floor
-                    for task in self.task_queue
-                    if task.floor > self.current_floor
-                ],
-                default=None,
+            distance = self.config.distance
+            self.direction = (
+                MoveDirection.UP
+                if distance(closest_above, floor) <= distance(floor, closest_below)
+                else MoveDirection.DOWN
             )
-            closest_below: Optional[int] = max(
-                [
-                    task.floor
-                    for task in self.task_queue
-                    if task.floor < self.current_floor
-                ],
-                default=None,
-            )
-            if closest_above and closest_below:
-                self.direction = (
-                    MoveDirection.UP
-                    if closest_above - self.current_floor
-                    <= self.current_floor - closest_below
-                    else MoveDirection.DOWN
-                )
-            elif closest_above:
-                self.direction = MoveDirection.UP
-            elif closest_below:
-                self.direction = MoveDirection.DOWN
-            else:
-                self.direction = None  # No valid targets
+
+    def snapshot(self) -> ElevatorSnapshot:
+        """Immutable copy of the state ETA estimates depend on."""
+        return ElevatorSnapshot(
+            self.id,
+            self.current_floor,
+            self.state,
+            self.door_state,
+            self.direction,
+            *self.task_queue.stop_profile(),
+            self.floor_travel_time,
+            self.door_operation_time,
+            self.config,
+        )
+
+    def clone(self, world: "Simulator", api: "ElevatorAPI", clock: Clock) -> "Elevator":
+        """Detached copy of the car in `world`, for what-if runs (see Simulator.clone).
+
+        The copy is a plain Elevator (also for a FleetElevator) with its own
+        task queue and an empty ETA memo; changes to either car do not
+        affect the other.
+        """
+        twin = Elevator.__new__(Elevator)
+        twin._version = 0
+        twin.world, twin.api, twin.clock = world, api, clock
+        for name in _CLONED_FIELDS:
+            setattr(twin, name, getattr(self, name))
+        twin.task_queue = self.task_queue.clone()
+        twin._eta_memo = OrderedDict()
+        twin.eta_stats = EtaStats()
+        return twin
 
     def calculate_estimated_time(
         self, floor: int, direction: Optional[MoveDirection]
     ) -> float:
-        if self.current_floor == floor and self.door_state in [
-            DoorState.OPEN,
-            DoorState.OPENING,
-        ]:
-            return 0  # Already at floor with open door
-
-        total_time = 0.0
-        # Account for door closing time if currently open or opening
-        if self.door_state in [DoorState.OPEN, DoorState.OPENING]:
-            total_time += self.door_operation_time  # Time to close doors
-
-        # Simulate elevator movement
-        simulated_current_floor = self.current_floor
-
-        # If idle or not moving towards the requested floor's direction,
-        # calculate direct travel time.
-        if self.state == ElevatorState.IDLE or not self._is_moving():
-            total_time += abs(simulated_current_floor - floor) * self.floor_travel_time
-            # Add door opening time at destination
-            total_time += self.door_operation_time
-            return total_time
-
-        # If moving, simulate serving existing tasks then moving to the new floor
-
-        # Preserve original state for restoration
-        original_floor = self.current_floor
-        original_task_queue = self.task_queue.copy()
-        original_state = self.state
-        original_direction = self.direction
-
-        def _simulate_serving_targets(
-            current_sim_floor: int,
-            targets: List[int],
-            current_total_time: float,
-            target_direction: Optional[MoveDirection],  # Direction of the *new* call
-            is_final_leg: bool = False,  # True if this is the leg towards the new requested floor
-        ) -> tuple[int, float, bool]:
-            """
-            Simulates serving a list of target floors.
-            Returns the new current floor, updated total time, and if the target floor was reached.
-            """
-            reached_target_floor = False
-            for target_stop in targets:
-                current_total_time += (
-                    abs(target_stop - current_sim_floor) * self.floor_travel_time
-                )
-                current_sim_floor = target_stop
-                current_total_time += (
-                    self.door_operation_time
-                )  # Door cycle at each stop
-
-                # Check if this stop is the requested floor and direction matches
-                if target_stop == floor:
-                    if (
-                        target_direction is None
-                    ):  # Any direction is fine if not specified
-                        reached_target_floor = True
-                        break
-                    elif (
-                        self.direction == MoveDirection.UP
-                        and target_direction == MoveDirection.UP
-                    ):
-                        reached_target_floor = True
-                        break
-                    elif (
-                        self.direction == MoveDirection.DOWN
-                        and target_direction == MoveDirection.DOWN
-                    ):
-                        reached_target_floor = True
-                        break
-
-            return current_sim_floor, current_total_time, reached_target_floor
-
-        simulated_task_queue = self.task_queue.copy()  # Use a copy for simulation
-
-        if self.state == ElevatorState.MOVING_UP:
-            # Serve stops above current floor in current direction
-            stops_above = sorted(
-                [
-                    t.floor
-                    for t in simulated_task_queue
-                    if t.floor > simulated_current_floor
-                ]
-            )
-            simulated_current_floor, total_time, reached = _simulate_serving_targets(
-                simulated_current_floor, stops_above, total_time, direction
-            )
-            if reached:
-                self.current_floor, self.task_queue, self.state, self.direction = (
-                    original_floor,
-                    original_task_queue,
-                    original_state,
-                    original_direction,
-                )
-                return total_time
-
-            # If the target floor is below, or above but not reached (e.g. different direction call)
-            # simulate serving stops below (turnaround)
-            if floor < simulated_current_floor or (
-                floor > simulated_current_floor and not reached
-            ):
-                # Time for potential turnaround if no more stops in current direction
-                stops_below = sorted(
-                    [
-                        t.floor
-                        for t in simulated_task_queue
-                        if t.floor < simulated_current_floor
-                    ],
-                    reverse=True,
-                )
-                if stops_below:
-                    simulated_current_floor, total_time, reached = (
-                        _simulate_serving_targets(
-                            simulated_current_floor, stops_below, total_time, direction
-                        )
-                    )
-                    if reached:
-                        (
-                            self.current_floor,
-                            self.task_queue,
-                            self.state,
-                            self.direction,
-                        ) = (
-                            original_floor,
-                            original_task_queue,
-                            original_state,
-                            original_direction,
-                        )
-                        return total_time
-
-            # After serving all relevant existing tasks, travel to the new floor
-            total_time += abs(simulated_current_floor - floor) * self.floor_travel_time
-
-        elif self.state == ElevatorState.MOVING_DOWN:
-            # Serve stops below current floor
-            stops_below = sorted(
-                [
-                    t.floor
-                    for t in simulated_task_queue
-                    if t.floor < simulated_current_floor
-                ],
-                reverse=True,
-            )
-            simulated_current_floor, total_time, reached = _simulate_serving_targets(
-                simulated_current_floor, stops_below, total_time, direction
-            )
-            if reached:
-                self.current_floor, self.task_queue, self.state, self.direction = (
-                    original_floor,
-                    original_task_queue,
-                    original_state,
-                    original_direction,
-                )
-                return total_time
-
-            # If the target floor is above, or below but not reached
-            if floor > simulated_current_floor or (
-                floor < simulated_current_floor and not reached
-            ):
-                stops_above = sorted(
-                    [
-                        t.floor
-                        for t in simulated_task_queue
-                        if t.floor > simulated_current_floor
-                    ]
-                )
-                # Similar to MOVING_UP, if stops_above exist, they'd be served.
-                if stops_above:
-                    simulated_current_floor, total_time, reached = (
-                        _simulate_serving_targets(
-                            simulated_current_floor, stops_above, total_time, direction
-                        )
-                    )
-                    if reached:
-                        (
-                            self.current_floor,
-                            self.task_queue,
-                            self.state,
-                            self.direction,
-                        ) = (
-                            original_floor,
-                            original_task_queue,
-                            original_state,
-                            original_direction,
-                        )
-                        return total_time
-
-            # After serving all relevant existing tasks, travel to the new floor
-            total_time += abs(simulated_current_floor - floor) * self.floor_travel_time
-
-        # Add door opening time at the final destination floor
-        total_time += self.door_operation_time
-
-        # Restore original state
-        self.current_floor = original_floor
-        self.task_queue = original_task_queue
-        self.state = original_state
-        self.direction = original_direction
-
-        return total_time
+        """Estimated time to reach `floor` for a call in `direction` (see backend.eta).
+
+        Estimates are memoized per state version, so repeated dispatch passes
+        over an unchanged car are dictionary lookups. Hits, misses and the time
+        spent estimating are counted in eta_stats.
+
+        The API thread and the event loop both call this: the version is part
+        of the key, so a lookup never returns an estimate of an older state,
+        and estimates of older versions simply age out of the memo.
+        """
+        memo = self._eta_memo
+        key = (self.state_version, floor, direction)
+        eta = memo.get(key)
+        stats = self.eta_stats
+        if eta is not None:
+            stats.hits += 1
+            return eta
+        start = time.perf_counter()
+        eta = estimate_time(self.snapshot(), floor, direction)
+        stats.eval_time += time.perf_counter() - start
+        stats.misses += 1
+        if len(memo) >= ETA_CACHE_SIZE:
+            try:
+                memo.popitem(last=False)  # Drop the oldest estimate
+            except KeyError:
+                pass  # Emptied meanwhile by the other thread
+        memo[key] = eta
+        return eta
 
     def reset(self) -> None:
-        self.current_floor = 1
-        self.previous_floor = 1
+        self.current_floor = self.config.home_floor
+        self.previous_floor = self.config.home_floor
         self.task_queue = []
         self.state = ElevatorState.IDLE
         self.door_state = DoorState.CLOSED
         self.direction = None
-        self.last_state_change = time.time()
-        self.last_door_change = time.time()
+        self.last_state_change = self.clock.now()
+        self.last_door_change = self.clock.now()
         self.moving_since = None
         self.floor_changed = False
         self.floor_arrival_announced = False
@@ -0,0 +1,366 @@
+"""Estimated time for an elevator to serve a floor.
+
+Estimates are computed from an ElevatorSnapshot, an immutable copy of the car
+state they depend on. Estimating therefore never reads a live elevator while
+another thread updates it, never writes to it, and many candidates can be
+evaluated side by side.
+
+A snapshot holds the car's stops as sorted floors with prefix counts of the
+stops below each of them. Serving stops in LOOK order then has a closed
+form: the car reaches a stop after the travel time to its position plus one
+door cycle per stop served before it, and both follow from binary searches.
+estimate_time() thus costs O(log n) in the number of stops; simulate_time()
+is the step-by-step reference it is checked against.
+
+Elevators memoize estimates per state version (Elevator.state_version) and
+count cache hits, misses and estimation time in an EtaStats.
+
+estimate_table() computes the estimate of every car for every hall call of
+the building at once, as NumPy array operations over per-car stop counts.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only estimate_table() needs it
+    np = None
+
+from .models import BuildingConfig, DoorState, ElevatorState, MoveDirection
+
+# Direction axis of estimate_table()
+TABLE_DIRECTIONS = (MoveDirection.UP, MoveDirection.DOWN)
+
+
+class ElevatorSnapshot(NamedTuple):
+    """Frozen state of one car, as needed for ETA computations."""
+
+    elevator_id: int
+    current_floor: int
+    state: ElevatorState
+    door_state: DoorState
+    direction: Optional[MoveDirection]
+    stops: Tuple[int, ...]  # Floors with at least one stop, ascending
+    stops_below: Tuple[int, ...]  # Stops below each floor in `stops`, then the total
+    floor_travel_time: float
+    door_operation_time: float
+    config: BuildingConfig
+
+
+def stop_profile(floors: Iterable[int]) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """(stops, stops_below) of an ElevatorSnapshot for the given stop floors."""
+    counts = Counter(floors)
+    stops = tuple(sorted(counts))
+    below = [0]
+    for floor in stops:
+        below.append(below[-1] + counts[floor])
+    return stops, tuple(below)
+
+
+class EtaStats:
+    """Counters of one elevator's ETA memo."""
+
+    __slots__ = ("hits", "misses", "eval_time")
+
+    def __init__(self) -> None:
+        self.hits: int = 0
+        self.misses: int = 0  # Estimates computed
+        self.eval_time: float = 0.0  # Seconds spent computing estimates
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def reset(self) -> None:
+        self.hits = self.misses = 0
+        self.eval_time = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"EtaStats(hits={self.hits}, misses={self.misses}, "
+            f"hit_rate={self.hit_rate:.2f}, eval_time={self.eval_time:.6f})"
+        )
+
+
+def estimate_time(
+    snapshot: ElevatorSnapshot, floor: int, direction: Optional[MoveDirection]
+) -> float:
+    """Time for the car to reach `floor` and open its doors for a call in `direction`.
+
+    An idle car travels straight there. A moving car first serves its stops
+    in the current direction, then the stops on the way back, unless it
+    reaches `floor` on the way in a matching direction. Same result as
+    simulate_time() up to floating point rounding, in O(log n).
+    """
+    s = snapshot
+    opening = s.door_state in (DoorState.OPEN, DoorState.OPENING)
+    if s.current_floor == floor and opening:
+        return 0  # Already at floor with open door
+
+    position = s.config.position
+    travel = s.floor_travel_time
+    door = s.door_operation_time
+    base = door if opening else 0.0  # Time to close doors
+    car = position(s.current_floor)
+    target = position(floor)
+
+    # An idle car travels directly
+    if s.state is ElevatorState.IDLE:
+        return base + abs(target - car) * travel + door
+
+    stops, below = s.stops, s.stops_below
+    total = below[-1]
+
+    def under(f: int) -> int:
+        """Stops below floor `f`."""
+        return below[bisect_left(stops, f)]
+
+    def upto(f: int) -> int:
+        """Stops at or below floor `f`."""
+        return below[bisect_right(stops, f)]
+
+    here = s.current_floor
+    up = s.state is ElevatorState.MOVING_UP
+    # The car stops early at `floor` only for a stop there in a matching direction
+    i = bisect_left(stops, floor)
+    stop_here = (i < len(stops) and stops[i] == floor) and (
+        direction is None or direction == s.direction
+    )
+
+    # Sweep: stops beyond the car in its moving direction, up to `end`.
+    # The n-th stop served is reached after its travel time plus n door cycles.
+    if up:
+        ahead = total - upto(here)
+        end = stops[-1] if ahead else here
+        if stop_here and floor > here:
+            return base + (target - car) * travel + (below[i] - upto(here) + 1) * door
+    else:
+        ahead = under(here)
+        end = stops[0] if ahead else here
+        if stop_here and floor < here:
+            return base + (car - target) * travel + (under(here) - upto(floor) + 1) * door
+    end_pos = position(end)
+    sweep_time = base + abs(end_pos - car) * travel + ahead * door
+    if floor == end:
+        return sweep_time + door
+
+    # Turnaround: every stop on the other side of `end`, up to `last`
+    if up:
+        behind = under(end)
+        last = stops[0] if behind else end
+        if stop_here and floor < end:
+            return sweep_time + (end_pos - target) * travel + (behind - upto(floor) + 1) * door
+    else:
+        behind = total - upto(end)
+        last = stops[-1] if behind else end
+        if stop_here and floor > end:
+            return sweep_time + (target - end_pos) * travel + (below[i] - upto(end) + 1) * door
+    last_pos = position(last)
+    # After serving the existing stops, travel to the requested floor
+    return (
+        sweep_time
+        + abs(end_pos - last_pos) * travel
+        + behind * door
+        + abs(target - last_pos) * travel
+        + door
+    )
+
+
+def insertion_delay(snapshot: ElevatorSnapshot, floor: int) -> float:
+    """Extra time the car's queued stops wait if it also stops at `floor`.
+
+    Each stop served after the new one waits one more door cycle. A moving
+    car serves the new stop in LOOK order; an idle car travels to it first,
+    as estimate_time() assumes, so all its stops wait. Nothing is delayed if
+    the car already stops at `floor`: it serves all stops at a floor in one
+    door cycle.
+    """
+    s = snapshot
+    stops, below = s.stops, s.stops_below
+    total = below[-1]
+    i = bisect_left(stops, floor)
+    if not total or (i < len(stops) and stops[i] == floor):
+        return 0.0
+
+    here = s.current_floor
+    if s.state is ElevatorState.MOVING_UP:
+        if floor > here:
+            before = below[i] - below[bisect_right(stops, here)]
+        else:  # After the turnaround
+            before = total - below[bisect_right(stops, floor)]
+    elif s.state is ElevatorState.MOVING_DOWN:
+        if floor < here:
+            before = below[bisect_left(stops, here)] - below[bisect_right(stops, floor)]
+        else:  # After the turnaround
+            before = below[i]
+    else:
+        before = 0
+    return (total - before) * s.door_operation_time
+
+
+def simulate_time(
+    snapshot: ElevatorSnapshot, floor: int, direction: Optional[MoveDirection]
+) -> float:
+    """estimate_time() by serving the stops one by one (reference implementation).
+
+    Walks the stops in service order and accumulates travel and door time;
+    O(n) in the number of stops. Kept to check and benchmark estimate_time().
+    """
+    s = snapshot
+    floors = [
+        stop
+        for stop, low, high in zip(s.stops, s.stops_below, s.stops_below[1:])
+        for _ in range(high - low)
+    ]
+    if s.current_floor == floor and s.door_state in (DoorState.OPEN, DoorState.OPENING):
+        return 0  # Already at floor with open door
+
+    distance = s.config.distance
+    total_time = 0.0
+    # Account for door closing time if currently open or opening
+    if s.door_state in (DoorState.OPEN, DoorState.OPENING):
+        total_time += s.door_operation_time  # Time to close doors
+
+    simulated_floor = s.current_floor
+
+    # An idle car travels directly
+    if s.state is ElevatorState.IDLE:
+        return total_time + distance(simulated_floor, floor) * s.floor_travel_time + s.door_operation_time
+
+    def serve(stops: List[int], current: int, elapsed: float) -> Tuple[int, float, bool]:
+        """Serve `stops` in order; stop early at `floor` if the call direction matches."""
+        for stop in stops:
+            elapsed += distance(stop, current) * s.floor_travel_time
+            current = stop
+            elapsed += s.door_operation_time  # Door cycle at each stop
+            if stop == floor and (direction is None or direction == s.direction):
+                return current, elapsed, True
+        return current, elapsed, False
+
+    if s.state is ElevatorState.MOVING_UP:
+        ahead = sorted(f for f in floors if f > simulated_floor)
+    else:
+        ahead = sorted((f for f in floors if f < simulated_floor), reverse=True)
+    simulated_floor, total_time, reached = serve(ahead, simulated_floor, total_time)
+    if reached:
+        return total_time
+
+    # Turnaround: serve the stops on the other side of where the sweep ended
+    if floor != simulated_floor:
+        if s.state is ElevatorState.MOVING_UP:
+            behind = sorted((f for f in floors if f < simulated_floor), reverse=True)
+        else:
+            behind = sorted(f for f in floors if f > simulated_floor)
+        simulated_floor, total_time, reached = serve(behind, simulated_floor, total_time)
+        if reached:
+            return total_time
+
+    # After serving the existing stops, travel to the requested floor
+    total_time += distance(simulated_floor, floor) * s.floor_travel_time
+    # Door opening time at the requested floor
+    return total_time + s.door_operation_time
+
+
+def estimate_table(snapshots: Sequence[ElevatorSnapshot], floors: Sequence[int]):
+    """Array [car, floor, direction] of estimate_time() for every car and hall call.
+
+    The direction axis follows TABLE_DIRECTIONS. Instead of estimating each
+    (car, floor, direction) separately, the stops of every car are counted
+    per floor position; prefix sums of the counts give, for all targets at
+    once, how many stops a car serves before it reaches a floor, and the
+    travel times follow from the floor positions (BuildingConfig.position).
+    The result equals estimate_time() up to floating point rounding.
+    """
+    if np is None:
+        raise ImportError("The ETA table requires NumPy (pip install .[fast])")
+    cars = len(snapshots)
+    if not cars:
+        return np.zeros((0, len(floors), len(TABLE_DIRECTIONS)))
+    config = snapshots[0].config
+    position = config.position
+    car_pos = np.array([position(s.current_floor) for s in snapshots], dtype=np.int64)
+    target_pos = np.array([position(floor) for floor in floors], dtype=np.int64)
+    stop_car = np.array([i for i, s in enumerate(snapshots) for _ in s.stops], dtype=np.int64)
+    stop_pos = np.array([position(f) for s in snapshots for f in s.stops], dtype=np.int64)
+    stop_count = np.array(
+        [high - low for s in snapshots for low, high in zip(s.stops_below, s.stops_below[1:])],
+        dtype=np.int64,
+    )
+
+    # Position grid covering the cars, their stops and the targets
+    low = min(car_pos.min(), target_pos.min(initial=0), stop_pos.min(initial=0))
+    high = max(car_pos.max(), target_pos.max(initial=0), stop_pos.max(initial=0))
+    car_pos -= low
+    target_pos -= low
+    counts = np.zeros((cars, high - low + 1), dtype=np.int64)
+    np.add.at(counts, (stop_car, stop_pos - low), stop_count)
+    below = np.cumsum(counts, axis=1) - counts  # Stops below each position
+    total = counts.sum(axis=1)
+    has_stop = counts > 0
+    lowest = np.argmax(has_stop, axis=1)
+    highest = counts.shape[1] - 1 - np.argmax(has_stop[:, ::-1], axis=1)
+
+    rows = np.arange(cars)
+    travel = np.array([s.floor_travel_time for s in snapshots])
+    door = np.array([s.door_operation_time for s in snapshots])
+    state = np.array([s.state for s in snapshots], dtype=object)
+    opening = np.array([s.door_state in (DoorState.OPEN, DoorState.OPENING) for s in snapshots])
+    base = np.where(opening, door, 0.0)  # Closing the doors first
+    up = state == ElevatorState.MOVING_UP
+    idle = ~up & (state != ElevatorState.MOVING_DOWN)
+
+    # First sweep: stops beyond the car in its moving direction, ending at `end`
+    here = counts[rows, car_pos]
+    ahead = np.where(up, total - below[rows, car_pos] - here, below[rows, car_pos])
+    end = np.where(ahead > 0, np.where(up, highest, lowest), car_pos)
+    sweep_time = base + np.abs(end - car_pos) * travel + ahead * door
+    # Return sweep: every stop on the other side of `end`, ending at `last`
+    at_end = counts[rows, end]
+    behind = np.where(up, below[rows, end], total - below[rows, end] - at_end)
+    last = np.where(behind > 0, np.where(up, lowest, highest), end)
+    tour_time = sweep_time + np.abs(end - last) * travel + behind * door
+
+    def c(values):
+        """Per-car values as a column, to broadcast against the targets."""
+        return values[:, None]
+
+    # Broadcast to [car, floor]
+    target = target_pos[None, :]
+    target_counts = counts[:, target_pos]
+    target_below = below[:, target_pos]
+    sign = np.where(up, 1, -1)[:, None]
+    # Reached in the first sweep: stops strictly between the car and the target, plus one
+    in_sweep = (sign * (target - c(car_pos)) > 0) & (target_counts > 0)
+    sweep_rank = np.where(
+        c(up),
+        target_below - c(below[rows, car_pos] + here),
+        c(below[rows, car_pos]) - target_below - target_counts,
+    ) + 1
+    sweep_eta = c(base) + np.abs(target - c(car_pos)) * c(travel) + sweep_rank * c(door)
+    # Reached on the way back: stops strictly between the sweep end and the target, plus one
+    in_return = (sign * (target - c(end)) < 0) & (target_counts > 0)
+    return_rank = np.where(
+        c(up),
+        c(below[rows, end]) - target_below - target_counts,
+        target_below - c(below[rows, end] + at_end),
+    ) + 1
+    return_eta = c(sweep_time) + np.abs(c(end) - target) * c(travel) + return_rank * c(door)
+    end_eta = c(sweep_time + door)
+    tour_eta = c(tour_time) + np.abs(target - c(last)) * c(travel) + c(door)
+    idle_eta = c(base) + np.abs(target - c(car_pos)) * c(travel) + c(door)
+
+    table = np.empty((cars, len(floors), len(TABLE_DIRECTIONS)))
+    for d, direction in enumerate(TABLE_DIRECTIONS):
+        # Stops only count as reaching the target if the car travels in the call direction
+        match = c(np.array([s.direction == direction for s in snapshots]))
+        eta = np.select(
+            [match & in_sweep, target == c(end), match & in_return],
+            [sweep_eta, end_eta, return_eta],
+            tour_eta,
+        )
+        eta = np.where(c(idle), idle_eta, eta)
+        table[:, :, d] = np.where(c(opening) & (target == c(car_pos)), 0.0, eta)
+    return table
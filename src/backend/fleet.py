@@ -0,0 +1,324 @@
+import math
+from typing import Callable, List, Optional, Sequence, TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the vectorized engine needs it
+    np = None
+
+from .clock import Clock
+from .elevator import Elevator
+from .models import BuildingConfig, DEFAULT_BUILDING, DoorState, ElevatorState, MoveDirection
+from .transitions import ARRIVAL_ANNOUNCE_DELAY, MOVE_START_DELAY
+
+if TYPE_CHECKING:
+    from .simulator import Simulator
+    from .api.core import ElevatorAPI
+
+# Integer codes used in the state arrays
+_STATE_CODES = {ElevatorState.IDLE: 0, ElevatorState.MOVING_UP: 1, ElevatorState.MOVING_DOWN: 2}
+_STATES = {code: state for state, code in _STATE_CODES.items()}
+_DOOR_CODES = {DoorState.CLOSED: 0, DoorState.OPENING: 1, DoorState.OPEN: 2, DoorState.CLOSING: 3}
+_DOORS = {code: door for door, code in _DOOR_CODES.items()}
+_DIRECTION_CODES = {None: 0, MoveDirection.UP: 1, MoveDirection.DOWN: -1}
+_DIRECTIONS = {code: direction for direction, code in _DIRECTION_CODES.items()}
+
+IDLE, MOVING_UP, MOVING_DOWN = 0, 1, 2
+CLOSED, OPENING, OPEN, CLOSING = 0, 1, 2, 3
+
+
+def numpy_available() -> bool:
+    """Return True if the vectorized fleet engine can be used."""
+    return np is not None
+
+
+class FleetEngine:
+    """Struct-of-arrays storage and vectorized update for a group of elevators.
+
+    Floor, motion state, door state, direction, timers and flags of every car
+    live in parallel NumPy arrays indexed by slot. Timer checks and the pure
+    state transitions (floor travel, arrival announcement, door timing) run as
+    array operations over the whole fleet; only cars that touch their task
+    queue or the dispatcher drop into per-car Python code.
+
+    Cars are exposed as FleetElevator views, so the Dispatcher, the API and
+    fetch_states see ordinary Elevator objects.
+    """
+
+    def __init__(self, size: int, clock: Clock, config: Optional[BuildingConfig] = None) -> None:
+        if np is None:
+            raise ImportError("The vectorized fleet engine requires NumPy (pip install .[fast])")
+        self.size: int = size
+        self.clock: Clock = clock
+        self.config: BuildingConfig = config if config is not None else DEFAULT_BUILDING
+        # Floor tables: served floor labels by index, and label -> index (-1 if skipped)
+        self._floor_labels = np.array(self.config.floors, dtype=np.int64)
+        self._label_index = np.full(
+            self.config.max_floor - self.config.min_floor + 1, -1, dtype=np.int64
+        )
+        for floor, index in self.config.floor_index.items():
+            self._label_index[floor - self.config.min_floor] = index
+        self.elevators: List["FleetElevator"] = []
+
+        self.current_floor = np.full(size, self.config.home_floor, dtype=np.int64)
+        self.previous_floor = np.full(size, self.config.home_floor, dtype=np.int64)
+        self.state = np.zeros(size, dtype=np.int8)
+        self.door_state = np.zeros(size, dtype=np.int8)
+        self.direction = np.zeros(size, dtype=np.int8)
+        self.last_state_change = np.zeros(size)
+        self.last_door_change = np.zeros(size)
+        self.moving_since = np.full(size, np.nan)  # NaN stands for None
+        self.arrival_time = np.full(size, np.nan)
+        self.floor_changed = np.zeros(size, dtype=bool)
+        self.floor_arrival_announced = np.zeros(size, dtype=bool)
+        self.serviced_current_arrival = np.zeros(size, dtype=bool)
+        self.door_timeout = np.zeros(size)
+        self.floor_travel_time = np.zeros(size)
+        self.door_operation_time = np.zeros(size)
+        self.floor_arrival_delay = np.zeros(size)
+        self.version = np.zeros(size, dtype=np.int64)  # Elevator state versions
+
+    def create_elevators(
+        self, elevator_ids: Sequence[int], world: "Simulator", api: "ElevatorAPI"
+    ) -> List["FleetElevator"]:
+        """Create one view per slot and return them in slot order."""
+        if len(elevator_ids) != self.size:
+            raise ValueError(f"Expected {self.size} elevator ids, got {len(elevator_ids)}")
+        self.elevators = [
+            FleetElevator(elevator_id, world, api, self, slot)
+            for slot, elevator_id in enumerate(elevator_ids)
+        ]
+        return self.elevators
+
+    def _mask(self, slots: Optional[Sequence[int]]):
+        if slots is None:
+            return np.ones(self.size, dtype=bool)
+        mask = np.zeros(self.size, dtype=bool)
+        mask[np.asarray(slots, dtype=np.int64)] = True
+        return mask
+
+    def _task_arrays(self):
+        """Return (has_tasks, first_task_floor, can_depart) gathered from the views' task queues.
+
+        can_depart marks cars with a stop away from their current floor.
+        """
+        has_tasks = np.fromiter(
+            (bool(e.task_queue) for e in self.elevators), dtype=bool, count=self.size
+        )
+        first_floor = np.fromiter(
+            (e.task_queue[0].floor if e.task_queue else 0 for e in self.elevators),
+            dtype=np.int64,
+            count=self.size,
+        )
+        can_depart = np.fromiter(
+            (e.task_queue.has_stop_away_from(e.current_floor) for e in self.elevators),
+            dtype=bool,
+            count=self.size,
+        )
+        return has_tasks, first_floor, can_depart
+
+    def update(self, slots: Optional[Sequence[int]] = None) -> None:
+        """Advance the given cars (default: all) by one Elevator.update() step.
+
+        Produces the same state changes as calling update() on each car. Messages
+        emitted at the same instant are grouped by phase (arrivals, then doors)
+        and ordered by slot within a phase.
+        """
+        now = self.clock.now()
+        active = self._mask(slots)
+
+        # Floor change bookkeeping
+        changed = active & self.floor_changed
+        self.floor_changed[changed] = False
+        self.arrival_time[changed] = now
+        self.floor_arrival_announced[changed] = False
+        self.serviced_current_arrival[changed] = False
+        self.last_state_change[changed] = now
+
+        # Arrival announcement (NaN arrival times compare False)
+        announce = (
+            active
+            & ~self.floor_arrival_announced
+            & (now >= self.arrival_time + ARRIVAL_ANNOUNCE_DELAY)
+        )
+        self.floor_arrival_announced[announce] = True
+        for slot in np.flatnonzero(announce & (self.state != IDLE)):
+            elevator = self.elevators[slot]
+            if elevator.task_queue and elevator.current_floor == elevator.task_queue[0].floor:
+                elevator._handle_arrival_at_target_floor(now)
+
+        # Floor travel for moving cars; moving cars skip the door logic
+        moving = active & (self.state != IDLE)
+        travelled = moving & (now >= self.moving_since + self.floor_travel_time)
+        if travelled.any():
+            step = np.where(self.state[travelled] == MOVING_UP, 1, -1)
+            next_floor = self._next_floors(self.current_floor[travelled], step)
+            self.previous_floor[travelled] = self.current_floor[travelled]
+            self.current_floor[travelled] = next_floor
+            self.version[travelled] += 1
+            self.floor_changed[travelled] = True
+            self.moving_since[travelled] = now
+
+        # Door handling is held back until the arrival delay has passed
+        pending_arrival = self.floor_arrival_announced & ~self.serviced_current_arrival
+        held = pending_arrival & (now < self.arrival_time + self.floor_arrival_delay)
+        rest = active & ~moving & ~held
+
+        # Door transitions; masks are taken before any door changes
+        door = self.door_state
+        door_done = now >= self.last_door_change + self.door_operation_time
+        opened = rest & (door == OPENING) & door_done
+        closed = rest & (door == CLOSING) & door_done
+        timed_out = rest & (door == OPEN) & (now >= self.last_door_change + self.door_timeout)
+        idle_closed = rest & (door == CLOSED) & (self.state == IDLE)
+        service = idle_closed & pending_arrival
+        depart = idle_closed & ~pending_arrival & (now >= self.last_state_change + MOVE_START_DELAY)
+
+        door[opened] = OPEN
+        door[closed] = CLOSED
+        door[timed_out] = CLOSING  # close_door(): the car is idle with open doors
+        self.last_door_change[opened | closed | timed_out] = now
+        self.version[opened | closed | timed_out] += 1
+        for slot in np.flatnonzero(opened | closed):
+            elevator = self.elevators[slot]
+            if opened[slot]:
+                elevator.api.send_door_opened_message(elevator.id)
+            else:
+                elevator.api.send_door_closed_message(elevator.id)
+
+        for slot in np.flatnonzero(service):
+            self.elevators[slot]._service_current_arrival(now)
+        for slot in np.flatnonzero(depart):
+            elevator = self.elevators[slot]
+            if elevator.task_queue:
+                elevator.request_movement_if_needed()
+
+    def _next_floors(self, floors, steps):
+        """Vectorized BuildingConfig.next_floor() through the floor index tables."""
+        span = len(self._label_index)
+        offset = floors - self.config.min_floor
+        inside = (offset >= 0) & (offset < span)
+        index = np.where(inside, self._label_index[np.clip(offset, 0, span - 1)], -1)
+        target = index + steps
+        in_table = (index >= 0) & (target >= 0) & (target < len(self._floor_labels))
+        if in_table.all():
+            return self._floor_labels[target]
+        # Cars outside the building table fall back to the scalar rule
+        result = np.empty_like(floors)
+        result[in_table] = self._floor_labels[target[in_table]]
+        for i in np.flatnonzero(~in_table):
+            result[i] = self.config.next_floor(int(floors[i]), int(steps[i]))
+        return result
+
+    def next_deadlines(self, slots: Optional[Sequence[int]] = None):
+        """Vectorized Elevator.next_deadline(); returns inf where a car has none."""
+        now = self.clock.now()
+        has_tasks, first_floor, can_depart = self._task_arrays()
+        deadlines = np.full(self.size, np.inf)
+
+        announce_pending = ~self.floor_arrival_announced & ~np.isnan(self.arrival_time)
+        deadlines[announce_pending] = self.arrival_time[announce_pending] + ARRIVAL_ANNOUNCE_DELAY
+
+        moving = self.state != IDLE
+        travel = np.where(
+            np.isnan(self.moving_since), np.inf, self.moving_since + self.floor_travel_time
+        )
+        deadlines = np.where(moving, np.minimum(deadlines, travel), deadlines)
+
+        pending_arrival = self.floor_arrival_announced & ~self.serviced_current_arrival
+        hold_until = self.arrival_time + self.floor_arrival_delay
+        held = ~moving & pending_arrival & (now < hold_until)
+        deadlines = np.where(held, np.minimum(deadlines, hold_until), deadlines)
+
+        rest = ~moving & ~held
+        door = self.door_state
+        door_deadline = np.full(self.size, np.inf)
+        operating = (door == OPENING) | (door == CLOSING)
+        door_deadline[operating] = (self.last_door_change + self.door_operation_time)[operating]
+        door_deadline[door == OPEN] = (self.last_door_change + self.door_timeout)[door == OPEN]
+        closed = door == CLOSED
+        serviceable = closed & pending_arrival & (~has_tasks | (first_floor == self.current_floor))
+        door_deadline[serviceable] = now
+        departing = closed & ~pending_arrival & can_depart
+        door_deadline[departing] = (self.last_state_change + MOVE_START_DELAY)[departing]
+        deadlines = np.where(rest, np.minimum(deadlines, door_deadline), deadlines)
+
+        deadlines[self.floor_changed] = now  # Processed on the next update
+        if slots is not None:
+            return deadlines[np.asarray(slots, dtype=np.int64)]
+        return deadlines
+
+
+def _array_field(
+    name: str,
+    decode: Callable = lambda value: value.item(),
+    encode: Callable = lambda value: value,
+    versioned: bool = False,
+) -> property:
+    """Property that reads and writes this car's slot of a FleetEngine array.
+
+    Writes that change a `versioned` field also increment the car's state version.
+    """
+
+    def fget(self: "FleetElevator"):
+        return decode(getattr(self.fleet, name)[self.slot])
+
+    def fset(self: "FleetElevator", value) -> None:
+        array = getattr(self.fleet, name)
+        encoded = encode(value)
+        if versioned:
+            if array[self.slot] == encoded:
+                return
+            self.fleet.version[self.slot] += 1
+        array[self.slot] = encoded
+
+    return property(fget, fset)
+
+
+def _optional_time_field(name: str) -> property:
+    return _array_field(
+        name,
+        decode=lambda value: None if math.isnan(value) else float(value),
+        encode=lambda value: math.nan if value is None else value,
+    )
+
+
+class FleetElevator(Elevator):
+    """Elevator whose scalar state is stored in a FleetEngine slot.
+
+    Behaves exactly like Elevator (same methods and attributes); the task queue
+    stays a per-car Python list.
+    """
+
+    _version = _array_field("version")
+    current_floor = _array_field("current_floor", versioned=True)
+    previous_floor = _array_field("previous_floor")
+    state = _array_field("state", _STATES.__getitem__, _STATE_CODES.__getitem__, True)
+    door_state = _array_field("door_state", _DOORS.__getitem__, _DOOR_CODES.__getitem__, True)
+    direction = _array_field(
+        "direction", _DIRECTIONS.__getitem__, _DIRECTION_CODES.__getitem__, True
+    )
+    last_state_change = _array_field("last_state_change")
+    last_door_change = _array_field("last_door_change")
+    moving_since = _optional_time_field("moving_since")
+    arrival_time = _optional_time_field("arrival_time")
+    floor_changed = _array_field("floor_changed")
+    floor_arrival_announced = _array_field("floor_arrival_announced")
+    serviced_current_arrival = _array_field("serviced_current_arrival")
+    door_timeout = _array_field("door_timeout")
+    floor_travel_time = _array_field("floor_travel_time")
+    door_operation_time = _array_field("door_operation_time")
+    floor_arrival_delay = _array_field("floor_arrival_delay")
+
+    def __init__(
+        self,
+        elevator_id: int,
+        world: "Simulator",
+        api: "ElevatorAPI",
+        fleet: FleetEngine,
+        slot: int,
+    ) -> None:
+        # The slot must be bound before Elevator.__init__ assigns the array-backed fields
+        self.fleet: FleetEngine = fleet
+        self.slot: int = slot
+        super().__init__(elevator_id, world, api, fleet.clock, fleet.config)
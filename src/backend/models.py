@@ -1,11 +1,251 @@
+import json
+import threading
+from bisect import bisect_left
 from enum import Enum, auto
-from typing import NamedTuple, Optional
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
 
-# System constants (matching UPPAAL model)
+# System constants (matching UPPAAL model); defaults of BuildingConfig
 MIN_FLOOR = -1
 MAX_FLOOR = 3
+SKIPPED_FLOORS = (0,)  # The building has no floor 0
+HOME_FLOOR = 1  # Floor the cars start at (the served floor nearest it if not served)
 MIN_ELEVATOR_ID = 1
 MAX_ELEVATOR_ID = 2
+DEFAULT_DISPATCH_STRATEGY = "idle-eta"  # Name in backend.strategies.DISPATCH_STRATEGIES
+
+# Per-car timing parameters (seconds) and their defaults
+DEFAULT_TIMING: Dict[str, float] = {
+    "door_timeout": 3.0,  # seconds before automatically closing doors
+    "floor_travel_time": 2.0,  # seconds to travel between floors
+    "door_operation_time": 1.0,  # seconds to open or close doors
+    "floor_arrival_delay": 0.5,  # delay after arrival before door opening
+}
+
+
+class BuildingConfig:
+    """Building geometry and car timing shared by the simulator, dispatcher and API.
+
+    The defaults describe the original building: floors -1..3 without floor 0
+    and two cars with ids 1 and 2. `timing` overrides the timing defaults for
+    every car and `car_timing` overrides them per elevator id.
+    `dispatch_strategy` names the policy that picks a car for each call (see
+    backend.strategies); with `en_route_pickup` cars on their way also take
+    hall calls ahead of them in their direction, whatever the strategy.
+    `zones` divides the building into floor bands, each served by its own
+    cars (see backend.zoning); floors where bands overlap are shared.
+    """
+
+    def __init__(
+        self,
+        min_floor: int = MIN_FLOOR,
+        max_floor: int = MAX_FLOOR,
+        skipped_floors: Iterable[int] = SKIPPED_FLOORS,
+        num_elevators: int = MAX_ELEVATOR_ID,
+        timing: Optional[Dict[str, float]] = None,
+        car_timing: Optional[Dict[int, Dict[str, float]]] = None,
+        dispatch_strategy: str = DEFAULT_DISPATCH_STRATEGY,
+        en_route_pickup: bool = False,
+        zones: Optional[Iterable[Any]] = None,
+    ) -> None:
+        self.min_floor = min_floor
+        self.max_floor = max_floor
+        skipped_floors = frozenset(skipped_floors)
+        if {min_floor, max_floor} & skipped_floors:
+            raise ValueError("The lowest and highest floor cannot be skipped")
+        # Floors outside the range are not in the building anyway (e.g. 0 for floors 1..N)
+        self.skipped_floors = frozenset(f for f in skipped_floors if min_floor < f < max_floor)
+        self.num_elevators = num_elevators
+        self.timing = {**DEFAULT_TIMING, **(timing or {})}
+        self.car_timing = {int(k): dict(v) for k, v in (car_timing or {}).items()}
+        self.dispatch_strategy = dispatch_strategy
+        self.en_route_pickup = en_route_pickup
+        # Zone objects, or {"floors": [lowest, highest], "elevators": [ids]} as in JSON
+        self.zones: Optional[Tuple[Zone, ...]] = (
+            tuple(Zone.parse(zone) for zone in zones) if zones is not None else None
+        )
+        self._validate()
+        # Floor lookup tables. Labels are what users see (-1, 1, 2, ...); indices
+        # number the served floors 0..N-1 bottom to top, so floor distances stay
+        # correct across skipped floors.
+        self.floors: List[int] = [
+            floor
+            for floor in range(self.min_floor, self.max_floor + 1)
+            if floor not in self.skipped_floors
+        ]
+        self.floor_index: Dict[int, int] = {
+            floor: index for index, floor in enumerate(self.floors)
+        }
+        # Cars start at, and return to on reset, HOME_FLOOR or else the served
+        # floor nearest it (the lower one on a tie)
+        self.home_floor: int = min(self.floors, key=lambda floor: (abs(floor - HOME_FLOOR), floor))
+
+    def _validate(self) -> None:
+        if self.min_floor >= self.max_floor:
+            raise ValueError("min_floor must be below max_floor")
+        if self.num_elevators < 1:
+            raise ValueError("A building needs at least one elevator")
+        for elevator_id, overrides in [(None, self.timing), *self.car_timing.items()]:
+            if elevator_id is not None and not self.is_valid_elevator_id(elevator_id):
+                raise ValueError(f"car_timing refers to unknown elevator {elevator_id}")
+            unknown = set(overrides) - set(DEFAULT_TIMING)
+            if unknown:
+                raise ValueError(f"Unknown timing parameter(s): {', '.join(sorted(unknown))}")
+            if any(value <= 0 for value in overrides.values()):
+                raise ValueError("Timing parameters must be positive")
+        # The name is looked up in backend.strategies when the dispatcher is created
+        if not isinstance(self.dispatch_strategy, str) or not self.dispatch_strategy:
+            raise ValueError("dispatch_strategy must be the name of a dispatch strategy")
+        if not isinstance(self.en_route_pickup, bool):
+            raise ValueError("en_route_pickup must be true or false")
+        if self.zones is not None:
+            self._validate_zones()
+
+    def _validate_zones(self) -> None:
+        if not self.zones:
+            raise ValueError("zones must list at least one zone")
+        seen: Set[int] = set()
+        for index, zone in enumerate(self.zones):
+            if zone.lowest > zone.highest:
+                raise ValueError(f"Zone {index} has its lowest floor above its highest")
+            for floor in (zone.lowest, zone.highest):
+                if not self.min_floor <= floor <= self.max_floor or floor in self.skipped_floors:
+                    raise ValueError(f"Zone {index} refers to floor {floor}, which is not served")
+            if not zone.elevator_ids:
+                raise ValueError(f"Zone {index} has no elevators")
+            for elevator_id in zone.elevator_ids:
+                if not self.is_valid_elevator_id(elevator_id):
+                    raise ValueError(f"Zone {index} refers to unknown elevator {elevator_id}")
+                if elevator_id in seen:
+                    raise ValueError(f"Elevator {elevator_id} is listed in more than one zone")
+                seen.add(elevator_id)
+        unzoned = [elevator_id for elevator_id in self.elevator_ids if elevator_id not in seen]
+        if unzoned:
+            raise ValueError(f"Elevator(s) in no zone: {', '.join(map(str, unzoned))}")
+        uncovered = [
+            floor
+            for floor in range(self.min_floor, self.max_floor + 1)
+            if floor not in self.skipped_floors
+            and not any(zone.covers(floor) for zone in self.zones)
+        ]
+        if uncovered:
+            raise ValueError(f"Floor(s) in no zone: {', '.join(map(str, uncovered))}")
+
+    @property
+    def elevator_ids(self) -> List[int]:
+        return list(range(MIN_ELEVATOR_ID, MIN_ELEVATOR_ID + self.num_elevators))
+
+    @property
+    def max_elevator_id(self) -> int:
+        return MIN_ELEVATOR_ID + self.num_elevators - 1
+
+    def is_valid_floor(self, floor: int) -> bool:
+        return floor in self.floor_index
+
+    def is_valid_elevator_id(self, elevator_id: int) -> bool:
+        return MIN_ELEVATOR_ID <= elevator_id <= self.max_elevator_id
+
+    def position(self, floor: int) -> int:
+        """Index of `floor` among the served floors.
+
+        Labels outside the building continue the numbering one per floor, and
+        a skipped label takes the index of the next served floor above it.
+        """
+        index = self.floor_index.get(floor)
+        if index is not None:
+            return index
+        if floor > self.max_floor:
+            return len(self.floors) - 1 + (floor - self.max_floor)
+        if floor < self.min_floor:
+            return floor - self.min_floor
+        return bisect_left(self.floors, floor)
+
+    def distance(self, floor_a: int, floor_b: int) -> int:
+        """Number of floors travelled between two floor labels."""
+        index = self.floor_index
+        if floor_a in index and floor_b in index:
+            return abs(index[floor_a] - index[floor_b])
+        return abs(self.position(floor_a) - self.position(floor_b))
+
+    def next_floor(self, floor: int, step: int) -> int:
+        """Return the floor reached by moving one served floor in direction `step` (+1/-1)."""
+        index = self.floor_index.get(floor)
+        if index is not None and 0 <= index + step < len(self.floors):
+            return self.floors[index + step]
+        # Outside the building: plain label arithmetic
+        floor += step
+        while floor in self.skipped_floors:
+            floor += step
+        return floor
+
+    def timing_for(self, elevator_id: int) -> Dict[str, float]:
+        """Timing parameters of one car, including its overrides."""
+        return {**self.timing, **self.car_timing.get(elevator_id, {})}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BuildingConfig":
+        known = {
+            "min_floor", "max_floor", "skipped_floors", "num_elevators", "timing", "car_timing",
+            "dispatch_strategy", "en_route_pickup", "zones",
+        }
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown building option(s): {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    @classmethod
+    def from_file(cls, path: str) -> "BuildingConfig":
+        """Load a configuration from a JSON file with the keys of from_dict()."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "min_floor": self.min_floor,
+            "max_floor": self.max_floor,
+            "skipped_floors": sorted(self.skipped_floors),
+            "num_elevators": self.num_elevators,
+            "timing": dict(self.timing),
+            "car_timing": {k: dict(v) for k, v in self.car_timing.items()},
+            "dispatch_strategy": self.dispatch_strategy,
+            "en_route_pickup": self.en_route_pickup,
+            "zones": [zone.to_dict() for zone in self.zones] if self.zones is not None else None,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"BuildingConfig(floors={self.min_floor}..{self.max_floor}, "
+            f"skipped={sorted(self.skipped_floors)}, elevators={self.num_elevators})"
+        )
+
+
+class Zone(NamedTuple):
+    """Floor band of a zoned building and the cars that serve its hall calls."""
+
+    lowest: int  # Lowest and highest floor label of the band, inclusive
+    highest: int
+    elevator_ids: Tuple[int, ...]
+
+    def covers(self, floor: int) -> bool:
+        return self.lowest <= floor <= self.highest
+
+    @classmethod
+    def parse(cls, data: Any) -> "Zone":
+        """Zone from a Zone or a {"floors": [lowest, highest], "elevators": [ids]} dict."""
+        if isinstance(data, Zone):
+            return data
+        try:
+            if set(data) != {"floors", "elevators"}:
+                raise ValueError
+            lowest, highest = (int(floor) for floor in data["floors"])
+            elevator_ids = tuple(int(elevator_id) for elevator_id in data["elevators"])
+        except (TypeError, ValueError):
+            raise ValueError(
+                'Each zone must be {"floors": [lowest, highest], "elevators": [ids]}'
+            ) from None
+        return cls(lowest, highest, elevator_ids)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"floors": [self.lowest, self.highest], "elevators": list(self.elevator_ids)}
 
 
 class CallState(Enum):
@@ -16,17 +256,81 @@ class CallState(Enum):
     COMPLETED = "completed"  # Call has been completed
 
 
+# Outside calls are identified by ints handed out by a CallIdAllocator
+CallId = int
+CALL_SEQUENCE_BITS = 40  # Calls per simulator before the sequence runs into the shard
+CALL_SHARD_BITS = 12
+
+
+class CallIdAllocator:
+    """Hands out monotonically increasing integer call ids.
+
+    The optional process and shard prefixes are packed above the sequence
+    number, so simulators running side by side with distinct prefixes never
+    issue the same id. Without a prefix the ids are simply 1, 2, 3, ...
+    Safe to share between threads (ZMQ and WebSocket commands add calls).
+    """
+
+    __slots__ = ("process", "shard", "_last", "_lock")
+
+    def __init__(self, process: int = 0, shard: int = 0) -> None:
+        if process < 0:
+            raise ValueError(f"Invalid process prefix: {process}. Must not be negative.")
+        if not 0 <= shard < 1 << CALL_SHARD_BITS:
+            raise ValueError(
+                f"Invalid shard prefix: {shard}. Must be in [0, {(1 << CALL_SHARD_BITS) - 1}]."
+            )
+        self.process = process
+        self.shard = shard
+        prefix = (process << CALL_SHARD_BITS | shard) << CALL_SEQUENCE_BITS
+        self._last: CallId = prefix
+        self._lock = threading.Lock()
+
+    def next_id(self) -> CallId:
+        """Return the next call id."""
+        with self._lock:
+            self._last += 1
+            return self._last
+
+    def __getstate__(self) -> Dict[str, int]:
+        # The lock is not picklable; copies get their own
+        return {"process": self.process, "shard": self.shard, "_last": self._last}
+
+    def __setstate__(self, state: Dict[str, int]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def split(call_id: CallId) -> Tuple[int, int, int]:
+        """Split a call id into its (process, shard, sequence) parts."""
+        prefix, sequence = divmod(call_id, 1 << CALL_SEQUENCE_BITS)
+        process, shard = divmod(prefix, 1 << CALL_SHARD_BITS)
+        return process, shard, sequence
+
+
 class Call:
     """Represents an outside call request with state tracking"""
 
+    # Calls are kept in the dispatcher log for the lifetime of the process
+    __slots__ = (
+        "call_id", "floor", "direction", "state", "assigned_elevator", "created_at", "presses",
+    )
+
     def __init__(
-        self, call_id: str, floor: int, direction: Optional["MoveDirection"] = None
+        self,
+        call_id: CallId,
+        floor: int,
+        direction: Optional["MoveDirection"] = None,
+        created_at: Optional[float] = None,
     ):
         self.call_id = call_id
         self.floor = floor
         self.direction = direction
         self.state = CallState.PENDING
         self.assigned_elevator: Optional[int] = None
+        self.created_at = created_at  # Clock time when the call was registered
+        self.presses = 1  # Button presses folded into this call
 
     def assign_to_elevator(self, elevator_idx: int) -> None:
         """Assign this call to a specific elevator"""
@@ -74,6 +378,8 @@ class MoveDirection(Enum):
 
 
 class MoveRequest:
+    __slots__ = ("elevator_id", "direction")
+
     def __init__(self, elevator_id: int, direction: MoveDirection) -> None:
         self.elevator_id = elevator_id
         self.direction = direction  # "up" or "down"
@@ -84,13 +390,22 @@ class Task:
 
     Attributes:
         floor: The target floor number.
-        call_id: Optional[str]. If present, links to an outside call in the dispatcher.
+        call_id: Optional[CallId]. If present, links to an outside call in the dispatcher.
                 If None, this is an inside call (from elevator panel).
+        direction: Optional[MoveDirection]. Direction of the outside call, if known.
     """
 
-    def __init__(self, floor: int, call_id: Optional[str] = None) -> None:
+    __slots__ = ("floor", "call_id", "direction")
+
+    def __init__(
+        self,
+        floor: int,
+        call_id: Optional[CallId] = None,
+        direction: Optional[MoveDirection] = None,
+    ) -> None:
         self.floor = floor
         self.call_id = call_id
+        self.direction = direction
 
     def __repr__(self) -> str:
         return f"Task(floor={self.floor}, call_id={self.call_id})"
@@ -101,15 +416,26 @@ class Task:
         return self.call_id is not None
 
 
+class CallAssignment(NamedTuple):
+    """Where an assigned outside call is served (see Dispatcher.call_index)."""
+
+    elevator_idx: int  # 0-based index of the serving elevator
+    task: Task  # The task holding the call in that elevator's queue
+    direction: Optional[MoveDirection]
+
+
+DEFAULT_BUILDING = BuildingConfig()
+
+
 # Validation utility functions
-def validate_floor(floor: int) -> bool:
-    """Validate if floor is within acceptable range."""
-    return MIN_FLOOR <= floor <= MAX_FLOOR
+def validate_floor(floor: int, config: Optional[BuildingConfig] = None) -> bool:
+    """Validate if floor is within acceptable range (default building unless given)."""
+    return (config or DEFAULT_BUILDING).is_valid_floor(floor)
 
 
-def validate_elevator_id(elevator_id: int) -> bool:
-    """Validate if elevator ID is within acceptable range."""
-    return MIN_ELEVATOR_ID <= elevator_id <= MAX_ELEVATOR_ID
+def validate_elevator_id(elevator_id: int, config: Optional[BuildingConfig] = None) -> bool:
+    """Validate if elevator ID is within acceptable range (default building unless given)."""
+    return (config or DEFAULT_BUILDING).is_valid_elevator_id(elevator_id)
 
 
 def validate_direction(direction: str) -> bool:
@@ -0,0 +1,218 @@
+"""Lookahead rollout dispatch: try each candidate car on a copy of the building.
+
+For a hall call that more than one car can take, the dispatcher's rollout
+mode assigns the call to each candidate in turn on a detached copy of the
+simulator (Simulator.clone), runs the copy ahead for a horizon of virtual
+time with the dispatcher's own policy for everything else, and scores the
+waits of all open hall calls. The candidate with the lowest score takes the
+call.
+
+Rollouts run in a process pool, one job per candidate, and every dispatch
+pass has one wall-clock budget for all of its decisions: rollouts still
+running when it expires stop, those and failed ones are dropped, and if none
+finished the dispatcher keeps its strategy's choice. The copies send no messages (NullAPI), so rollouts never reach ZMQ.
+"""
+
+import os
+import pickle
+import time
+from contextlib import contextmanager
+from concurrent.futures import Executor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
+
+from .models import CallId
+from .utility import start_process_pool
+
+if TYPE_CHECKING:
+    from .simulator import Simulator
+
+ROLLOUT_HORIZON = 120.0  # Virtual seconds each rollout runs ahead
+ROLLOUT_BUDGET = 0.05  # Wall seconds a dispatch pass may spend on rollouts
+
+
+def rollout_cost(
+    simulator: "Simulator",
+    call_id: CallId,
+    elevator_idx: int,
+    horizon: float = ROLLOUT_HORIZON,
+    deadline: Optional[float] = None,
+) -> Optional[float]:
+    """Total wait of the open hall calls if the elevator takes the call.
+
+    Assigns the waiting call `call_id` to the elevator on `simulator` (a
+    copy, which this modifies), runs it `horizon` seconds ahead event by
+    event and adds up the wait of every call that was open at the start:
+    until its car arrives, or until the end for calls still open. Returns
+    None if time.perf_counter() passes `deadline` before the run ends.
+    """
+    dispatcher = simulator.dispatcher
+    clock = simulator.clock
+    now = clock.now()
+    end = now + horizon
+    open_calls: Dict[CallId, float] = {
+        open_id: call.created_at for open_id, call in dispatcher.pending_calls.items()
+    }
+    dispatcher.assign_call(call_id, elevator_idx)
+
+    total = 0.0
+    while True:
+        for open_id in [open_id for open_id in open_calls if open_id not in dispatcher.pending_calls]:
+            total += now - open_calls.pop(open_id)  # Completed when its car arrived
+        if not open_calls:
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            return None
+        event = simulator.next_event_time()
+        if event is None or event > end:
+            break
+        now = clock.advance_to(event)
+        simulator.process_due_events()
+    return total + sum(end - created_at for created_at in open_calls.values())
+
+
+def _rollout_job(
+    state: bytes, call_id: CallId, elevator_idx: int, horizon: float, wall_deadline: float
+) -> Optional[float]:
+    """rollout_cost() on a pickled simulator copy, in a worker process.
+
+    `wall_deadline` is a time.time() value, comparable across processes; a
+    rollout past it stops, so abandoned rollouts do not hold up the workers.
+    """
+    deadline = time.perf_counter() + (wall_deadline - time.time())
+    return rollout_cost(pickle.loads(state), call_id, elevator_idx, horizon, deadline)
+
+
+class RolloutPlanner:
+    """Picks the car for a call by rollouts within a per-pass time budget.
+
+    `workers` processes run the rollouts (by default one per CPU); with
+    workers=0 they run one after another in this process, as long as the
+    budget lasts. Call start() before the simulation runs, as starting the
+    workers takes longer than a decision may; until then, and after close()
+    or a worker dying (which drops the pool), decisions keep the strategy's
+    choice. The decisions of one dispatch pass (dispatch_pass()) share one
+    budget; a decision outside a pass gets a budget of its own.
+    """
+
+    def __init__(
+        self,
+        horizon: float = ROLLOUT_HORIZON,
+        budget: float = ROLLOUT_BUDGET,
+        workers: Optional[int] = None,
+    ) -> None:
+        if horizon <= 0:
+            raise ValueError("Rollout horizon must be positive")
+        if budget < 0:
+            raise ValueError("Rollout budget must not be negative")
+        if workers is not None and workers < 0:
+            raise ValueError("Number of rollout workers must not be negative")
+        self.horizon: float = horizon
+        self.budget: float = budget
+        self.workers: Optional[int] = workers
+        self._pool: Optional[Executor] = None
+        # End of the budget of the dispatch pass in progress (perf_counter), or None
+        self._pass_deadline: Optional[float] = None
+        # Decisions made, and those where the budget ran out (or a rollout failed)
+        # before every rollout finished
+        self.decisions: int = 0
+        self.timeouts: int = 0
+
+    def start(self) -> None:
+        """Start the worker processes and wait until they are ready (no-op for workers=0)."""
+        if self.workers == 0 or self._pool is not None:
+            return
+        self._pool = start_process_pool(self.workers or os.cpu_count() or 1)
+
+    @contextmanager
+    def dispatch_pass(self) -> Iterator[None]:
+        """Share one budget between the decisions made inside; nested passes join the outer one."""
+        if self._pass_deadline is not None:
+            yield
+            return
+        self._pass_deadline = time.perf_counter() + self.budget
+        try:
+            yield
+        finally:
+            self._pass_deadline = None
+
+    def choose(
+        self, simulator: "Simulator", call_id: CallId, candidates: List[int]
+    ) -> Optional[int]:
+        """Index of the candidate elevator with the lowest rollout cost for the waiting call.
+
+        Only rollouts that finish within the budget (what is left of the
+        pass's) count; returns None if none did. Failed rollouts count as
+        unfinished.
+        """
+        deadline = self._pass_deadline
+        if deadline is None:
+            deadline = time.perf_counter() + self.budget
+        self.decisions += 1
+        if self.workers == 0:
+            costs = self._run_inline(simulator, call_id, candidates, deadline)
+        else:
+            costs = self._run_pool(simulator, call_id, candidates, deadline)
+        if len(costs) < len(candidates):
+            self.timeouts += 1
+        if not costs:
+            return None
+        # Ties go to the candidate listed first (the strategy's order)
+        return min((idx for idx in candidates if idx in costs), key=costs.__getitem__)
+
+    def _run_inline(
+        self, simulator: "Simulator", call_id: CallId, candidates: List[int], deadline: float
+    ) -> Dict[int, float]:
+        costs: Dict[int, float] = {}
+        for elevator_idx in candidates:
+            if time.perf_counter() >= deadline:
+                break
+            cost = rollout_cost(simulator.clone(), call_id, elevator_idx, self.horizon, deadline)
+            if cost is None:
+                break  # The budget ran out during this rollout
+            costs[elevator_idx] = cost
+        return costs
+
+    def _run_pool(
+        self, simulator: "Simulator", call_id: CallId, candidates: List[int], deadline: float
+    ) -> Dict[int, float]:
+        if self._pool is None or time.perf_counter() >= deadline:
+            return {}  # Starting the workers here would hold up the live tick
+        state = pickle.dumps(simulator.clone(), pickle.HIGHEST_PROTOCOL)  # One copy for all jobs
+        wall_deadline = time.time() + (deadline - time.perf_counter())
+        try:
+            jobs = {
+                self._pool.submit(
+                    _rollout_job, state, call_id, elevator_idx, self.horizon, wall_deadline
+                ): elevator_idx
+                for elevator_idx in candidates
+            }
+        except BrokenProcessPool:
+            self._drop_broken_pool()
+            return {}
+        done, pending = wait(jobs, max(0.0, deadline - time.perf_counter()))
+        for job in pending:
+            job.cancel()  # Rollouts already running stop at the deadline and are ignored
+        costs: Dict[int, float] = {}
+        for job in done:
+            try:
+                cost = job.result()
+            except BrokenProcessPool:
+                self._drop_broken_pool()
+            except Exception as e:
+                print(f"Rollout: Rollout of elevator {jobs[job] + 1} failed: {e}")
+            else:
+                if cost is not None:
+                    costs[jobs[job]] = cost
+        return costs
+
+    def _drop_broken_pool(self) -> None:
+        if self._pool is not None:
+            print("Rollout: Worker pool broke; keeping the strategy's choices until restarted")
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -1,23 +1,63 @@
-import time
-from typing import List, TYPE_CHECKING, Optional
+import heapq
+import threading
+from typing import Dict, List, TYPE_CHECKING, Optional, Tuple
+from .api.null import NullAPI
+from .clock import Clock, MonotonicClock, SteppableClock, VirtualClock
 from .elevator import Elevator
 from .dispatcher import Dispatcher
+from .models import BuildingConfig, CallIdAllocator, ElevatorState
+from .zoning import ZonedDispatcher
 
 # ZmqCoordinator is no longer initialized or used directly by Simulator
 # from .api.zmq import ZmqCoordinator
 
 if TYPE_CHECKING:
     from .api.core import ElevatorAPI
+    from .fleet import FleetEngine
 
 
 class Simulator:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        clock: Optional[Clock] = None,
+        lockstep: bool = False,
+        vectorized: bool = False,
+        config: Optional[BuildingConfig] = None,
+        call_ids: Optional[CallIdAllocator] = None,
+        announce: bool = True,
+    ) -> None:
+        # Building geometry and car timing; defaults to floors -1..3 with two cars
+        self.config: BuildingConfig = config if config is not None else BuildingConfig()
+        # In lockstep mode nothing advances time except step(); it needs a virtual clock.
+        self.lockstep: bool = lockstep
+        # Vectorized mode keeps car state in a NumPy-backed FleetEngine (optional dependency)
+        self.vectorized: bool = vectorized
+        self.fleet: Optional["FleetEngine"] = None
+        # Call id source handed to the dispatcher; prefixed when simulators run side by side
+        self.call_ids: Optional[CallIdAllocator] = call_ids
+        if clock is None:
+            clock = VirtualClock() if lockstep else MonotonicClock()
+        if lockstep and not isinstance(clock, SteppableClock):
+            raise ValueError("Lockstep mode needs a clock that can skip time (SteppableClock)")
+        # Every component created by the simulator shares this clock
+        self.clock: Clock = clock
         self.api: Optional["ElevatorAPI"] = None
         self.elevators: List[Elevator] = []
         self.dispatcher: Optional[Dispatcher] = None
-        print(
-            "Simulator: Initialized. API and components to be set via set_api_and_initialize_components."
-        )
+        self._init_scheduler()
+        if announce:  # Copies made by clone() stay silent
+            print(
+                "Simulator: Initialized. API and components to be set via set_api_and_initialize_components."
+            )
+
+    def _init_scheduler(self) -> None:
+        """Empty discrete-event scheduling state; every deadline is read on the next event."""
+        # Heap of (deadline, elevator index). Entries are invalidated lazily by
+        # comparing with _scheduled.
+        self._event_heap: List[Tuple[float, int]] = []
+        self._scheduled: List[Optional[float]] = []
+        self._reschedule_all: bool = True
+        self._wakeup = threading.Event()
 
     def set_api_and_initialize_components(self, api: "ElevatorAPI") -> None:
         """Sets the ElevatorAPI instance and initializes components that depend on it."""
@@ -26,25 +66,223 @@ class Simulator:
             raise ValueError("API instance cannot be None when initializing components")
 
         # Pass the API instance to components that need it (e.g., for sending floor_arrived messages)
-        self.elevators = [
-            Elevator(1, self, self.api),  # Elevator needs API to send floor_arrived
-            Elevator(2, self, self.api),  # Elevator needs API to send floor_arrived
-        ]
-        self.dispatcher = Dispatcher(
-            self, self.api
+        if self.vectorized:
+            from .fleet import FleetEngine  # Imported lazily: requires NumPy
+
+            self.fleet = FleetEngine(self.config.num_elevators, self.clock, self.config)
+            self.elevators = self.fleet.create_elevators(
+                self.config.elevator_ids, self, self.api
+            )
+        else:
+            self.elevators = [
+                Elevator(elevator_id, self, self.api, self.clock, self.config)
+                for elevator_id in self.config.elevator_ids
+            ]  # Elevators need the API to send floor_arrived
+        # A zoned building gets a coordinator over one dispatcher per zone
+        dispatcher_class = ZonedDispatcher if self.config.zones is not None else Dispatcher
+        self.dispatcher = dispatcher_class(
+            self, self.api, self.clock, self.config, self.call_ids
         )  # Dispatcher might need API for logging or complex signals
+        self._reschedule_all = True
         print("Simulator: ElevatorAPI set and dependent components initialized.")
 
+    def clone(self, api: Optional["ElevatorAPI"] = None) -> "Simulator":
+        """Detached copy of the building for what-if runs (lookahead rollouts).
+
+        The copy runs on its own VirtualClock, starting at this simulator's
+        current time, and only moves when advanced (lockstep). Its cars,
+        queues and open calls are copies, so it can be run ahead without
+        affecting this simulator. Messages go to `api`, by default nowhere
+        (NullAPI), so a copy never talks to ZMQ. Vectorized cars
+        are copied as plain Elevators. Copies can be pickled and sent to
+        worker processes.
+        """
+        api = api if api is not None else NullAPI()
+        clock = VirtualClock(self.clock.now())
+        twin = Simulator(clock=clock, lockstep=True, config=self.config, announce=False)
+        twin.api = api
+        twin.elevators = [elevator.clone(twin, api, clock) for elevator in self.elevators]
+        twin.dispatcher = (
+            self.dispatcher.clone(twin, api, clock) if self.dispatcher is not None else None
+        )
+        return twin
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        del state["_wakeup"]  # Not picklable; recreated empty
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._wakeup = threading.Event()
+
     def update(self) -> None:
+        """Poll every elevator once (fixed-tick driver)."""
         # ZMQ message polling and processing is now handled by ZmqClientThread within ElevatorAPI.
         # No direct ZMQ polling call needed here.
 
         # Update simulation components.
-        for elevator in self.elevators:
-            elevator.update()
+        if self.fleet is not None:
+            self.fleet.update()
+        else:
+            for elevator in self.elevators:
+                elevator.update()
 
         if self.dispatcher:
             self.dispatcher.update()
+        self._reschedule_all = True
+
+    def notify(self) -> None:
+        """Signal that elevator state changed outside the event loop (ZMQ/WebSocket command).
+
+        Forces all deadlines to be recomputed and wakes wait_for_next_event().
+        """
+        self._reschedule_all = True
+        self._wakeup.set()
+
+    def _schedule(self, index: int, deadline: Optional[float]) -> None:
+        self._scheduled[index] = deadline
+        if deadline is not None:
+            heapq.heappush(self._event_heap, (deadline, index))
+
+    def _refresh_schedule(self) -> None:
+        """Rebuild the event heap from every elevator if a wake-up asked for it."""
+        if not self._reschedule_all:
+            return
+        self._reschedule_all = False
+        self._event_heap = []
+        self._scheduled = [None] * len(self.elevators)
+        for index, deadline in enumerate(self._next_deadlines()):
+            self._schedule(index, deadline)
+
+    def _next_deadlines(self) -> List[Optional[float]]:
+        """Return next_deadline() of every elevator, in index order."""
+        if self.fleet is not None:
+            return [
+                None if deadline == float("inf") else deadline
+                for deadline in self.fleet.next_deadlines().tolist()
+            ]
+        return [elevator.next_deadline() for elevator in self.elevators]
+
+    def next_event_time(self) -> Optional[float]:
+        """Return the clock time of the earliest pending elevator event, or None."""
+        self._refresh_schedule()
+        heap = self._event_heap
+        while heap and heap[0][0] != self._scheduled[heap[0][1]]:
+            heapq.heappop(heap)  # Drop entries superseded by a later reschedule
+        return heap[0][0] if heap else None
+
+    def process_due_events(self) -> bool:
+        """Update only the elevators whose deadline has passed.
+
+        Returns True if any elevator was updated.
+        """
+        now = self.clock.now()
+        if self.fleet is not None:
+            processed = self._process_due_fleet(now)
+        else:
+            processed = self._process_due_elevators(now)
+
+        if processed and self.dispatcher and self.dispatcher.update():
+            # A car that became free took a waiting call
+            self._reschedule_all = True
+        return processed
+
+    def _process_due_elevators(self, now: float) -> bool:
+        processed = False
+        while True:
+            deadline = self.next_event_time()
+            if deadline is None or deadline > now:
+                break
+            _, index = heapq.heappop(self._event_heap)
+            elevator = self.elevators[index]
+            elevator.update()
+            # A deadline still due (e.g. the floor change after travel) is popped again
+            self._schedule(index, elevator.next_deadline())
+            processed = True
+        return processed
+
+    def _process_due_fleet(self, now: float) -> bool:
+        """Batch variant of _process_due_elevators: all due cars advance in one vectorized step."""
+        due: List[int] = []
+        while True:
+            deadline = self.next_event_time()
+            if deadline is None or deadline > now:
+                break
+            due.append(heapq.heappop(self._event_heap)[1])
+        if not due:
+            return False
+
+        while due:
+            self.fleet.update(due)
+            still_due = []
+            for index, deadline in zip(due, self.fleet.next_deadlines(due).tolist()):
+                if deadline <= now:
+                    still_due.append(index)
+                else:
+                    self._schedule(index, None if deadline == float("inf") else deadline)
+            due = still_due
+        return True
+
+    def fast_forward(self) -> bool:
+        """Jump the clock to the next pending event if nothing observable happens before it.
+
+        Only applies when no elevator is moving and no command is waiting to be
+        processed, so the emitted message sequence is the same as in real time.
+        Returns True if the clock was moved. Needs a SteppableClock.
+        """
+        if not isinstance(self.clock, SteppableClock):
+            raise RuntimeError(f"{type(self.clock).__name__} cannot skip time")
+        if self._wakeup.is_set():
+            return False  # A command arrived; let the event loop handle it first
+        if any(elevator.state != ElevatorState.IDLE for elevator in self.elevators):
+            return False
+        deadline = self.next_event_time()
+        if deadline is None or deadline <= self.clock.now():
+            return False
+        self.clock.advance_to(deadline)
+        return True
+
+    def step(self, seconds: float) -> None:
+        """Advance the simulation by exactly `seconds` of virtual time (lockstep mode).
+
+        Events inside the window are processed in deadline order, with the clock
+        jumping from one event to the next, and the clock ends at the window end.
+        """
+        if not self.lockstep:
+            raise RuntimeError("Simulator is not running in lockstep mode")
+        if seconds < 0:
+            raise ValueError("Step duration must be non-negative")
+        end = self.clock.now() + seconds
+        self.process_due_events()
+        while True:
+            deadline = self.next_event_time()
+            if deadline is None or deadline > end:
+                break
+            self.clock.advance_to(deadline)
+            self.process_due_events()
+        self.clock.advance_to(end)
+
+    def wait_for_notify(self, timeout: Optional[float]) -> bool:
+        """Block in real time until notify() is called or `timeout` seconds pass."""
+        notified = self._wakeup.wait(timeout)
+        self._wakeup.clear()
+        return notified
+
+    def wait_for_next_event(self, max_wait: Optional[float] = None) -> None:
+        """Sleep until the next elevator event is due or notify() is called.
+
+        `max_wait` caps the sleep so callers can do periodic housekeeping.
+        """
+        # Clear before computing the deadline: a notify() racing with this call
+        # either lands in the rebuilt schedule or sets the event we wait on.
+        self._wakeup.clear()
+        timeout = max_wait
+        deadline = self.next_event_time()
+        if deadline is not None:
+            until_event = max(0.0, deadline - self.clock.now())
+            timeout = until_event if timeout is None else min(timeout, until_event)
+        self.clock.wait(self._wakeup, timeout)
 
     def stop(self) -> None:
         """Stops simulator components, including the ZMQ client via the API."""
@@ -0,0 +1,154 @@
+"""Dispatch strategies: which elevator takes a call.
+
+The Dispatcher keeps the call bookkeeping (wait list, call index, hall-call
+registry) and hands each waiting call to the cheapest car its strategy
+allows, or solves the batch matching over the strategy's costs. A
+DispatchStrategy decides two things:
+
+- can_serve(): whether a car may take a call now;
+- cost(): how good the car is for it (lower is better).
+
+Strategies get the dispatcher passed in, so they all share its call index
+and the elevators' memoized ETA estimates (Elevator.calculate_estimated_time,
+Elevator.snapshot). Strategies are registered by name with
+register_strategy() and selected with BuildingConfig.dispatch_strategy or
+the --dispatch-strategy command line option.
+"""
+
+from typing import Dict, Optional, Type, TYPE_CHECKING
+
+from .eta import insertion_delay
+from .models import DEFAULT_DISPATCH_STRATEGY, ElevatorState, MoveDirection
+
+if TYPE_CHECKING:
+    from .dispatcher import Dispatcher
+    from .elevator import Elevator
+
+DISPATCH_STRATEGIES: Dict[str, Type["DispatchStrategy"]] = {}
+
+
+def register_strategy(cls: Type["DispatchStrategy"]) -> Type["DispatchStrategy"]:
+    """Class decorator adding a strategy to DISPATCH_STRATEGIES under its name."""
+    DISPATCH_STRATEGIES[cls.name] = cls
+    return cls
+
+
+def create_strategy(name: str = DEFAULT_DISPATCH_STRATEGY) -> "DispatchStrategy":
+    """Instantiate the registered strategy `name`."""
+    try:
+        return DISPATCH_STRATEGIES[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown dispatch strategy: '{name}'. "
+            f"Choose from: {', '.join(sorted(DISPATCH_STRATEGIES))}."
+        ) from None
+
+
+def moving_towards(elevator: "Elevator", floor: int, direction: Optional[MoveDirection]) -> bool:
+    """True if the car is moving in `direction` and has not yet passed `floor`."""
+    if direction is MoveDirection.UP:
+        return elevator.state == ElevatorState.MOVING_UP and floor > elevator.current_floor
+    if direction is MoveDirection.DOWN:
+        return elevator.state == ElevatorState.MOVING_DOWN and floor < elevator.current_floor
+    return False
+
+
+class DispatchStrategy:
+    """Base strategy: hall calls go to free cars, ranked by estimated time.
+
+    Calls without a direction may go to any car. Subclasses override
+    can_serve(), cost() and, if they accept busy cars, may_serve().
+    """
+
+    name = ""
+
+    def can_serve(
+        self,
+        dispatcher: "Dispatcher",
+        elevator: "Elevator",
+        floor: int,
+        direction: Optional[MoveDirection],
+    ) -> bool:
+        """Whether the elevator may take a call at `floor` in `direction` now."""
+        if direction is None:
+            return True
+        return dispatcher.is_free(elevator)
+
+    def may_serve(self, dispatcher: "Dispatcher", elevator: "Elevator") -> bool:
+        """Cheap check whether the elevator could take any hall call now.
+
+        Dispatcher.update() skips the dispatch pass over waiting calls while
+        this is False for every car.
+        """
+        return dispatcher.is_free(elevator)
+
+    def cost(
+        self,
+        dispatcher: "Dispatcher",
+        elevator: "Elevator",
+        floor: int,
+        direction: Optional[MoveDirection],
+    ) -> float:
+        """Rank of the elevator for the call; the cheapest eligible car takes it."""
+        return elevator.calculate_estimated_time(floor, direction)
+
+
+@register_strategy
+class IdleEtaStrategy(DispatchStrategy):
+    """Only fully idle cars take hall calls; the one with the lowest ETA wins (original policy)."""
+
+    name = "idle-eta"
+
+
+@register_strategy
+class NearestCarStrategy(DispatchStrategy):
+    """Nearest car: free cars and cars already heading for the call in its direction.
+
+    The cost is the distance in floors; a free car counts one floor more
+    than a car passing by, as it has to start up (the figure of suitability
+    of the classic nearest-car rule). Queued stops are ignored.
+    """
+
+    name = "nearest-car"
+
+    def can_serve(self, dispatcher, elevator, floor, direction):
+        return super().can_serve(dispatcher, elevator, floor, direction) or moving_towards(
+            elevator, floor, direction
+        )
+
+    def may_serve(self, dispatcher, elevator):
+        return dispatcher.is_free(elevator) or elevator.state != ElevatorState.IDLE
+
+    def cost(self, dispatcher, elevator, floor, direction):
+        distance = dispatcher.config.distance(elevator.current_floor, floor)
+        return distance if moving_towards(elevator, floor, direction) else distance + 1
+
+
+@register_strategy
+class CollectiveControlStrategy(NearestCarStrategy):
+    """Collective control: moving cars collect the hall calls ahead of them in their direction.
+
+    Eligibility as for nearest-car, but cars are ranked by estimated time,
+    so the stops a car already has count against it.
+    """
+
+    name = "collective"
+
+    def cost(self, dispatcher, elevator, floor, direction):
+        return elevator.calculate_estimated_time(floor, direction)
+
+
+@register_strategy
+class EtdStrategy(CollectiveControlStrategy):
+    """Estimated time of destination: the caller's wait plus the delay imposed on others.
+
+    The cost of a car is its estimated time to the call plus the extra time
+    the stops it already has wait for the new stop (see eta.insertion_delay).
+    """
+
+    name = "etd"
+
+    def cost(self, dispatcher, elevator, floor, direction):
+        return elevator.calculate_estimated_time(floor, direction) + insertion_delay(
+            elevator.snapshot(), floor
+        )
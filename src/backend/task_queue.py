@@ -0,0 +1,415 @@
+"""Elevator task queue: SCAN ordering with bitset stop indexes.
+
+The queue keeps the tasks in service order (the head is the next stop), like
+the list it replaces. Stops are held in two heaps split at the car's floor
+(the pivot): an ascending heap for stops above and a descending heap for
+stops below. The heap of the current sweep direction is served first, so
+inserting a stop or serving the next one costs O(log n) instead of a
+re-sort of the whole queue (LOOK scheduling).
+
+Alongside the heaps the queue maintains one bitmask per kind of stop
+(inside, hall up, hall down), where bit `floor - base` is set while there is
+a stop at `floor`, and a map of the outside calls in the queue. Stop lookups
+("any stop above?", "nearest stop below", duplicate checks) are then bit
+operations instead of scans over the queue.
+
+For direction decisions the queue also keeps live counts of the stops above,
+below and at the pivot and the nearest stop on either side of it, updated on
+every insert and removal and when the pivot moves with the car.
+"""
+
+from collections.abc import MutableSequence
+from heapq import heapify, heappop, heappush
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .models import MIN_FLOOR, CallId, MoveDirection, Task
+
+UP = MoveDirection.UP
+DOWN = MoveDirection.DOWN
+
+# Heap entry: (floor for the ascending heap / -floor for the descending heap,
+# insertion number to keep equal floors in arrival order, task)
+_Entry = Tuple[int, int, Task]
+
+# Stop kinds: index into TaskQueue.masks
+INSIDE = 0
+HALL_UP = 1
+HALL_DOWN = 2
+
+
+def _kinds(task: Task) -> Tuple[int, ...]:
+    """Stop kinds a task occupies. Hall calls without a direction count for both sweeps."""
+    if task.call_id is None:
+        return (INSIDE,)
+    if task.direction is MoveDirection.UP:
+        return (HALL_UP,)
+    if task.direction is MoveDirection.DOWN:
+        return (HALL_DOWN,)
+    return (HALL_UP, HALL_DOWN)
+
+
+class TaskQueue(MutableSequence):
+    """Stops of one elevator in LOOK order plus per-kind stop bitmasks.
+
+    Supports the list operations the elevator and dispatcher use (indexing,
+    len, iteration, append, pop, clear, comparison with lists). The position
+    passed to insert() is ignored: stops are always kept in sweep order.
+    `floor` is the car's floor the stops are split at and `base` is the
+    lowest floor label the bitmasks cover; it moves down automatically if a
+    lower floor is added. The sweep starts towards the first given task.
+    """
+
+    def __init__(
+        self,
+        tasks: Iterable[Task] = (),
+        base: int = MIN_FLOOR,
+        floor: Optional[int] = None,
+    ) -> None:
+        tasks = list(tasks)
+        self.base: int = base
+        self.pivot: int = floor if floor is not None else base
+        self.sweep: MoveDirection = DOWN if tasks and tasks[0].floor < self.pivot else UP
+        self.masks: List[int] = [0, 0, 0]
+        self.stops: int = 0  # Floors with a stop of any kind
+        self._refs: Tuple[Dict[int, int], ...] = ({}, {}, {})  # kind -> {floor: stops}
+        self._calls: Dict[CallId, Task] = {}  # Outside calls in the queue by call_id
+        self._up: List[_Entry] = []  # Stops above the pivot (ascending)
+        self._down: List[_Entry] = []  # Stops below the pivot (descending)
+        self._seq: int = 0  # Insertion number of the last entry
+        self._order: Optional[List[Task]] = None  # Cached service order
+        self.version: int = 0  # Incremented on every change to the stops or their order
+        self._floor_tasks: Dict[int, int] = {}  # floor -> tasks
+        self._profile: Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]] = None
+        self._profile_version: int = -1
+        # Stops relative to the pivot
+        self.count_above: int = 0
+        self.count_below: int = 0
+        self.count_here: int = 0
+        self.next_above: Optional[int] = None  # Nearest floor with a stop above the pivot
+        self.next_below: Optional[int] = None  # Nearest floor with a stop below the pivot
+        for task in tasks:
+            self._entry_heap(task.floor).append(self._entry(task))
+            self._add(task)
+        heapify(self._up)
+        heapify(self._down)
+
+    # Heap maintenance
+
+    def _entry_heap(self, floor: int) -> List[_Entry]:
+        """Heap a stop at `floor` belongs to; stops at the pivot join the current sweep."""
+        if floor > self.pivot or (floor == self.pivot and self.sweep is UP):
+            return self._up
+        return self._down
+
+    def _entry(self, task: Task) -> _Entry:
+        floor = task.floor
+        key = floor if self._entry_heap(floor) is self._up else -floor
+        self._seq += 1
+        return (key, self._seq, task)
+
+    def _push(self, task: Task) -> None:
+        heappush(self._entry_heap(task.floor), self._entry(task))
+        self._add(task)
+        self._order = None
+        self.version += 1
+
+    def _discard(self, task: Task) -> None:
+        for heap in (self._up, self._down):
+            for i, entry in enumerate(heap):
+                if entry[2] is task:
+                    heap[i] = heap[-1]
+                    heap.pop()
+                    heapify(heap)
+                    self._remove(task)
+                    self._order = None
+                    self.version += 1
+                    return
+        raise ValueError(f"{task!r} is not in the queue")
+
+    def _heads(self) -> Tuple[List[_Entry], List[_Entry]]:
+        """(heap served now, heap served after the turn)."""
+        return (self._up, self._down) if self.sweep is UP else (self._down, self._up)
+
+    def _ordered(self) -> List[Task]:
+        if self._order is None:
+            first, second = self._heads()
+            self._order = [entry[2] for entry in sorted(first)] + [
+                entry[2] for entry in sorted(second)
+            ]
+        return self._order
+
+    def move_to(self, floor: int) -> None:
+        """Move the pivot to the car's `floor`, keeping the sweep direction.
+
+        Only stops between the old and the new pivot change heaps and
+        counters, so following the car floor by floor costs O(1) per move
+        plus O(log n) per stop passed.
+        """
+        old = self.pivot
+        if floor == old:
+            return
+        up, down = self._up, self._down
+        if floor > old:
+            while up and up[0][0] < floor:  # The car passed these stops
+                key, seq, task = heappop(up)
+                heappush(down, (-key, seq, task))
+        else:
+            while down and -down[0][0] > floor:
+                key, seq, task = heappop(down)
+                heappush(up, (-key, seq, task))
+        passed = list(self._stop_floors(min(old, floor), max(old, floor)))
+        for stop in passed:
+            tasks = self._floor_tasks[stop]
+            for pivot, change in ((old, -tasks), (floor, tasks)):
+                if stop > pivot:
+                    self.count_above += change
+                elif stop < pivot:
+                    self.count_below += change
+                else:
+                    self.count_here += change
+        self.pivot = floor
+        # The nearest stops only need a bit scan when the car reaches one of them
+        if floor > old:
+            behind = [stop for stop in passed if stop < floor]
+            if behind:
+                self.next_below = behind[-1]
+            if self.next_above is not None and self.next_above <= floor:
+                self.next_above = self.nearest_above(floor)
+        else:
+            behind = [stop for stop in passed if stop > floor]
+            if behind:
+                self.next_above = behind[0]
+            if self.next_below is not None and self.next_below >= floor:
+                self.next_below = self.nearest_below(floor)
+        self._order = None
+        self.version += 1
+
+    def schedule(self, floor: int, sweep: MoveDirection) -> None:
+        """Split the stops at the car's `floor` and serve the `sweep` direction first."""
+        self.move_to(floor)
+        up, down = self._up, self._down
+        self.sweep = sweep
+        # Stops at the car's floor are served first, whatever the sweep
+        if sweep is UP:
+            while down and -down[0][0] == floor:
+                key, seq, task = heappop(down)
+                heappush(up, (-key, seq, task))
+        else:
+            while up and up[0][0] == floor:
+                key, seq, task = heappop(up)
+                heappush(down, (-key, seq, task))
+        self._order = None
+        self.version += 1
+
+    # Index maintenance
+
+    def _add(self, task: Task) -> None:
+        floor = task.floor
+        self._floor_tasks[floor] = self._floor_tasks.get(floor, 0) + 1
+        if floor > self.pivot:
+            self.count_above += 1
+            if self.next_above is None or floor < self.next_above:
+                self.next_above = floor
+        elif floor < self.pivot:
+            self.count_below += 1
+            if self.next_below is None or floor > self.next_below:
+                self.next_below = floor
+        else:
+            self.count_here += 1
+        if floor < self.base:
+            shift = self.base - floor
+            self.masks = [mask << shift for mask in self.masks]
+            self.stops <<= shift
+            self.base = floor
+        bit = 1 << (floor - self.base)
+        self.stops |= bit
+        for kind in _kinds(task):
+            refs = self._refs[kind]
+            refs[floor] = refs.get(floor, 0) + 1
+            self.masks[kind] |= bit
+        if task.call_id is not None:
+            self._calls[task.call_id] = task
+
+    def _remove(self, task: Task) -> None:
+        floor = task.floor
+        for kind in _kinds(task):
+            refs = self._refs[kind]
+            refs[floor] -= 1
+            if not refs[floor]:
+                del refs[floor]
+                self.masks[kind] &= ~(1 << (floor - self.base))
+        if self._calls.get(task.call_id) is task:
+            del self._calls[task.call_id]
+        left = self._floor_tasks[floor] - 1
+        if left:
+            self._floor_tasks[floor] = left
+        else:
+            del self._floor_tasks[floor]
+            self.stops &= ~(1 << (floor - self.base))
+        if floor > self.pivot:
+            self.count_above -= 1
+            if not left and floor == self.next_above:
+                self.next_above = self.nearest_above(floor)
+        elif floor < self.pivot:
+            self.count_below -= 1
+            if not left and floor == self.next_below:
+                self.next_below = self.nearest_below(floor)
+        else:
+            self.count_here -= 1
+
+    def _stop_floors(self, low: int, high: int) -> Iterator[int]:
+        """Floors in [low, high] with at least one stop, bottom to top."""
+        low_bit = max(0, low - self.base)
+        if high < self.base + low_bit:
+            return
+        stops = (self.stops >> low_bit) & ((1 << (high - self.base - low_bit + 1)) - 1)
+        while stops:
+            lowest = stops & -stops
+            yield self.base + low_bit + lowest.bit_length() - 1
+            stops ^= lowest
+
+    def stop_profile(self) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """Floors with a stop in ascending order and the stops below each, then the total.
+
+        Read from the stop bitmask and cached until the queue changes; the
+        cost depends on the number of distinct floors, not on queue length.
+        See backend.eta.stop_profile() for the same profile of a floor list.
+        """
+        if self._profile_version != self.version:
+            stops = tuple(self._stop_floors(self.base, self.base + self.stops.bit_length() - 1))
+            below = [0]
+            for floor in stops:
+                below.append(below[-1] + self._floor_tasks[floor])
+            self._profile = (stops, tuple(below))
+            self._profile_version = self.version
+        return self._profile
+
+    # Sequence protocol
+
+    def __len__(self) -> int:
+        return len(self._up) + len(self._down)
+
+    def __getitem__(self, index):
+        if index == 0 and (self._up or self._down):
+            first, second = self._heads()
+            return (first or second)[0][2]
+        return self._ordered()[index]
+
+    def __setitem__(self, index, value) -> None:
+        del self[index]
+        for task in value if isinstance(index, slice) else (value,):
+            self._push(task)
+
+    def __delitem__(self, index) -> None:
+        old = self._ordered()[index]
+        for task in old if isinstance(index, slice) else (old,):
+            self._discard(task)
+
+    def insert(self, index: int, task: Task) -> None:
+        self._push(task)
+
+    def append(self, task: Task) -> None:
+        self._push(task)
+
+    def pop(self, index: int = -1) -> Task:
+        if index == 0 and (self._up or self._down):
+            first, second = self._heads()
+            task = heappop(first or second)[2]
+            self._remove(task)
+            self._order = None
+            self.version += 1
+            return task
+        task = self._ordered()[index]
+        self._discard(task)
+        return task
+
+    def clear(self) -> None:
+        self._up.clear()
+        self._down.clear()
+        self._order = None
+        self.version += 1
+        self.masks = [0, 0, 0]
+        self.stops = 0
+        self._refs = ({}, {}, {})
+        self._calls.clear()
+        self._floor_tasks.clear()
+        self.count_above = self.count_below = self.count_here = 0
+        self.next_above = self.next_below = None
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._ordered())
+
+    def copy(self) -> List[Task]:
+        return list(self._ordered())
+
+    def clone(self) -> "TaskQueue":
+        """Independent queue with the same stops, order and indexes.
+
+        Copies the heaps and indexes as they are instead of re-inserting the
+        tasks, so the clone serves the stops exactly like this queue. The
+        Task objects themselves are shared; they are never modified.
+        """
+        twin = TaskQueue.__new__(TaskQueue)
+        twin.__dict__.update(self.__dict__)
+        twin.masks = list(self.masks)
+        twin._refs = tuple(dict(refs) for refs in self._refs)
+        twin._calls = dict(self._calls)
+        twin._up = list(self._up)
+        twin._down = list(self._down)
+        twin._floor_tasks = dict(self._floor_tasks)
+        twin._order = None
+        return twin
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TaskQueue):
+            return self._ordered() == other._ordered()
+        if isinstance(other, list):
+            return self._ordered() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"TaskQueue({self._ordered()!r})"
+
+    # Stop lookups (floors are labels)
+
+    def has_call(self, call_id: CallId) -> bool:
+        """True if the outside call is already in the queue."""
+        return call_id in self._calls
+
+    def has_inside_stop(self, floor: int) -> bool:
+        """True if there is an inside (car panel) stop at `floor`."""
+        return floor >= self.base and bool(self.masks[INSIDE] >> (floor - self.base) & 1)
+
+    def has_stop_at(self, floor: int) -> bool:
+        return floor >= self.base and bool(self.stops >> (floor - self.base) & 1)
+
+    def has_stop_away_from(self, floor: int) -> bool:
+        """True if there is a stop at any floor other than `floor` (somewhere to move to)."""
+        if floor < self.base:
+            return bool(self.stops)
+        return bool(self.stops & ~(1 << (floor - self.base)))
+
+    def has_stop_above(self, floor: int) -> bool:
+        return self.nearest_above(floor) is not None
+
+    def has_stop_below(self, floor: int) -> bool:
+        return floor > self.base and bool(self.stops & ((1 << (floor - self.base)) - 1))
+
+    def nearest_above(self, floor: int) -> Optional[int]:
+        """Lowest floor with a stop strictly above `floor`, or None."""
+        offset = max(0, floor - self.base + 1)
+        above = self.stops >> offset
+        if not above:
+            return None
+        return self.base + offset + (above & -above).bit_length() - 1
+
+    def nearest_below(self, floor: int) -> Optional[int]:
+        """Highest floor with a stop strictly below `floor`, or None."""
+        if floor <= self.base:
+            return None
+        below = self.stops & ((1 << (floor - self.base)) - 1)
+        if not below:
+            return None
+        return self.base + below.bit_length() - 1
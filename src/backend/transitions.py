@@ -0,0 +1,308 @@
+"""Elevator behaviour as an explicit transition table.
+
+Every (ElevatorState, DoorState) pair has a row of transitions. A transition
+has a guard that selects it, a deadline (clock time) at which it fires and an
+action. Before the row, the transitions in COMMON_TRANSITIONS fire in every
+state.
+
+An update only evaluates the guards of the car's current row and the
+deadlines of the transitions they select. Guards take the elevator;
+deadlines take the elevator and the current time, and return None for
+"not scheduled". At import, every row is bound into one closure over its
+guards, deadlines and actions, so step() does not loop over the row.
+"""
+
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+from .models import DoorState, ElevatorState
+
+if TYPE_CHECKING:
+    from .elevator import Elevator
+
+ARRIVAL_ANNOUNCE_DELAY = 0.5  # seconds after reaching a floor before it is announced
+MOVE_START_DELAY = 0.5  # seconds an idle car with closed doors waits before departing
+
+IDLE = ElevatorState.IDLE
+
+
+class Transition(NamedTuple):
+    """One row entry of the elevator transition table.
+
+    `target` names the resulting (state, door state) for documentation and
+    model checks: None means the row is unchanged and a None state means
+    moving in the direction chosen from the task queue.
+    A transition with `hold=True` has no action: while its deadline lies in
+    the future it blocks the rest of the row.
+    """
+
+    event: str
+    guard: Callable[["Elevator"], bool]
+    deadline: Callable[["Elevator", float], Optional[float]]
+    action: Optional[Callable[["Elevator", float], None]] = None
+    target: Optional[Tuple[Optional[ElevatorState], Optional[DoorState]]] = None
+    hold: bool = False
+
+
+def _always(e: "Elevator") -> bool:
+    return True
+
+
+def _floor_changed(e: "Elevator", now: float) -> None:
+    e.floor_changed = False
+    e.arrival_time = now
+    e.floor_arrival_announced = False
+    e.serviced_current_arrival = False  # Reset serviced flag on floor change
+    e.last_state_change = now
+
+
+def _announce_arrival(e: "Elevator", now: float) -> None:
+    e.floor_arrival_announced = True
+    # Check if we've reached a target floor in the task_queue (only when moving)
+    if e.state is not IDLE and e.task_queue and e.current_floor == e.task_queue[0].floor:
+        e._handle_arrival_at_target_floor(now)
+
+
+def _travel(e: "Elevator", now: float) -> None:
+    # Skips floors the building does not have (floor 0 by default)
+    step = 1 if e.state is ElevatorState.MOVING_UP else -1
+    e._set_floor(e.config.next_floor(e.current_floor, step))
+
+
+def _door_opened(e: "Elevator", now: float) -> None:
+    e.door_state = DoorState.OPEN
+    e.last_door_change = now
+    e.api.send_door_opened_message(e.id)
+
+
+def _door_closed(e: "Elevator", now: float) -> None:
+    e.door_state = DoorState.CLOSED
+    e.last_door_change = now
+    e.api.send_door_closed_message(e.id)
+
+
+def _door_timeout(e: "Elevator", now: float) -> None:
+    e.close_door()
+
+
+def _service_arrival(e: "Elevator", now: float) -> None:
+    e._service_current_arrival(now)
+
+
+def _depart(e: "Elevator", now: float) -> None:
+    e.request_movement_if_needed()
+
+
+def _arrival_pending(e: "Elevator") -> bool:
+    return e.floor_arrival_announced and not e.serviced_current_arrival
+
+
+def _at_next_stop(e: "Elevator", now: float) -> Optional[float]:
+    # Only the announced floor being the next stop (or there being none) opens the doors
+    return now if not e.task_queue or e.current_floor == e.task_queue[0].floor else None
+
+
+def _next_floor_due(e: "Elevator", now: float) -> Optional[float]:
+    return e.moving_since + e.floor_travel_time if e.moving_since is not None else None
+
+
+def _departure(e: "Elevator", now: float) -> Optional[float]:
+    # Stops at the car's own floor give no direction to depart in
+    if not e.task_queue.has_stop_away_from(e.current_floor):
+        return None
+    return e.last_state_change + MOVE_START_DELAY
+
+
+FLOOR_CHANGED = Transition(
+    "floor_changed", attrgetter("floor_changed"), lambda e, now: now, _floor_changed
+)
+ARRIVAL_ANNOUNCE = Transition(
+    "arrival_announce",
+    lambda e: not e.floor_arrival_announced and e.arrival_time is not None,
+    lambda e, now: e.arrival_time + ARRIVAL_ANNOUNCE_DELAY,
+    _announce_arrival,
+)
+
+# Fire independently in every state, in this order, before the row
+COMMON_TRANSITIONS: Tuple[Transition, ...] = (FLOOR_CHANGED, ARRIVAL_ANNOUNCE)
+
+# Door handling waits until the arrival delay has passed
+_ARRIVAL_HOLD = Transition(
+    "arrival_hold",
+    lambda e: _arrival_pending(e) and e.arrival_time is not None,
+    lambda e, now: e.arrival_time + e.floor_arrival_delay,
+    hold=True,
+)
+
+_MOVING_ROW: Tuple[Transition, ...] = (
+    Transition("floor_travel", _always, _next_floor_due, _travel),
+)
+
+# Rows are exclusive: the first transition whose guard holds is the active one
+TRANSITION_TABLE: Dict[Tuple[ElevatorState, DoorState], Tuple[Transition, ...]] = {
+    (IDLE, DoorState.OPENING): (
+        _ARRIVAL_HOLD,
+        Transition(
+            "door_opened",
+            _always,
+            lambda e, now: e.last_door_change + e.door_operation_time,
+            _door_opened,
+            (IDLE, DoorState.OPEN),
+        ),
+    ),
+    (IDLE, DoorState.OPEN): (
+        _ARRIVAL_HOLD,
+        Transition(
+            "door_timeout",
+            _always,
+            lambda e, now: e.last_door_change + e.door_timeout,
+            _door_timeout,
+            (IDLE, DoorState.CLOSING),
+        ),
+    ),
+    (IDLE, DoorState.CLOSING): (
+        _ARRIVAL_HOLD,
+        Transition(
+            "door_closed",
+            _always,
+            lambda e, now: e.last_door_change + e.door_operation_time,
+            _door_closed,
+            (IDLE, DoorState.CLOSED),
+        ),
+    ),
+    (IDLE, DoorState.CLOSED): (
+        _ARRIVAL_HOLD,
+        Transition(
+            "service_arrival",
+            _arrival_pending,
+            _at_next_stop,
+            _service_arrival,
+            (IDLE, DoorState.OPENING),
+        ),
+        Transition(
+            "depart",
+            lambda e: bool(e.task_queue),
+            _departure,
+            _depart,
+            (None, DoorState.CLOSED),
+        ),
+    ),
+}
+for _state in (ElevatorState.MOVING_UP, ElevatorState.MOVING_DOWN):
+    for _door in DoorState:
+        TRANSITION_TABLE[(_state, _door)] = _MOVING_ROW
+
+# Location of the Elevator template in test/model/system.xml for each row
+UPPAAL_LOCATIONS: Dict[Tuple[ElevatorState, DoorState], str] = {
+    (IDLE, DoorState.CLOSED): "Idle",
+    (IDLE, DoorState.OPENING): "D_Opening",
+    (IDLE, DoorState.OPEN): "D_Open",
+    (IDLE, DoorState.CLOSING): "D_Closing",
+    **{key: "Moving" for key in TRANSITION_TABLE if key[0] is not IDLE},
+}
+
+
+def _noop(e: "Elevator", now: float) -> None:
+    pass
+
+
+def _compile_row(row: Tuple[Transition, ...]) -> Callable[["Elevator", float], None]:
+    """One callable that steps a car through `row`, with its functions bound ahead of time.
+
+    Each transition becomes a closure over its guard, deadline and action
+    that falls through to the closure of the rest of the row when its guard
+    does not hold (or, for a hold, its deadline has passed).
+    """
+    if not row:
+        return _noop
+    first, rest = row[0], _compile_row(row[1:])
+    guard, deadline, action = first.guard, first.deadline, first.action
+    if first.hold:
+
+        def run(e: "Elevator", now: float) -> None:
+            if guard(e):
+                due = deadline(e, now)
+                if due is not None and now < due:
+                    return
+            rest(e, now)
+
+    elif guard is _always:
+
+        def run(e: "Elevator", now: float) -> None:
+            due = deadline(e, now)
+            if due is not None and now >= due:
+                action(e, now)
+
+    elif rest is _noop:
+
+        def run(e: "Elevator", now: float) -> None:
+            if guard(e):
+                due = deadline(e, now)
+                if due is not None and now >= due:
+                    action(e, now)
+
+    else:
+
+        def run(e: "Elevator", now: float) -> None:
+            if not guard(e):
+                rest(e, now)
+                return
+            due = deadline(e, now)
+            if due is not None and now >= due:
+                action(e, now)
+
+    return run
+
+
+def _value_table(compile_row: Callable[[Tuple[Transition, ...]], Any], default: Any) -> List[List[Any]]:
+    """compile_row() of every row in nested lists indexed by enum values.
+
+    Indexing by value is cheaper than hashing enum members.
+    """
+    table = [[default] * (len(DoorState) + 1) for _ in range(len(ElevatorState) + 1)]
+    for (state, door), row in TRANSITION_TABLE.items():
+        table[state._value_][door._value_] = compile_row(row)
+    return table
+
+
+_ROW_STEPS = _value_table(_compile_row, _noop)
+# For next_deadline(): plain tuples unpack faster than Transition attributes are read
+_ROW_DEADLINES = _value_table(lambda row: tuple((t.guard, t.deadline, t.hold) for t in row), ())
+
+# Bound to names once, so step() fires the common transitions without a loop
+(
+    (_FIRST_GUARD, _FIRST_DEADLINE, _FIRST_ACTION),
+    (_SECOND_GUARD, _SECOND_DEADLINE, _SECOND_ACTION),
+) = ((t.guard, t.deadline, t.action) for t in COMMON_TRANSITIONS)
+
+
+def step(e: "Elevator", now: float) -> None:
+    """Fire every transition of elevator `e` whose deadline has passed (one update)."""
+    if _FIRST_GUARD(e) and now >= _FIRST_DEADLINE(e, now):
+        _FIRST_ACTION(e, now)
+    if _SECOND_GUARD(e) and now >= _SECOND_DEADLINE(e, now):
+        _SECOND_ACTION(e, now)
+    # Looked up after the common transitions: an arrival can stop the car
+    _ROW_STEPS[e.state._value_][e.door_state._value_](e, now)
+
+
+def next_deadline(e: "Elevator", now: float) -> Optional[float]:
+    """Earliest clock time at which step() has work to do, or None."""
+    if FLOOR_CHANGED.guard(e):
+        return now  # Floor change is processed on the next update
+    deadline = None
+    for guard, row_deadline, hold in _ROW_DEADLINES[e.state._value_][e.door_state._value_]:
+        if not guard(e):
+            continue
+        deadline = row_deadline(e, now)
+        if hold:
+            if deadline is not None and now < deadline:
+                break
+            deadline = None
+            continue
+        break
+    if ARRIVAL_ANNOUNCE.guard(e):
+        announce = ARRIVAL_ANNOUNCE.deadline(e, now)
+        if deadline is None or announce < deadline:
+            return announce
+    return deadline
@@ -1,6 +1,9 @@
+import multiprocessing
+import signal
 import socket
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor, wait
 
 # For Windows console allocation
 if os.name == "nt":
@@ -57,3 +60,26 @@ def find_available_port(
             # Only suppress bind errors (port in use)
             continue
     return None
+
+
+def _init_worker() -> None:
+    """Leave Ctrl-C to the simulator process, which stops the workers."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _ready() -> None:
+    """No-op job that makes a worker process start up."""
+
+
+def start_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool for simulator work (rollouts, zone passes), started and ready.
+
+    Workers are spawned, not forked: the live simulator runs alongside ZMQ and
+    WebSocket threads. Starting them takes far longer than one dispatch
+    decision may, so this waits until every worker has come up.
+    """
+    pool = ProcessPoolExecutor(
+        workers, multiprocessing.get_context("spawn"), initializer=_init_worker
+    )
+    wait([pool.submit(_ready) for _ in range(workers)])
+    return pool
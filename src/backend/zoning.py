@@ -0,0 +1,327 @@
+"""Zoned dispatch for tall buildings: floor bands served by their own cars.
+
+A building whose BuildingConfig has `zones` is dispatched by a
+ZonedDispatcher. Every zone, a band of floors and the cars serving it, gets
+its own Dispatcher restricted to those cars, so a hall call is weighed
+against the cars of its zone only instead of every car in the building.
+The ZonedDispatcher coordinates them: it hands each new hall call to the
+zone owning its floor, and assigns cross-zone calls, at floors where bands
+overlap, to the best suitable car of any zone owning the floor.
+
+Zones can run their dispatch passes in worker processes. When more than one
+zone has calls to assign and there are enough of them, each worker assigns
+one zone's calls on a copy of the building (Simulator.clone) and the choices
+are applied here. Zones have disjoint cars, so the outcome is the same as
+running the passes in turn. Zones whose worker pass fails or does not
+finish within WORKER_BUDGET run their pass here instead.
+"""
+
+import copy
+import pickle
+import time
+from concurrent.futures import Executor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, FrozenSet, List, Optional, Tuple, TYPE_CHECKING
+
+from .clock import Clock
+from .dispatcher import Dispatcher
+from .models import BuildingConfig, CallId, CallIdAllocator, MoveDirection, Zone
+from .strategies import DispatchStrategy
+from .utility import start_process_pool
+
+if TYPE_CHECKING:
+    from .api.core import ElevatorAPI
+    from .elevator import Elevator
+    from .rollout import RolloutPlanner
+    from .simulator import Simulator
+
+
+def split_zones(config: BuildingConfig, count: int) -> List[Zone]:
+    """Divide the building into `count` stacked zones of about equal height.
+
+    Adjacent bands share their boundary floor, where passengers change
+    zones, and each zone gets a block of consecutive elevator ids.
+    """
+    floors = config.floors
+    elevator_ids = config.elevator_ids
+    if not 1 <= count <= min(len(elevator_ids), len(floors) - 1):
+        raise ValueError(
+            f"Cannot split {len(floors)} floors and {len(elevator_ids)} elevators into {count} zones"
+        )
+    bounds = [index * (len(floors) - 1) // count for index in range(count + 1)]
+    cars = [index * len(elevator_ids) // count for index in range(count + 1)]
+    return [
+        Zone(
+            floors[bounds[index]],
+            floors[bounds[index + 1]],
+            tuple(elevator_ids[cars[index]:cars[index + 1]]),
+        )
+        for index in range(count)
+    ]
+
+
+def _zone_pass(state: bytes, zone_index: int) -> List[Tuple[CallId, int]]:
+    """One zone's dispatch pass on a pickled building copy, in a worker process.
+
+    Returns the (call id, elevator index) assignments in the order they were made.
+    """
+    simulator = pickle.loads(state)
+    return simulator.dispatcher.zones[zone_index]._process_pending_calls()
+
+
+def _zone_option(name: str) -> property:
+    """Dispatcher option that, set on the coordinator, is also set on every zone."""
+    attribute = "_" + name
+
+    def fget(self: "ZonedDispatcher"):
+        return getattr(self, attribute)
+
+    def fset(self: "ZonedDispatcher", value) -> None:
+        setattr(self, attribute, value)
+        for zone in self.zones:
+            setattr(zone, name, value)
+
+    return property(fget, fset)
+
+
+class ZonedDispatcher(Dispatcher):
+    """Coordinator of the zone dispatchers of a zoned building.
+
+    Stands in for the Dispatcher towards the simulator, elevators and API.
+    The zone dispatchers share its call bookkeeping (open calls, call log,
+    call index and lit hall buttons) and call ids; each zone keeps its own
+    waiting calls, and `waiting` here holds the cross-zone ones. Options set
+    here (strategy, batch assignment, en-route pickup, rollouts) also apply
+    to every zone. With `workers` > 0, call start() to launch the worker
+    processes for zone passes and close() to stop them.
+    """
+
+    # Fewest waiting calls worth sending to the workers; copying and pickling
+    # the building costs more than a smaller pass
+    MIN_WORKER_CALLS = 32
+    # Wall seconds a tick waits for the workers before running the unfinished
+    # zone passes in this process
+    WORKER_BUDGET = 0.05
+
+    strategy = _zone_option("strategy")
+    batch_assignment = _zone_option("batch_assignment")
+    en_route_pickup = _zone_option("en_route_pickup")
+    rollout = _zone_option("rollout")
+
+    def __init__(
+        self,
+        world: "Simulator",
+        api: "ElevatorAPI",
+        clock: Optional[Clock] = None,
+        config: Optional[BuildingConfig] = None,
+        call_ids: Optional[CallIdAllocator] = None,
+        batch_assignment: bool = False,
+        strategy: Optional[DispatchStrategy] = None,
+        en_route_pickup: Optional[bool] = None,
+        rollout: Optional["RolloutPlanner"] = None,
+        workers: int = 0,
+    ) -> None:
+        # Filled below; exists before Dispatcher.__init__ sets the zone options
+        self.zones: List[Dispatcher] = []
+        super().__init__(
+            world, api, clock, config, call_ids,
+            batch_assignment, strategy, en_route_pickup, rollout,
+        )
+        if self.config.zones is None:
+            raise ValueError("Zoned dispatch needs a building configuration with zones")
+        if workers < 0:
+            raise ValueError("Number of zone workers must not be negative")
+        self.workers: int = workers
+        self._pool: Optional[Executor] = None
+        for zone in self.config.zones:
+            dispatcher = Dispatcher(
+                world, api, self.clock, self.config, self.call_ids,
+                self.batch_assignment, self.strategy, self.en_route_pickup, self.rollout,
+                [elevator_id - 1 for elevator_id in zone.elevator_ids],
+            )
+            dispatcher.pending_calls = self.pending_calls
+            dispatcher.all_calls_log = self.all_calls_log
+            dispatcher.call_index = self.call_index
+            dispatcher.hall_calls = self.hall_calls
+            self.zones.append(dispatcher)
+        # The zone dispatcher of each floor in one band; floors in several bands
+        # (cross-zone) map to the indices of the cars of all their zones instead
+        self._floor_zone: Dict[int, Dispatcher] = {}
+        self._shared_floor_cars: Dict[int, FrozenSet[int]] = {}
+        for floor in self.config.floors:
+            owners = [
+                dispatcher
+                for zone, dispatcher in zip(self.config.zones, self.zones)
+                if zone.covers(floor)
+            ]
+            if len(owners) == 1:
+                self._floor_zone[floor] = owners[0]
+            else:
+                self._shared_floor_cars[floor] = frozenset(
+                    index for dispatcher in owners for index in dispatcher.elevator_indices
+                )
+
+    def start(self) -> None:
+        """Start the worker processes for zone passes (no-op for workers=0)."""
+        if self.workers and self._pool is None:
+            self._pool = start_process_pool(self.workers)
+
+    def close(self) -> None:
+        """Stop the worker processes; zone passes run in this process again."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def add_outside_call(self, floor: int, direction: Optional[MoveDirection]) -> CallId:
+        """Add an outside call and queue it in the zone owning its floor (here if cross-zone)."""
+        call_id = super().add_outside_call(floor, direction)
+        zone = self._floor_zone.get(floor)
+        if zone is not None:
+            zone.waiting[call_id] = self.waiting.pop(call_id)
+        return call_id
+
+    def assign_call(self, call_id: CallId, elevator_idx: int) -> bool:
+        """Give a waiting call, wherever it waits, to an elevator (see Dispatcher.assign_call)."""
+        call = self.pending_calls.get(call_id)
+        if call is None:
+            return False
+        zone = self._floor_zone.get(call.floor)
+        if zone is None:
+            return super().assign_call(call_id, elevator_idx)
+        return zone.assign_call(call_id, elevator_idx)
+
+    def complete_call(self, call_id: CallId) -> Optional[MoveDirection]:
+        call = self.pending_calls.get(call_id)
+        if call is not None:
+            zone = self._floor_zone.get(call.floor)
+            if zone is not None:
+                zone.waiting.pop(call_id, None)
+        return super().complete_call(call_id)
+
+    def _process_pending_calls(self) -> List[Tuple[CallId, int]]:
+        """Assign the waiting cross-zone calls, then let the zones assign theirs."""
+        with self._dispatch_pass():
+            return super()._process_pending_calls() + self._dispatch_zones()
+
+    def update(self) -> bool:
+        """Assign waiting calls, cross-zone and in every zone, that a car has become able to take.
+
+        Returns True if any call was assigned.
+        """
+        waiting = self.waiting_count()
+        with self._dispatch_pass():
+            if self._has_work():
+                super()._process_pending_calls()
+            self._dispatch_zones()
+        return self.waiting_count() < waiting
+
+    def waiting_count(self) -> int:
+        """Number of calls waiting for a car, in all zones and across zones."""
+        return len(self.waiting) + sum(len(zone.waiting) for zone in self.zones)
+
+    def _dispatch_zones(self) -> List[Tuple[CallId, int]]:
+        """Run the dispatch pass of every zone with calls one of its cars may take now.
+
+        Passes with rollouts stay in this process (rollouts have their own pool).
+        Returns the assignments of all zones.
+        """
+        ready = [zone for zone in self.zones if zone._has_work()]
+        if (
+            self._pool is not None
+            and len(ready) > 1
+            and self.rollout is None
+            and sum(len(zone.waiting) for zone in ready) >= self.MIN_WORKER_CALLS
+        ):
+            return self._dispatch_in_workers(ready)
+        assigned: List[Tuple[CallId, int]] = []
+        for zone in ready:
+            assigned += zone._process_pending_calls()
+        return assigned
+
+    def _dispatch_in_workers(self, ready: List[Dispatcher]) -> List[Tuple[CallId, int]]:
+        deadline = time.perf_counter() + self.WORKER_BUDGET
+        state = pickle.dumps(self.world.clone(), pickle.HIGHEST_PROTOCOL)  # One copy for all jobs
+        try:
+            jobs = [self._pool.submit(_zone_pass, state, self.zones.index(zone)) for zone in ready]
+        except BrokenProcessPool:
+            self._drop_broken_pool()
+            jobs = []
+        done, pending = wait(jobs, max(0.0, deadline - time.perf_counter()))
+        for job in pending:
+            job.cancel()  # Passes already running finish in the background and are ignored
+        assigned: List[Tuple[CallId, int]] = []
+        for index, zone in enumerate(ready):
+            result = None
+            if index < len(jobs) and jobs[index] in done:
+                try:
+                    result = jobs[index].result()
+                except BrokenProcessPool:
+                    self._drop_broken_pool()
+                except Exception as e:
+                    print(f"ZonedDispatcher: Worker pass of zone {self.zones.index(zone) + 1} failed: {e}")
+            if result is None:
+                assigned += zone._process_pending_calls()  # Unfinished or failed: run it here
+            else:
+                assigned += self._apply_zone_pass(zone, result)
+        return assigned
+
+    def _apply_zone_pass(
+        self, zone: Dispatcher, result: List[Tuple[CallId, int]]
+    ) -> List[Tuple[CallId, int]]:
+        """Make the assignments of a worker pass that still hold; returns those made.
+
+        The pass ran on a copy taken before the workers started, and calls can
+        be assigned or completed here meanwhile (API thread). Assignments of
+        calls no longer waiting, or to cars that can no longer take them, are
+        dropped and the zone's pass is run again here for what still waits.
+        """
+        assigned: List[Tuple[CallId, int]] = []
+        stale = False
+        elevators = self.world.elevators
+        for call_id, elevator_idx in result:
+            call = zone.waiting.get(call_id)
+            if (
+                call is None
+                or not call.is_pending()
+                or call.is_assigned()
+                or not zone._can_elevator_serve_call(elevators[elevator_idx], call.floor, call.direction)
+            ):
+                stale = True
+                continue
+            zone.assign_call(call_id, elevator_idx)
+            assigned.append((call_id, elevator_idx))
+        if stale:
+            assigned += zone._process_pending_calls()
+        return assigned
+
+    def _drop_broken_pool(self) -> None:
+        if self._pool is not None:
+            print("ZonedDispatcher: Worker pool broke; running zone passes in process")
+        self.close()
+
+    def _can_elevator_serve_call(
+        self, elevator: "Elevator", floor: int, direction: Optional[MoveDirection]
+    ) -> bool:
+        """As Dispatcher, for cross-zone calls: only the cars of the zones owning the floor."""
+        cars = self._shared_floor_cars.get(floor)
+        if cars is not None and elevator.id - 1 not in cars:
+            return False
+        return super()._can_elevator_serve_call(elevator, floor, direction)
+
+    def clone(self, world: "Simulator", api: "ElevatorAPI", clock: Clock) -> "ZonedDispatcher":
+        """Copy of the call bookkeeping of all zones for a cloned building (see Dispatcher.clone)."""
+        twin = ZonedDispatcher(
+            world, api, clock, self.config, copy.copy(self.call_ids),
+            self.batch_assignment, self.strategy, self.en_route_pickup,
+        )
+        calls = self._copy_calls(twin)
+        for zone, twin_zone in zip(self.zones, twin.zones):
+            twin_zone.waiting.update(
+                (call_id, calls[call_id]) for call_id in zone.waiting if call_id in calls
+            )
+        return twin
+
+    def reset(self) -> None:
+        for zone in self.zones:
+            zone.waiting.clear()
+        super().reset()
@@ -70,6 +70,7 @@ class WebSocketBridge:
                 "ui_open_door": ["elevatorId"],
                 "ui_close_door": ["elevatorId"],
                 "fetch_states": [],  # Added for functions that take no params from the frontend
+                "fetch_eta_table": [],
             }
 
             if func_name not in func_param_map:
@@ -89,6 +90,9 @@ class WebSocketBridge:
                 not arg_names
             ):  # For functions like fetch_states that expect no arguments from client
                 json_response_from_api = func()
+                if not isinstance(json_response_from_api, str):
+                    # Fetch functions return plain data rather than JSON strings
+                    json_response_from_api = json.dumps(json_response_from_api)
             else:
                 # For UI functions that expect a 'params' dictionary
                 # Validate that all expected parameter keys are present in the 'params' dict
@@ -113,7 +117,7 @@ class WebSocketBridge:
                     response_dict = json.loads(json_response_from_api)
                     response_dict["requestId"] = request_id
                     return json.dumps(response_dict)
-                except json.JSONDecodeError:
+                except (json.JSONDecodeError, TypeError):  # Not a JSON object
                     return json_response_from_api
             else:
                 return json_response_from_api
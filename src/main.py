@@ -1,9 +1,13 @@
-import time
 import signal
 import argparse
 import threading
 
+from backend.clock import Clock, MonotonicClock, ScaledClock, SteppableClock, VirtualClock
+from backend.models import BuildingConfig
 from backend.simulator import Simulator
+from backend.rollout import ROLLOUT_BUDGET, RolloutPlanner
+from backend.strategies import DISPATCH_STRATEGIES, create_strategy
+from backend.zoning import split_zones
 from backend.api.core import ElevatorAPI
 from frontend.webview import ElevatorWebview
 from frontend.bridge import WebSocketBridge
@@ -11,6 +15,10 @@ from backend.api.server import ElevatorHTTPServer
 
 
 class ElevatorApp:
+    # Longest the event loop sleeps without an elevator event or command. Each
+    # idle wake-up re-syncs the frontend so newly connected clients get state.
+    IDLE_SYNC_INTERVAL = 1.0
+
     def __init__(
         self,
         show_debug=False,
@@ -18,8 +26,27 @@ class ElevatorApp:
         http_port: int | None = None,
         zmq_port: str = "19982",
         headless=False,
+        clock: Clock | None = None,
+        fast_forward=False,
+        lockstep=False,
+        vectorized=False,
+        config: BuildingConfig | None = None,
+        rollout: RolloutPlanner | None = None,
+        zone_workers: int = 0,
     ):
         self.headless = headless
+        self.fast_forward = fast_forward
+        # In lockstep mode simulated time only moves on step@<ms> commands from ZMQ
+        self.lockstep = lockstep
+        if clock is None and lockstep:
+            clock = VirtualClock()
+        elif clock is None:
+            # Monotonic by default so wall-clock adjustments (NTP) cannot break door timers.
+            # Fast-forward needs a clock that can skip idle time.
+            clock = ScaledClock() if fast_forward else MonotonicClock()
+        if (fast_forward or lockstep) and not isinstance(clock, SteppableClock):
+            raise ValueError("Fast-forward and lockstep need a clock that can skip time")
+        self.clock: Clock = clock
         self.running = True
         self._cleanup_done = False
         self.frontend = None
@@ -35,9 +62,21 @@ class ElevatorApp:
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
 
-        self.backend = Simulator()
+        self.backend = Simulator(
+            clock=self.clock, lockstep=lockstep, vectorized=vectorized, config=config
+        )
         self.elevator_api = ElevatorAPI(self.backend, zmq_port=zmq_port)
         self.backend.set_api_and_initialize_components(self.elevator_api)
+        # Lookahead rollouts run in worker processes started before the simulation
+        self.rollout = rollout
+        if rollout is not None:
+            rollout.start()
+            self.backend.dispatcher.rollout = rollout
+        # Zone dispatch passes run in worker processes when asked (zoned buildings only)
+        self.zone_workers = zone_workers
+        if zone_workers:
+            self.backend.dispatcher.workers = zone_workers
+            self.backend.dispatcher.start()
         self.bridge = WebSocketBridge(
             backend_api=self.elevator_api,
             port=self.ws_port,
@@ -72,7 +111,7 @@ class ElevatorApp:
                 show_debug=show_debug,
             )
 
-        self.last_update_time = time.time()
+        self.last_update_time = self.clock.now()
 
     def _signal_handler(self, signum, frame):
         """Handle system signals for graceful shutdown"""
@@ -80,6 +119,7 @@ class ElevatorApp:
             return
         print(f"\nReceived signal {signum}. Initiating shutdown...")
         self.running = False  # Signal all loops to stop
+        self.backend.notify()  # Wake the event loop so it sees the flag
 
         if not self.headless and hasattr(self, "frontend") and self.frontend:
             print("Attempting to stop webview from signal handler...")
@@ -125,6 +165,22 @@ class ElevatorApp:
         except Exception as e:
             print(f"Error stopping backend simulator: {e}")
 
+        # Stop the rollout worker processes
+        try:
+            if self.rollout is not None:
+                self.rollout.close()
+                print("Rollout workers stopped.")
+        except Exception as e:
+            print(f"Error stopping rollout workers: {e}")
+
+        # Stop the zone dispatch worker processes
+        try:
+            if self.zone_workers:
+                self.backend.dispatcher.close()
+                print("Zone workers stopped.")
+        except Exception as e:
+            print(f"Error stopping zone workers: {e}")
+
         # Join the backend thread if it's running
         if self.backend_thread and self.backend_thread.is_alive():
             print("Waiting for backend thread to finish...")
@@ -135,21 +191,33 @@ class ElevatorApp:
         print("Application cleanup completed.")
 
     def update(self):
-        """Update the backend state and process messages"""
-        current_time = time.time()
-        if current_time - self.last_update_time >= 0.1:  # Update 10 times per second
-
-            self.backend.update()
+        """Process due elevator events and push state to the frontend"""
+        current_time = self.clock.now()
+        if (
+            self.backend.process_due_events()
+            or current_time - self.last_update_time >= self.IDLE_SYNC_INTERVAL
+        ):
             self.bridge.sync_backend()
             self.last_update_time = current_time
 
+    def _run_event_loop(self):
+        """Sleep until the next elevator deadline or incoming command, then process it."""
+        while self.running:
+            if self.lockstep:
+                # Commands and steps run on the ZMQ thread; only mirror state to the frontend
+                self.bridge.sync_backend()
+                self.backend.wait_for_notify(self.IDLE_SYNC_INTERVAL)
+                continue
+            self.update()
+            if self.fast_forward and self.backend.fast_forward():
+                continue  # Skipped idle time; the next event is now due
+            self.backend.wait_for_next_event(max_wait=self.IDLE_SYNC_INTERVAL)
+
     def _background_tasks_loop(self):
         """Runs backend updates in a loop for non-headless mode."""
         print("Backend update loop started.")
         try:
-            while self.running:
-                self.update()
-                time.sleep(0.01)
+            self._run_event_loop()
         except Exception as e:
             print(f"Exception in background task loop: {e}")
         finally:
@@ -177,12 +245,11 @@ class ElevatorApp:
                 # This point is reached when the webview window is closed by the user
                 print("pywebview frontend closed.")
                 self.running = False  # Signal background thread to stop
+                self.backend.notify()
 
             else:  # Headless mode
                 print("Running in headless mode. Backend tasks on main thread.")
-                while self.running:
-                    self.update()
-                    time.sleep(0.01)
+                self._run_event_loop()
         except KeyboardInterrupt:
             print("\nKeyboard interrupt received by main thread.")
             self.running = False  # Signal all loops to stop
@@ -299,8 +366,163 @@ if __name__ == "__main__":
     parser.add_argument(
         "--console", action="store_true", help="Force output to console"
     )
+    parser.add_argument(
+        "--virtual-clock",
+        action="store_true",
+        help="Drive the simulation from a virtual clock that runs as fast as possible (headless only)",
+    )
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=1.0,
+        help="Run simulated time N times faster than real time (headless only, default: 1.0)",
+    )
+    parser.add_argument(
+        "--fast-forward",
+        action="store_true",
+        help="Skip idle time: jump to the next pending event when no elevator is moving and no command is queued (headless only)",
+    )
+    parser.add_argument(
+        "--lockstep",
+        action="store_true",
+        help="Only advance simulated time on step@<ms> commands from the ZMQ test server (headless only)",
+    )
+    parser.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="Advance all elevators with the NumPy-backed fleet engine (requires numpy)",
+    )
+    parser.add_argument(
+        "--building",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="JSON file describing floors, skipped floors, car count and timing",
+    )
+    parser.add_argument(
+        "--floors",
+        type=int,
+        nargs=2,
+        default=None,
+        metavar=("MIN", "MAX"),
+        help="Lowest and highest floor (overrides --building, default: -1 3)",
+    )
+    parser.add_argument(
+        "--skip-floors",
+        type=int,
+        nargs="*",
+        default=None,
+        metavar="FLOOR",
+        help="Floors the building does not have (overrides --building, default: 0)",
+    )
+    parser.add_argument(
+        "--elevators",
+        type=int,
+        default=None,
+        help="Number of elevator cars (overrides --building, default: 2)",
+    )
+    parser.add_argument(
+        "--dispatch-strategy",
+        choices=sorted(DISPATCH_STRATEGIES),
+        default=None,
+        help="Policy that picks a car for each hall call (overrides --building, default: idle-eta)",
+    )
+    parser.add_argument(
+        "--rollout",
+        action="store_true",
+        help="Choose between suitable cars by simulating each choice ahead in worker processes",
+    )
+    parser.add_argument(
+        "--rollout-budget",
+        type=float,
+        default=ROLLOUT_BUDGET,
+        metavar="SECONDS",
+        help=f"Wall time one dispatch pass may spend on rollouts (default: {ROLLOUT_BUDGET})",
+    )
+    parser.add_argument(
+        "--en-route-pickup",
+        action="store_true",
+        help="Let moving cars take hall calls ahead of them in their direction",
+    )
+    parser.add_argument(
+        "--zones",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Split the floors into N stacked zones, each with its own cars and dispatcher (overrides --building)",
+    )
+    parser.add_argument(
+        "--zone-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Run the dispatch passes of the zones in N worker processes (default: 0, in process)",
+    )
     args = parser.parse_args()
 
+    if args.lockstep and not args.headless:
+        parser.error("--lockstep requires --headless")
+    if args.lockstep and (
+        args.virtual_clock or args.fast_forward or args.time_scale != 1.0
+    ):
+        parser.error(
+            "--lockstep cannot be combined with --virtual-clock, --time-scale or --fast-forward"
+        )
+    if args.virtual_clock and not args.headless:
+        parser.error("--virtual-clock requires --headless")
+    if args.time_scale <= 0:
+        parser.error("--time-scale must be positive")
+    if args.rollout_budget < 0:
+        parser.error("--rollout-budget must not be negative")
+    if args.zone_workers < 0:
+        parser.error("--zone-workers must not be negative")
+    if (args.time_scale != 1.0 or args.fast_forward) and not args.headless:
+        parser.error("--time-scale and --fast-forward require --headless")
+    if args.virtual_clock and args.time_scale != 1.0:
+        parser.error("--virtual-clock cannot be combined with --time-scale")
+    if args.vectorized:
+        from backend.fleet import numpy_available
+
+        if not numpy_available():
+            parser.error("--vectorized requires numpy (pip install .[fast])")
+
+    try:
+        building = (
+            BuildingConfig.from_file(args.building).to_dict() if args.building else {}
+        )
+        if args.floors is not None:
+            building["min_floor"], building["max_floor"] = args.floors
+        if args.skip_floors is not None:
+            building["skipped_floors"] = args.skip_floors
+        if args.elevators is not None:
+            building["num_elevators"] = args.elevators
+        if args.dispatch_strategy is not None:
+            building["dispatch_strategy"] = args.dispatch_strategy
+        if args.en_route_pickup:
+            building["en_route_pickup"] = True
+        if args.zones is not None:
+            building["zones"] = None  # Zones from --building may not fit the overridden size
+            building["zones"] = split_zones(BuildingConfig.from_dict(building), args.zones)
+        config = BuildingConfig.from_dict(building)
+        create_strategy(config.dispatch_strategy)  # Reject unknown names from --building
+    except (OSError, ValueError, TypeError) as e:
+        parser.error(f"Invalid building configuration: {e}")
+    if args.zone_workers and config.zones is None:
+        parser.error("--zone-workers requires a zoned building (--zones or zones in --building)")
+    default_building = BuildingConfig()
+    if not args.headless and (
+        config.floors != default_building.floors
+        or config.num_elevators != default_building.num_elevators
+    ):
+        # The GUI layout is drawn for floors -1..3 and two cars
+        parser.error("A custom floor range or elevator count requires --headless")
+
+    clock = None
+    if args.virtual_clock:
+        clock = VirtualClock()
+    elif args.time_scale != 1.0 or args.fast_forward:
+        clock = ScaledClock(args.time_scale)
+
     # Conditionally allocate console for headless/debug mode if packaged as windowed app
     if args.headless or args.debug or args.console:
         from backend.utility import allocate_console_if_needed
@@ -313,6 +535,13 @@ if __name__ == "__main__":
         http_port=args.http_port,
         zmq_port=args.zmq_port,
         headless=args.headless,
+        clock=clock,
+        fast_forward=args.fast_forward,
+        lockstep=args.lockstep,
+        vectorized=args.vectorized,
+        config=config,
+        rollout=RolloutPlanner(budget=args.rollout_budget) if args.rollout else None,
+        zone_workers=args.zone_workers,
     )
 
     app.run()
@@ -0,0 +1,110 @@
+"""
+Batch assignment benchmark: minimum-cost matching of waiting hall calls
+versus the greedy loop that gives each call in turn its best elevator.
+
+Hall calls arrive at random floors at a fixed mean rate while the simulator
+runs on a virtual clock, so calls pile up whenever every car is busy.
+Reports the mean wall time of a dispatch pass over two or more waiting calls,
+the mean, p95 and maximum wait from a call to the arrival of its car, the
+calls served and the calls still open at the end.
+
+Usage (from src/):
+    python -m test.benchmarks.bench_batch_assignment [--rate R] [--seconds N]
+"""
+
+import argparse
+import math
+import random
+import statistics
+import time
+
+from backend.models import BuildingConfig
+from .common import build_simulator, print_table
+
+TICK = 0.1  # Simulated seconds per tick
+
+
+def run(config: BuildingConfig, rate: float, seconds: float, seed: int, batch: bool, rollout=None):
+    simulator = build_simulator(config)
+    dispatcher = simulator.dispatcher
+    dispatcher.batch_assignment = batch
+    dispatcher.rollout = rollout
+    clock = simulator.clock
+
+    waits = []
+    complete_call = dispatcher.complete_call
+
+    def timed_complete(call_id):
+        call = dispatcher.pending_calls.get(call_id)
+        if call is not None:
+            waits.append(clock.now() - call.created_at)
+        return complete_call(call_id)
+
+    dispatcher.complete_call = timed_complete
+
+    passes = []
+    process = dispatcher._process_pending_calls
+
+    def timed_process():
+        waiting = len(dispatcher.waiting)
+        start = time.perf_counter()
+        process()
+        if waiting > 1:  # Passes with a choice to make
+            passes.append(time.perf_counter() - start)
+
+    dispatcher._process_pending_calls = timed_process
+
+    rng = random.Random(seed)
+    floors = config.floors
+    buttons = [(f, "up") for f in floors[:-1]] + [(f, "down") for f in floors[1:]]
+    for _ in range(int(seconds / TICK)):
+        for _ in range(_poisson(rng, rate * TICK)):
+            dispatcher.add_call(*rng.choice(buttons))
+        clock.advance(TICK)
+        simulator.update()
+    waits.sort()
+    return (
+        statistics.fmean(passes) if passes else 0.0,
+        statistics.fmean(waits),
+        waits[int(len(waits) * 0.95)],
+        waits[-1],
+        len(waits),
+        len(dispatcher.pending_calls),
+    )
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    """Number of arrivals in one tick (Knuth's method; the means here are small)."""
+    limit, count, product = math.exp(-mean), 0, rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=float, nargs="+", default=[0.2, 0.5, 1.0], help="Hall calls per simulated second")
+    parser.add_argument("--seconds", type=float, default=1800.0, help="Simulated seconds")
+    parser.add_argument("--floors", type=int, default=30)
+    parser.add_argument("--cars", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    config = BuildingConfig(min_floor=1, max_floor=args.floors, num_elevators=args.cars)
+    rows = []
+    for rate in args.rate:
+        for label, batch in (("greedy (baseline)", False), ("batch matching", True)):
+            pass_time, mean, p95, worst, served, open_calls = run(
+                config, rate, args.seconds, args.seed, batch
+            )
+            rows.append([rate, label, pass_time * 1e6, mean, p95, worst, served, open_calls])
+    print(f"{args.floors} floors, {args.cars} cars, {args.seconds:g} simulated seconds")
+    print_table(
+        ["calls/s", "assignment", "us/pass", "mean wait s", "p95 wait s", "max wait s", "served", "open"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
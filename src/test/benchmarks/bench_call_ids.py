@@ -0,0 +1,69 @@
+"""
+Call id benchmark: integer ids from CallIdAllocator versus uuid4 strings.
+
+Logs N outside calls through Dispatcher.add_outside_call() and completes
+them, as every hall call does, and reports the calls per second and the
+traced bytes per logged call for each id scheme. The uuid4 allocator the
+dispatcher used before is kept here as the baseline.
+
+Usage (from src/):
+    python -m test.benchmarks.bench_call_ids [--calls N]
+"""
+
+import argparse
+import time
+from typing import Callable
+from unittest.mock import Mock
+from uuid import uuid4
+
+from backend.clock import VirtualClock
+from backend.dispatcher import Dispatcher
+from backend.models import CallIdAllocator, MoveDirection
+from .common import print_table, traced_bytes
+
+
+class UuidAllocator:
+    """str(uuid4()) per call, as in Dispatcher.add_outside_call() before (baseline)."""
+
+    def next_id(self) -> str:
+        return str(uuid4())
+
+
+def log_calls(count: int, call_ids) -> Callable[[], Dispatcher]:
+    def build() -> Dispatcher:
+        world = Mock()
+        world.elevators = []
+        dispatcher = Dispatcher(world, Mock(), VirtualClock(), call_ids=call_ids)
+        for i in range(count):
+            call_id = dispatcher.add_outside_call(i % 5 - 1, MoveDirection.UP)
+            dispatcher.complete_call(call_id)  # Only the log keeps the call
+        return dispatcher
+
+    return build
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1_000_000, help="calls to log")
+    args = parser.parse_args()
+
+    n = args.calls
+    rows = []
+    for label, make_ids in (
+        ("uuid4 str (baseline)", UuidAllocator),
+        ("int", CallIdAllocator),
+        ("int, process+shard prefix", lambda: CallIdAllocator(process=4242, shard=7)),
+    ):
+        build = log_calls(n, make_ids())
+        start = time.perf_counter()
+        build()
+        rate = n / (time.perf_counter() - start)
+        call_bytes = traced_bytes(log_calls(n, make_ids())) / n
+        rows.append([label, rate / 1e3, call_bytes])
+
+    print(f"{n} logged calls")
+    print_table(["call ids", "k calls/s", "B/logged call"], rows)
+
+
+if __name__ == "__main__":
+    main()
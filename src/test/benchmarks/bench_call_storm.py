@@ -0,0 +1,91 @@
+"""
+Hall-call storm benchmark: dispatch cost while passengers mash the hall
+buttons, with presses of a lit button folded into the active call versus
+one new call per press.
+
+Presses arrive at a fixed rate on random hall buttons while the simulator
+runs on a virtual clock. Reports the wall time spent in Dispatcher.add_call()
+and Simulator.update() per simulated second, the peak number of pending
+calls, the number of logged calls and the ETA estimates computed. The
+per-press Dispatcher.add_call() is kept here verbatim as the baseline.
+
+Usage (from src/):
+    python -m test.benchmarks.bench_call_storm [--rate N] [--seconds N]
+"""
+
+import argparse
+import random
+import time
+import types
+
+from backend.models import BuildingConfig, MoveDirection
+from .common import build_simulator, print_table
+
+TICK = 0.1  # Simulated seconds per tick
+
+
+def uncoalesced_add_call(self, floor: int, direction: str) -> str:
+    """Dispatcher.add_call before the hall-call registry (baseline)."""
+    try:
+        move_direction = MoveDirection[direction.upper()]
+    except AttributeError:
+        raise ValueError("Direction must be a string.")
+    except KeyError:
+        raise ValueError(f"Invalid direction value: '{direction}'. Must be 'UP' or 'DOWN'.")
+    if not self.config.is_valid_floor(floor):
+        raise ValueError(f"Invalid floor: {floor}. Not served by this building.")
+
+    call_id = self.add_outside_call(floor, move_direction)
+    self._process_pending_calls()
+    return call_id
+
+
+def run(config: BuildingConfig, rate: int, seconds: float, seed: int, coalesce: bool):
+    simulator = build_simulator(config)
+    dispatcher = simulator.dispatcher
+    if not coalesce:
+        dispatcher.add_call = types.MethodType(uncoalesced_add_call, dispatcher)
+    rng = random.Random(seed)
+    floors = config.floors
+    buttons = [(f, "up") for f in floors[:-1]] + [(f, "down") for f in floors[1:]]
+    presses_per_tick = rate * TICK
+
+    elapsed = 0.0
+    peak_pending = 0
+    due = 0.0
+    for _ in range(int(seconds / TICK)):
+        due += presses_per_tick
+        start = time.perf_counter()
+        while due >= 1:
+            dispatcher.add_call(*rng.choice(buttons))
+            due -= 1
+        simulator.clock.advance(TICK)
+        simulator.update()
+        elapsed += time.perf_counter() - start
+        peak_pending = max(peak_pending, len(dispatcher.pending_calls))
+    estimates = sum(e.eta_stats.hits + e.eta_stats.misses for e in simulator.elevators)
+    return elapsed / seconds, peak_pending, len(dispatcher.all_calls_log), estimates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=int, default=100, help="Button presses per simulated second")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Simulated seconds")
+    parser.add_argument("--floors", type=int, default=20)
+    parser.add_argument("--cars", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    config = BuildingConfig(min_floor=1, max_floor=args.floors, num_elevators=args.cars)
+    rows = []
+    for label, coalesce in (("per press", False), ("coalesced", True)):
+        cost, pending, logged, estimates = run(config, args.rate, args.seconds, args.seed, coalesce)
+        rows.append([label, cost * 1e3, pending, logged, estimates])
+    print(f"{args.rate} presses/s for {args.seconds:g} s, {args.floors} floors, {args.cars} cars")
+    print_table(
+        ["calls", "dispatch ms/sim s", "peak pending", "logged calls", "ETA estimates"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
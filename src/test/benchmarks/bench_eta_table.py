@@ -0,0 +1,106 @@
+"""
+ETA benchmark: the whole-building table from estimate_table() versus one
+estimate_time() call per (car, floor, direction), and the cost of a single
+closed-form estimate_time() query versus the step-by-step simulate_time()
+as the stop list grows.
+
+Loads every car with random stops and a random motion state, then reports the
+mean time to compute the full table both ways for several building sizes,
+followed by the mean time per query for growing numbers of stops.
+
+Usage (from src/):
+    python -m test.benchmarks.bench_eta_table [--floors N ...] [--cars N ...] [--stops N ...]
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from backend.eta import (
+    TABLE_DIRECTIONS,
+    ElevatorSnapshot,
+    estimate_table,
+    estimate_time,
+    simulate_time,
+    stop_profile,
+)
+from backend.models import BuildingConfig, DoorState, ElevatorState, MoveDirection
+from .common import print_table
+
+
+def random_fleet(config: BuildingConfig, cars: int, stops: int, rng: random.Random) -> List[ElevatorSnapshot]:
+    return [
+        ElevatorSnapshot(
+            i + 1,
+            rng.choice(config.floors),
+            rng.choice(list(ElevatorState)),
+            rng.choice(list(DoorState)),
+            rng.choice([MoveDirection.UP, MoveDirection.DOWN]),
+            *stop_profile(rng.choice(config.floors) for _ in range(stops)),
+            2.0,
+            1.0,
+            config,
+        )
+        for i in range(cars)
+    ]
+
+
+def per_call_table(snapshots: List[ElevatorSnapshot], floors: List[int]) -> list:
+    return [
+        [[estimate_time(s, floor, d) for d in TABLE_DIRECTIONS] for floor in floors]
+        for s in snapshots
+    ]
+
+
+def query_time(estimate, snapshots: List[ElevatorSnapshot], rng: random.Random) -> float:
+    """Mean seconds per estimate over random hall calls to the given cars."""
+    floors = snapshots[0].config.floors
+    queries = [(s, rng.choice(floors), rng.choice(TABLE_DIRECTIONS)) for s in snapshots]
+    start = time.perf_counter()
+    for snapshot, floor, direction in queries:
+        estimate(snapshot, floor, direction)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def mean_time(function, *args, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--floors", type=int, nargs="+", default=[10, 50, 150])
+    parser.add_argument("--cars", type=int, nargs="+", default=[2, 16, 64])
+    parser.add_argument("--car-stops", type=int, default=8, help="Stops per car in the table")
+    parser.add_argument("--stops", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = []
+    for floors in args.floors:
+        config = BuildingConfig(min_floor=1, max_floor=floors, skipped_floors=())
+        for cars in args.cars:
+            snapshots = random_fleet(config, cars, args.car_stops, rng)
+            loop = mean_time(per_call_table, snapshots, config.floors, repeat=args.repeat) * 1e3
+            table = mean_time(estimate_table, snapshots, config.floors, repeat=args.repeat) * 1e3
+            rows.append([floors, cars, loop, table, loop / table])
+    print_table(["floors", "cars", "per-call ms", "table ms", "speedup"], rows)
+    print()
+
+    rows = []
+    config = BuildingConfig(min_floor=1, max_floor=max(args.floors), skipped_floors=())
+    for stops in args.stops:
+        snapshots = random_fleet(config, 200, stops, rng)
+        simulated = query_time(simulate_time, snapshots, rng) * 1e6
+        closed = query_time(estimate_time, snapshots, rng) * 1e6
+        rows.append([stops, simulated, closed, simulated / closed])
+    print_table(["stops", "simulation us/query", "closed form us/query", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Memory benchmark: bytes per logged call and per queued task.
+
+Logs N outside calls through Dispatcher.add_outside_call() (the path every
+hall-button press takes; the calls stay in all_calls_log for the lifetime of
+the process) and builds N tasks, measuring the traced allocations. The same
+is done with dict-backed copies of the models as they were before __slots__,
+as the baseline.
+
+Usage (from src/):
+    python -m test.benchmarks.bench_memory [--calls N]
+"""
+
+import argparse
+from typing import Callable, Optional
+from unittest.mock import Mock
+
+from backend.clock import VirtualClock
+from backend.dispatcher import Dispatcher
+from backend.models import Call, CallState, MoveDirection, Task
+from .common import print_table, traced_bytes
+
+import backend.dispatcher as dispatcher_module
+
+
+class DictCall:
+    """Call without __slots__ (baseline)."""
+
+    def __init__(self, call_id, floor, direction=None, created_at=None):
+        self.call_id = call_id
+        self.floor = floor
+        self.direction = direction
+        self.state = CallState.PENDING
+        self.assigned_elevator: Optional[int] = None
+        self.created_at = created_at
+
+    def complete(self) -> None:
+        self.state = CallState.COMPLETED
+
+
+class DictTask:
+    """Task without __slots__ (baseline)."""
+
+    def __init__(self, floor, call_id=None):
+        self.floor = floor
+        self.call_id = call_id
+
+
+def log_calls(count: int, call_class) -> Callable[[], Dispatcher]:
+    def build() -> Dispatcher:
+        world = Mock()
+        world.elevators = []
+        dispatcher = Dispatcher(world, Mock(), VirtualClock())
+        original = dispatcher_module.Call
+        dispatcher_module.Call = call_class
+        try:
+            for i in range(count):
+                call_id = dispatcher.add_outside_call(i % 5 - 1, MoveDirection.UP)
+                dispatcher.complete_call(call_id)  # Only the log keeps the call
+        finally:
+            dispatcher_module.Call = original
+        return dispatcher
+
+    return build
+
+
+def make_tasks(count: int, task_class) -> Callable[[], list]:
+    def build() -> list:
+        return [task_class(i % 5 - 1, None) for i in range(count)]
+
+    return build
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1_000_000, help="calls and tasks to create")
+    args = parser.parse_args()
+
+    n = args.calls
+    rows = []
+    for label, call_class, task_class in (
+        ("dict (baseline)", DictCall, DictTask),
+        ("__slots__", Call, Task),
+    ):
+        call_bytes = traced_bytes(log_calls(n, call_class)) / n
+        task_bytes = traced_bytes(make_tasks(n, task_class)) / n
+        rows.append([label, call_bytes, task_bytes])
+
+    print(f"{n} logged calls / tasks")
+    print_table(["models", "B/logged call", "B/task"], rows)
+
+
+if __name__ == "__main__":
+    main()
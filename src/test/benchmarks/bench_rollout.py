@@ -0,0 +1,95 @@
+"""
+Rollout dispatch benchmark: lookahead rollouts versus the strategy's own choice.
+
+Runs the hall call workload of bench_batch_assignment (calls at random
+floors at a fixed mean rate, simulator on a virtual clock) with plain
+greedy dispatch and with a RolloutPlanner choosing between the suitable
+cars, in this process and in a process pool. Reports the mean, p95 and
+maximum wait, the calls served and still open, the rollout decisions, the
+decisions that ran out of budget and the mean and maximum wall time of a
+decision.
+
+Usage (from src/):
+    python -m test.benchmarks.bench_rollout [--rate R] [--strategy NAME] [--budget S]
+"""
+
+import argparse
+import statistics
+import time
+
+from backend.models import BuildingConfig
+from backend.rollout import ROLLOUT_BUDGET, ROLLOUT_HORIZON, RolloutPlanner
+from backend.strategies import DISPATCH_STRATEGIES
+from .bench_batch_assignment import run
+from .common import print_table
+
+
+class TimedPlanner(RolloutPlanner):
+    """RolloutPlanner that records the wall time of every decision."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.times = []
+
+    def choose(self, simulator, call_id, candidates):
+        start = time.perf_counter()
+        chosen = super().choose(simulator, call_id, candidates)
+        self.times.append(time.perf_counter() - start)
+        return chosen
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=float, nargs="+", default=[0.3, 0.5], help="Hall calls per simulated second")
+    parser.add_argument("--seconds", type=float, default=1800.0, help="Simulated seconds")
+    parser.add_argument("--floors", type=int, default=30)
+    parser.add_argument("--cars", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--strategy", choices=sorted(DISPATCH_STRATEGIES), default="collective")
+    parser.add_argument("--horizon", type=float, default=ROLLOUT_HORIZON, help="Simulated seconds per rollout")
+    parser.add_argument("--budget", type=float, default=ROLLOUT_BUDGET, help="Wall seconds per dispatch pass")
+    parser.add_argument("--workers", type=int, default=4, help="Processes in the rollout pool")
+    args = parser.parse_args()
+
+    config = BuildingConfig(
+        min_floor=1, max_floor=args.floors, num_elevators=args.cars, dispatch_strategy=args.strategy
+    )
+    rows = []
+    for rate in args.rate:
+        for label, workers in (
+            (f"{args.strategy} (baseline)", None),
+            ("rollout, in process", 0),
+            (f"rollout, {args.workers} workers", args.workers),
+        ):
+            planner = None
+            if workers is not None:
+                planner = TimedPlanner(args.horizon, args.budget, workers)
+                planner.start()
+            _, mean, p95, worst, served, open_calls = run(
+                config, rate, args.seconds, args.seed, False, planner
+            )
+            if planner is None:
+                decisions = ["-"] * 4
+            else:
+                planner.close()
+                times = planner.times or [0.0]
+                decisions = [
+                    planner.decisions, planner.timeouts,
+                    statistics.fmean(times) * 1e3, max(times) * 1e3,
+                ]
+            rows.append([rate, label, mean, p95, worst, served, open_calls, *decisions])
+    print(
+        f"{args.floors} floors, {args.cars} cars, {args.seconds:g} simulated seconds, "
+        f"horizon {args.horizon:g} s, budget {args.budget * 1e3:g} ms"
+    )
+    print_table(
+        [
+            "calls/s", "dispatch", "mean wait s", "p95 wait s", "max wait s", "served", "open",
+            "decisions", "over budget", "ms/decision", "max ms",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
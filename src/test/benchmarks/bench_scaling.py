@@ -0,0 +1,81 @@
+"""
+Scaling benchmark: tick cost and dispatch latency versus building size.
+
+Tick cost is the wall time of one Simulator.update() (every car polled once)
+with all cars busy. Dispatch latency is the wall time of Dispatcher.add_call()
+for a hall call when half of the cars are idle at random floors.
+
+Usage (from src/):
+    python -m test.benchmarks.bench_scaling [--ticks N] [--calls N] [--vectorized]
+"""
+
+import argparse
+import random
+
+from backend.models import BuildingConfig
+from .common import build_simulator, print_table, random_task_load, summarize, time_call
+
+FLOOR_COUNTS = (10, 50, 150)
+CAR_COUNTS = (2, 16, 64)
+TICK = 0.1  # Simulated seconds per tick
+
+
+def measure_ticks(config: BuildingConfig, ticks: int, vectorized: bool, seed: int):
+    simulator = build_simulator(config, vectorized=vectorized)
+    rng = random.Random(seed)
+    samples = []
+    for tick in range(ticks):
+        if tick % 10 == 0:
+            random_task_load(simulator, rng)
+        simulator.clock.advance(TICK)
+        samples.append(time_call(simulator.update))
+    return summarize(samples)
+
+
+def measure_dispatch(config: BuildingConfig, calls: int, seed: int):
+    simulator = build_simulator(config)
+    dispatcher = simulator.dispatcher
+    rng = random.Random(seed)
+    floors = config.floors
+    samples = []
+    for _ in range(calls):
+        # Fresh scenario: cars scattered, every other one busy with a trip
+        for index, elevator in enumerate(simulator.elevators):
+            elevator.reset()
+            elevator.current_floor = rng.choice(floors)
+            if index % 2:
+                dispatcher.assign_task(index, rng.choice(floors), None)
+        dispatcher.pending_calls.clear()
+        dispatcher.waiting.clear()
+        floor = rng.choice(floors[1:-1])
+        direction = rng.choice(["up", "down"])
+        samples.append(time_call(dispatcher.add_call, floor, direction))
+    return summarize(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=500, help="Ticks per configuration")
+    parser.add_argument("--calls", type=int, default=200, help="Hall calls per configuration")
+    parser.add_argument("--vectorized", action="store_true", help="Use the NumPy fleet engine")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rows = []
+    for floors in FLOOR_COUNTS:
+        for cars in CAR_COUNTS:
+            config = BuildingConfig(min_floor=1, max_floor=floors, num_elevators=cars)
+            tick = measure_ticks(config, args.ticks, args.vectorized, args.seed)
+            dispatch = measure_dispatch(config, args.calls, args.seed)
+            rows.append(
+                [floors, cars, tick["mean_us"], tick["p99_us"], dispatch["mean_us"], dispatch["p99_us"]]
+            )
+    engine = "vectorized" if args.vectorized else "scalar"
+    print(f"Tick cost ({engine} engine) and dispatch latency, microseconds")
+    print_table(
+        ["floors", "cars", "tick_mean", "tick_p99", "dispatch_mean", "dispatch_p99"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
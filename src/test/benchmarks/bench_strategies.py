@@ -0,0 +1,54 @@
+"""
+Dispatch strategy benchmark: waiting times of every registered strategy.
+
+Runs the hall call workload of bench_batch_assignment (calls at random
+floors at a fixed mean rate, simulator on a virtual clock) once per
+strategy in DISPATCH_STRATEGIES, idle-eta being the original policy, and
+reports the mean wall time of a dispatch pass over two or more waiting
+calls, the mean, p95 and maximum wait, the calls served and the calls still
+open at the end.
+
+Usage (from src/):
+    python -m test.benchmarks.bench_strategies [--rate R] [--seconds N] [--batch]
+"""
+
+import argparse
+
+from backend.models import BuildingConfig
+from backend.strategies import DISPATCH_STRATEGIES
+from .bench_batch_assignment import run
+from .common import print_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=float, nargs="+", default=[0.2, 0.5], help="Hall calls per simulated second")
+    parser.add_argument("--seconds", type=float, default=1800.0, help="Simulated seconds")
+    parser.add_argument("--floors", type=int, default=30)
+    parser.add_argument("--cars", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--batch", action="store_true", help="Batch assignment instead of greedy")
+    args = parser.parse_args()
+
+    rows = []
+    for rate in args.rate:
+        for name in DISPATCH_STRATEGIES:
+            config = BuildingConfig(
+                min_floor=1, max_floor=args.floors, num_elevators=args.cars, dispatch_strategy=name
+            )
+            pass_time, mean, p95, worst, served, open_calls = run(
+                config, rate, args.seconds, args.seed, args.batch
+            )
+            rows.append([rate, name, pass_time * 1e6, mean, p95, worst, served, open_calls])
+    print(
+        f"{args.floors} floors, {args.cars} cars, {args.seconds:g} simulated seconds, "
+        f"{'batch' if args.batch else 'greedy'} assignment"
+    )
+    print_table(
+        ["calls/s", "strategy", "us/pass", "mean wait s", "p95 wait s", "max wait s", "served", "open"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
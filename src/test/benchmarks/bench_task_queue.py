@@ -0,0 +1,170 @@
+"""
+Task queue benchmark: cost of inserting stops into one elevator's queue and
+of the direction decision over it.
+
+Simulates an insert-heavy burst (a lobby rush of hall calls) and reports the
+mean cost per insert at growing queue lengths for the two-heap TaskQueue
+(Dispatcher._optimize_task_queue) and for the previous list re-sort. Then
+sweeps the car floor by floor through a full queue and reports the cost of
+Elevator._determine_direction() against the previous queue scans. Both
+baselines are kept here verbatim.
+
+Usage (from src/):
+    python -m test.benchmarks.bench_task_queue [--sizes N ...]
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from backend.api.null import NullAPI
+from backend.clock import VirtualClock
+from backend.dispatcher import Dispatcher
+from backend.elevator import Elevator
+from backend.models import BuildingConfig, ElevatorState, MoveDirection, Task
+from .common import print_table
+
+
+class _World:
+    def __init__(self, elevators: List[Elevator]) -> None:
+        self.elevators = elevators
+
+
+def resort_queue(elevator: Elevator, task_queue: List[Task], distance) -> List[Task]:
+    """Dispatcher._optimize_task_queue before the two-heap queue (baseline)."""
+    if not task_queue or len(task_queue) <= 1:
+        return task_queue
+    current_direction = None
+    if elevator.state == ElevatorState.MOVING_UP:
+        current_direction = "up"
+    elif elevator.state == ElevatorState.MOVING_DOWN:
+        current_direction = "down"
+    above = [t for t in task_queue if t.floor > elevator.current_floor]
+    below = [t for t in task_queue if t.floor < elevator.current_floor]
+    if current_direction == "up":
+        return sorted(above, key=lambda t: t.floor) + sorted(below, key=lambda t: t.floor)
+    if current_direction == "down":
+        return sorted(below, key=lambda t: -t.floor) + sorted(above, key=lambda t: t.floor)
+    closest = min(task_queue, key=lambda t: distance(elevator.current_floor, t.floor))
+    if closest.floor > elevator.current_floor:
+        return sorted(above, key=lambda t: t.floor) + sorted(below, key=lambda t: t.floor)
+    return sorted(below, key=lambda t: -t.floor) + sorted(above, key=lambda t: t.floor)
+
+
+def scan_direction(self, task_queue: List[Task]) -> None:
+    """Elevator._determine_direction before the pivot counters (baseline)."""
+    if not task_queue:
+        self.direction = None
+        return
+    if all(task.floor > self.current_floor for task in task_queue):
+        self.direction = MoveDirection.UP
+    elif all(task.floor < self.current_floor for task in task_queue):
+        self.direction = MoveDirection.DOWN
+    elif self.direction == MoveDirection.UP and any(
+        task.floor > self.current_floor for task in task_queue
+    ):
+        self.direction = MoveDirection.UP
+    elif self.direction == MoveDirection.DOWN and any(
+        task.floor < self.current_floor for task in task_queue
+    ):
+        self.direction = MoveDirection.DOWN
+    else:
+        closest_above = min(
+            [task.floor for task in task_queue if task.floor > self.current_floor],
+            default=None,
+        )
+        closest_below = max(
+            [task.floor for task in task_queue if task.floor < self.current_floor],
+            default=None,
+        )
+        if closest_above is not None and closest_below is not None:
+            distance = self.config.distance
+            self.direction = (
+                MoveDirection.UP
+                if distance(closest_above, self.current_floor)
+                <= distance(self.current_floor, closest_below)
+                else MoveDirection.DOWN
+            )
+        elif closest_above is not None:
+            self.direction = MoveDirection.UP
+        elif closest_below is not None:
+            self.direction = MoveDirection.DOWN
+        else:
+            self.direction = None
+
+
+def run_direction(size: int, seed: int, use_counters: bool) -> float:
+    """Mean seconds per direction decision during one up sweep through `size` stops.
+
+    The car moves up floor by floor, serves the stops at each floor and then
+    decides its direction, as after every door close. Only the decision is timed.
+    """
+    config = BuildingConfig(min_floor=1, max_floor=max(2 * size, 50), skipped_floors=())
+    elevator = Elevator(1, None, NullAPI(), VirtualClock(), config)
+    rng = random.Random(seed)
+    tasks = sorted((Task(rng.choice(config.floors)) for _ in range(size)), key=lambda t: t.floor)
+    elevator.task_queue = tasks
+    queue = elevator.task_queue if use_counters else tasks
+
+    elapsed = 0.0
+    for floor in config.floors:
+        elevator.current_floor = floor
+        while queue and queue[0].floor == floor:
+            queue.pop(0)
+        start = time.perf_counter()
+        if use_counters:
+            elevator._determine_direction()
+        else:
+            scan_direction(elevator, tasks)
+        elapsed += time.perf_counter() - start
+    return elapsed / len(config.floors)
+
+
+def run(size: int, seed: int, use_heaps: bool) -> float:
+    """Mean seconds per insert while filling one queue with `size` stops."""
+    config = BuildingConfig(min_floor=1, max_floor=max(2 * size, 50), skipped_floors=())
+    elevator = Elevator(1, None, NullAPI(), VirtualClock(), config)
+    elevator.current_floor = config.max_floor // 2
+    elevator.state = ElevatorState.MOVING_UP
+    dispatcher = Dispatcher(_World([elevator]), NullAPI(), elevator.clock, config)
+    rng = random.Random(seed)
+    tasks = [Task(rng.choice(config.floors), f"call-{i}") for i in range(size)]
+
+    queue: List[Task] = []
+    start = time.perf_counter()
+    if use_heaps:
+        for task in tasks:
+            elevator.task_queue.append(task)
+            dispatcher._optimize_task_queue(elevator)
+    else:
+        for task in tasks:
+            queue.append(task)
+            queue = resort_queue(elevator, queue, config.distance)
+    return (time.perf_counter() - start) / size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 300, 3000])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        resort = run(size, args.seed, use_heaps=False) * 1e6
+        heaps = run(size, args.seed, use_heaps=True) * 1e6
+        rows.append([size, resort, heaps, resort / heaps])
+    print_table(["stops", "re-sort us/insert", "heaps us/insert", "speedup"], rows)
+    print()
+
+    rows = []
+    for size in args.sizes:
+        scans = run_direction(size, args.seed, use_counters=False) * 1e6
+        counters = run_direction(size, args.seed, use_counters=True) * 1e6
+        rows.append([size, scans, counters, scans / counters])
+    print_table(["stops", "scans us/decision", "counters us/decision", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
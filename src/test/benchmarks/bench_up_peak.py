@@ -0,0 +1,144 @@
+"""
+Up-peak throughput benchmark: passengers delivered with and without
+en-route hall-call pickup.
+
+Passengers arrive at a fixed mean rate, most of them at the lobby going up,
+the rest travelling between upper floors or down to the lobby. A passenger
+presses the hall button, boards the car that answers the call (up to
+CAPACITY per car, the others press the button again) and selects the
+destination inside. Runs on a virtual clock and reports the passengers
+delivered per 5 minutes, the mean wait for a car, the mean time from
+arrival to destination and the passengers not yet delivered at the end.
+The baseline is the original policy, where only fully idle cars take hall
+calls.
+
+Usage (from src/):
+    python -m test.benchmarks.bench_up_peak [--rate R] [--seconds N]
+"""
+
+import argparse
+import random
+import statistics
+from collections import defaultdict
+from typing import List, NamedTuple
+
+from backend.models import BuildingConfig, DoorState
+from .bench_batch_assignment import _poisson
+from .common import build_simulator, print_table
+
+TICK = 0.1  # Simulated seconds per tick
+CAPACITY = 12  # Passengers per car
+MIX = (0.8, 0.1)  # Shares of lobby arrivals going up and of interfloor trips; the rest go down to the lobby
+
+
+class Passenger(NamedTuple):
+    origin: int
+    destination: int
+    arrived_at: float
+
+
+def run(config: BuildingConfig, rate: float, seconds: float, seed: int, en_route: bool):
+    simulator = build_simulator(config)
+    dispatcher = simulator.dispatcher
+    dispatcher.en_route_pickup = en_route
+    clock = simulator.clock
+    lobby, upper = config.min_floor, config.floors[1:]
+
+    waiting = defaultdict(list)  # {(floor, direction): [Passenger]}
+    riding: List[List[Passenger]] = [[] for _ in simulator.elevators]
+    answered = []  # (floor, direction, elevator index or None) of completed hall calls
+    waits, trips = [], []
+
+    complete_call = dispatcher.complete_call
+
+    def answer(call_id):
+        call = dispatcher.pending_calls.get(call_id)
+        if call is not None:
+            answered.append((call.floor, call.direction.value, dispatcher.serving_elevator(call_id)))
+        return complete_call(call_id)
+
+    dispatcher.complete_call = answer
+
+    def arrive(rng: random.Random) -> None:
+        draw = rng.random()
+        if draw < MIX[0]:
+            origin, destination = lobby, rng.choice(upper)
+        elif draw < MIX[0] + MIX[1]:
+            origin, destination = rng.sample(upper, 2)
+        else:
+            origin, destination = rng.choice(upper), lobby
+        direction = "up" if destination > origin else "down"
+        waiting[(origin, direction)].append(Passenger(origin, destination, clock.now()))
+        dispatcher.add_call(origin, direction)
+
+    def board() -> None:
+        now = clock.now()
+        for floor, direction, index in answered:
+            if index is None:  # Answered by a car already standing at the floor
+                index = next(
+                    i for i, car in enumerate(simulator.elevators) if car.current_floor == floor
+                )
+            queue, car = waiting.pop((floor, direction), []), riding[index]
+            space = max(0, CAPACITY - len(car))
+            for passenger in queue[:space]:
+                car.append(passenger)
+                waits.append(now - passenger.arrived_at)
+                dispatcher.assign_task(index, passenger.destination)
+            if queue[space:]:
+                waiting[(floor, direction)] = queue[space:]
+                dispatcher.add_call(floor, direction)  # The rest press again
+        answered.clear()
+
+    def alight() -> None:
+        now = clock.now()
+        for index, car in enumerate(simulator.elevators):
+            if car.door_state in (DoorState.OPENING, DoorState.OPEN) and riding[index]:
+                staying = []
+                for passenger in riding[index]:
+                    if passenger.destination == car.current_floor:
+                        trips.append(now - passenger.arrived_at)
+                    else:
+                        staying.append(passenger)
+                riding[index] = staying
+
+    rng = random.Random(seed)
+    for _ in range(int(seconds / TICK)):
+        for _ in range(_poisson(rng, rate / 60 * TICK)):
+            arrive(rng)
+        clock.advance(TICK)
+        simulator.update()
+        board()
+        alight()
+    undelivered = sum(map(len, waiting.values())) + sum(map(len, riding))
+    return (
+        len(trips) * 300 / seconds,
+        statistics.fmean(waits) if waits else 0.0,
+        statistics.fmean(trips) if trips else 0.0,
+        undelivered,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=float, nargs="+", default=[10, 20, 30], help="Passengers per simulated minute")
+    parser.add_argument("--seconds", type=float, default=1800.0, help="Simulated seconds")
+    parser.add_argument("--floors", type=int, default=16)
+    parser.add_argument("--cars", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    config = BuildingConfig(min_floor=1, max_floor=args.floors, num_elevators=args.cars)
+    rows = []
+    for rate in args.rate:
+        for label, en_route in (("idle cars only (baseline)", False), ("en-route pickup", True)):
+            per_5min, wait, trip, undelivered = run(config, rate, args.seconds, args.seed, en_route)
+            rows.append([rate, label, per_5min, wait, trip, undelivered])
+    print(f"{args.floors} floors, {args.cars} cars of {CAPACITY}, {args.seconds:g} simulated seconds, up-peak")
+    print_table(
+        ["passengers/min", "policy", "delivered/5 min", "mean wait s", "mean trip s", "undelivered"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
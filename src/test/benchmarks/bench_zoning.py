@@ -0,0 +1,146 @@
+"""
+Zoning benchmark: dispatch latency versus building size, with and without zones.
+
+Dispatch latency is the wall time of add_call() for one hall call when half
+of the cars are idle at random floors. Pass latency is the wall time of the
+dispatcher update that assigns a backlog of waiting hall calls when every
+car frees up at once, in process and, with --workers, with the zone passes
+in worker processes. Zoned buildings are split into --zones stacked bands
+(split_zones). The last table shows the mean and p95 wait of the
+bench_batch_assignment workload in one building, zoned and not.
+
+Usage (from src/):
+    python -m test.benchmarks.bench_zoning [--zones N] [--backlog N] [--workers N] [--batch]
+"""
+
+import argparse
+import random
+import statistics
+
+from backend.models import BuildingConfig
+from backend.zoning import split_zones
+from .bench_batch_assignment import run
+from .common import build_simulator, print_table, summarize, time_call
+
+FLOOR_COUNTS = (50, 100, 200)
+CAR_COUNTS = (8, 32, 64)
+
+
+def zoned(config: BuildingConfig, zones: int) -> BuildingConfig:
+    count = min(zones, config.num_elevators)
+    return BuildingConfig.from_dict({**config.to_dict(), "zones": split_zones(config, count)})
+
+
+def clear_calls(dispatcher) -> None:
+    """Drop every open call, including those waiting in zones."""
+    dispatcher.pending_calls.clear()
+    for queue in [dispatcher, *getattr(dispatcher, "zones", [])]:
+        queue.waiting.clear()
+
+
+def measure_dispatch(config: BuildingConfig, calls: int, seed: int):
+    simulator = build_simulator(config)
+    dispatcher = simulator.dispatcher
+    rng = random.Random(seed)
+    floors = config.floors
+    samples = []
+    for _ in range(calls):
+        # Fresh scenario: cars scattered, every other one busy with a trip
+        for index, elevator in enumerate(simulator.elevators):
+            elevator.reset()
+            elevator.current_floor = rng.choice(floors)
+            if index % 2:
+                dispatcher.assign_task(index, rng.choice(floors), None)
+        clear_calls(dispatcher)
+        floor = rng.choice(floors[1:-1])
+        direction = rng.choice(["up", "down"])
+        samples.append(time_call(dispatcher.add_call, floor, direction))
+    return summarize(samples)
+
+
+def measure_pass(config: BuildingConfig, backlog: int, batch: bool, workers: int, rounds: int, seed: int):
+    """Median wall time (ms) of the update that assigns `backlog` waiting calls."""
+    rng = random.Random(seed)
+    floors = config.floors
+    buttons = [(f, "up") for f in floors[:-1]] + [(f, "down") for f in floors[1:]]
+    pool = None
+    samples = []
+    for round_ in range(rounds + 1):
+        simulator = build_simulator(config)
+        dispatcher = simulator.dispatcher
+        dispatcher.batch_assignment = batch
+        if workers:
+            # One pool for all rounds; round 0 warms up the workers
+            dispatcher.workers = workers
+            if pool is None:
+                dispatcher.start()
+                pool = dispatcher._pool
+            dispatcher._pool = pool
+        for index in range(len(simulator.elevators)):
+            dispatcher.assign_task(index, rng.choice(floors), None)  # Every car busy
+        for _ in range(backlog):
+            dispatcher.add_call(*rng.choice(buttons))
+        for elevator in simulator.elevators:
+            elevator.reset()  # All cars free up at once
+            elevator.current_floor = rng.choice(floors)
+        elapsed = time_call(dispatcher.update)
+        if round_:
+            samples.append(elapsed)
+    if pool is not None:
+        pool.shutdown()
+    return statistics.median(samples) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--zones", type=int, default=4, help="Zones per building (at most one per car)")
+    parser.add_argument("--calls", type=int, default=200, help="Hall calls per dispatch measurement")
+    parser.add_argument("--backlog", type=int, default=80, help="Waiting calls per pass measurement")
+    parser.add_argument("--rounds", type=int, default=5, help="Passes per configuration")
+    parser.add_argument("--workers", type=int, default=0, help="Also time zone passes in N worker processes")
+    parser.add_argument("--batch", action="store_true", help="Assign by minimum-cost matching")
+    parser.add_argument("--rate", type=float, default=0.8, help="Hall calls per second for the wait table")
+    parser.add_argument("--seconds", type=float, default=1800.0, help="Simulated seconds for the wait table")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    dispatch_rows = []
+    pass_rows = []
+    for floors in FLOOR_COUNTS:
+        for cars in CAR_COUNTS:
+            flat = BuildingConfig(min_floor=1, max_floor=floors, num_elevators=cars)
+            split = zoned(flat, args.zones)
+            off = measure_dispatch(flat, args.calls, args.seed)
+            on = measure_dispatch(split, args.calls, args.seed)
+            dispatch_rows.append(
+                [floors, cars, len(split.zones), off["mean_us"], off["p99_us"], on["mean_us"], on["p99_us"]]
+            )
+            row = [
+                floors, cars, len(split.zones),
+                measure_pass(flat, args.backlog, args.batch, 0, args.rounds, args.seed),
+                measure_pass(split, args.backlog, args.batch, 0, args.rounds, args.seed),
+            ]
+            if args.workers:
+                row.append(measure_pass(split, args.backlog, args.batch, args.workers, args.rounds, args.seed))
+            pass_rows.append(row)
+
+    print("Dispatch latency of one hall call, microseconds")
+    print_table(["floors", "cars", "zones", "flat_mean", "flat_p99", "zoned_mean", "zoned_p99"], dispatch_rows)
+    mode = "batch" if args.batch else "greedy"
+    print(f"\nPass latency for {args.backlog} waiting calls ({mode}), milliseconds")
+    headers = ["floors", "cars", "zones", "flat", "zoned"]
+    if args.workers:
+        headers.append(f"zoned_{args.workers}_workers")
+    print_table(headers, pass_rows)
+
+    flat = BuildingConfig(min_floor=1, max_floor=60, num_elevators=12)
+    wait_rows = []
+    for label, config in (("flat", flat), (f"{args.zones} zones", zoned(flat, args.zones))):
+        _, mean, p95, worst, served, open_calls = run(config, args.rate, args.seconds, args.seed, args.batch)
+        wait_rows.append([label, mean, p95, worst, served, open_calls])
+    print(f"\nHall call waits, 60 floors, 12 cars, {args.rate:g} calls/s, {args.seconds:g} simulated seconds")
+    print_table(["building", "mean wait s", "p95 wait s", "max wait s", "served", "open"], wait_rows)
+
+
+if __name__ == "__main__":
+    main()
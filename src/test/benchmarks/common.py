@@ -0,0 +1,75 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks are plain scripts (not collected by pytest); run them from src/, e.g.
+    python -m test.benchmarks.bench_scaling
+"""
+
+import contextlib
+import gc
+import io
+import random
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+
+from backend.api.null import NullAPI
+from backend.clock import VirtualClock
+from backend.models import BuildingConfig
+from backend.simulator import Simulator
+
+
+def build_simulator(config: BuildingConfig, **options) -> Simulator:
+    """Simulator on a virtual clock with a NullAPI, start-up logging suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulator = Simulator(clock=VirtualClock(), config=config, **options)
+        simulator.set_api_and_initialize_components(NullAPI())
+    return simulator
+
+
+def random_task_load(simulator: Simulator, rng: random.Random) -> None:
+    """Give every idle car without tasks a random destination."""
+    floors = simulator.config.floors
+    for index, elevator in enumerate(simulator.elevators):
+        if not elevator.task_queue:
+            simulator.dispatcher.assign_task(index, rng.choice(floors), None)
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """Mean and p99 of timing samples, in microseconds."""
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return {"mean_us": statistics.fmean(ordered) * 1e6, "p99_us": p99 * 1e6}
+
+
+def time_call(function: Callable, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def traced_bytes(build: Callable[[], object]) -> int:
+    """Bytes still allocated after build() (its result is kept alive)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def print_table(headers: List[str], rows: List[List]) -> None:
+    widths = [
+        max(len(str(header)), *(len(_fmt(row[i])) for row in rows))
+        for i, header in enumerate(headers)
+    ]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(_fmt(value).rjust(w) for value, w in zip(row, widths)))
+
+
+def _fmt(value) -> str:
+    return f"{value:.1f}" if isinstance(value, float) else str(value)
@@ -6,6 +6,7 @@ that are used across multiple test modules.
 
 import pytest
 import time
+from concurrent.futures import Executor, Future
 from unittest.mock import Mock, MagicMock
 from typing import List
 
@@ -103,7 +104,7 @@ def mock_elevator():
     # Setup mock dispatcher
     mock_dispatcher = Mock()
     mock_dispatcher.get_call_direction.return_value = MoveDirection.UP
-    mock_dispatcher.complete_call.return_value = None
+    mock_dispatcher.complete_call.return_value = MoveDirection.UP  # The completed call's direction
     mock_world.dispatcher = mock_dispatcher
 
     # Setup mock API methods
@@ -198,6 +199,19 @@ class TestConstants:
     INVALID_DIRECTIONS = ["invalid", "", "left", "right", "stop"]
 
 
+class StubPool(Executor):
+    """Worker pool stand-in whose jobs fail with `error`, or never finish without one."""
+
+    def __init__(self, error=None):
+        self.error = error
+
+    def submit(self, fn, *args, **kwargs):
+        job = Future()
+        if self.error is not None:
+            job.set_exception(self.error)
+        return job
+
+
 # Helper functions
 def create_test_elevator(
     elevator_id: int = 1,
@@ -5,6 +5,8 @@ Tests the API command parsing, execution, and error handling
 as specified in the validation documentation (TC62-TC92).
 """
 
+import json
+
 import pytest
 from unittest.mock import Mock, patch
 from backend.api.core import ElevatorAPI
@@ -12,8 +14,10 @@ from backend.simulator import Simulator
 from backend.dispatcher import Dispatcher
 from backend.elevator import Elevator
 from backend.models import (
+    BuildingConfig,
     ElevatorState,
     DoorState,
+    MoveDirection,
     validate_floor,
     validate_elevator_id,
 )
@@ -436,5 +440,171 @@ class TestAPIStateFetching:
         assert result[0]["direction"] == "UP"
 
 
+
+class TestAPIBuildingConfig:
+    """Test cases for validation against the configured building"""
+
+    def _world(self, api, config):
+        world = Simulator(config=config)
+        world.set_api_and_initialize_components(api)
+        api.world = world
+        return world
+
+    def test_select_floor_accepts_configured_cars_and_floors(self, api_without_zmq):
+        """Test that car ids and floors beyond the default building are accepted"""
+        self._world(api_without_zmq, BuildingConfig(min_floor=1, max_floor=30, num_elevators=8))
+
+        result = api_without_zmq._handle_select_floor(25, 8)
+
+        assert result["status"] == "success"
+
+    def test_errors_report_configured_limits(self, api_without_zmq):
+        """Test that error messages name the configured floor range and car count"""
+        self._world(
+            api_without_zmq,
+            BuildingConfig(min_floor=1, max_floor=30, skipped_floors=[13], num_elevators=8),
+        )
+
+        floor_error = api_without_zmq._handle_call_elevator(13, "up")
+        car_error = api_without_zmq._handle_select_floor(2, 9)
+
+        assert floor_error["message"] == "Invalid floor: 13. Must be between 1 and 30 (excluding 13)"
+        assert car_error["message"] == "Invalid elevator ID: 9. Must be between 1 and 8"
+
+
+class TestAPILockstepStep:
+    """Test cases for the lockstep step@<ms> command"""
+
+    def _lockstep_api(self, api):
+        world = Simulator(lockstep=True)
+        world.set_api_and_initialize_components(api)
+        api.world = world
+        return world
+
+    def _sent_messages(self, api):
+        return [call.args[0] for call in api.zmq_client.send_msg.call_args_list]
+
+    def test_step_requires_lockstep_mode(self, api_without_zmq):
+        """Test that step is refused when the simulator runs in real time"""
+        api = api_without_zmq
+        world = Simulator()
+        world.set_api_and_initialize_components(api)
+        api.world = world
+
+        result = api._parse_and_execute("step@100")
+
+        assert result.startswith("error:step_failed:")
+
+    def test_step_rejects_negative_and_missing_duration(self, api_without_zmq):
+        """Test step argument validation"""
+        api = api_without_zmq
+        self._lockstep_api(api)
+
+        assert api._parse_and_execute("step@-5").startswith("error:step_failed:")
+        assert api._parse_and_execute("step").startswith("error:step_failed:")
+        assert api._parse_and_execute("step@abc").startswith("error:step_failed:")
+
+    def test_step_advances_exact_virtual_time(self, api_without_zmq):
+        """Test that step advances the clock by exactly the requested time"""
+        api = api_without_zmq
+        world = self._lockstep_api(api)
+
+        assert api._parse_and_execute("step@250") == "step_done@250"
+        assert api._parse_and_execute("step@1750") == "step_done@2000"
+        assert world.clock.now() == 2.0
+
+    def test_step_emits_window_messages_in_order(self, api_without_zmq):
+        """Test that only events inside the window are emitted, before the acknowledgement"""
+        api = api_without_zmq
+        self._lockstep_api(api)
+        api._parse_and_execute("open_door@1")  # The command reply itself is returned, not sent
+        api.zmq_client.send_msg.reset_mock()
+
+        assert api._parse_and_execute("step@999") == "step_done@999"
+        assert self._sent_messages(api) == []
+
+        assert api._parse_and_execute("step@1") == "step_done@1000"
+        assert self._sent_messages(api) == ["door_opened#1"]
+
+    def test_passenger_scenario_is_deterministic(self, api_without_zmq):
+        """Test that a full passenger trip runs in lockstep with a fixed message sequence"""
+        api = api_without_zmq
+        self._lockstep_api(api)
+
+        api._parse_and_execute("call_up@-1")
+        api._parse_and_execute("step@6000")
+        api._parse_and_execute("select_floor@3#1")
+        api._parse_and_execute("step@20000")
+
+        # Arrival is announced both when the car stops and when it services the stop
+        assert self._sent_messages(api) == [
+            "up_floor_arrived@-1#1",
+            "floor_arrived@-1#1",
+            "door_opened#1",
+            "door_closed#1",
+            "floor_arrived@3#1",
+            "floor_arrived@3#1",
+            "door_opened#1",
+            "door_closed#1",
+        ]
+
+
+class TestAPIEtaTable:
+    """Test cases for the whole-building ETA table"""
+
+    def _busy_world(self, api):
+        world = Simulator(lockstep=True)
+        world.set_api_and_initialize_components(api)
+        api.world = world
+        api._parse_and_execute("call_up@-1")
+        api._parse_and_execute("select_floor@3#2")
+        api._parse_and_execute("step@2500")
+        return world
+
+    def test_eta_table_world_not_initialized(self, api_without_zmq):
+        """Test that an empty table is returned without a world"""
+        api = api_without_zmq
+        api.world = None
+
+        assert api.fetch_eta_table() == {"floors": [], "elevator_ids": [], "up": [], "down": []}
+
+    def test_eta_table_matches_per_call_estimates(self, api_without_zmq):
+        """Test that every entry equals the elevator's own estimate for that hall call"""
+        api = api_without_zmq
+        world = self._busy_world(api)
+
+        table = api.fetch_eta_table()
+
+        assert table["floors"] == world.config.floors
+        assert table["elevator_ids"] == [1, 2]
+        for direction in (MoveDirection.UP, MoveDirection.DOWN):
+            for floor, row in zip(table["floors"], table[direction.value]):
+                expected = [e.calculate_estimated_time(floor, direction) for e in world.elevators]
+                assert row == pytest.approx(expected)
+
+    def test_eta_table_without_numpy(self, api_without_zmq):
+        """Test that the table falls back to per-call estimates without NumPy"""
+        api = api_without_zmq
+        self._busy_world(api)
+        vectorized = api.fetch_eta_table()
+
+        with patch("backend.api.core.numpy_available", return_value=False):
+            fallback = api.fetch_eta_table()
+
+        for direction in ("up", "down"):
+            for row, expected in zip(fallback[direction], vectorized[direction]):
+                assert row == pytest.approx(expected)
+
+    def test_parse_eta_table_command(self, api_without_zmq):
+        """Test that the eta_table query is answered with the table as JSON"""
+        api = api_without_zmq
+        self._busy_world(api)
+
+        result = api._parse_and_execute("eta_table")
+
+        assert result.startswith("eta_table@")
+        assert json.loads(result.split("@", 1)[1]) == api.fetch_eta_table()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,71 @@
+"""
+Unit tests for minimum-cost call assignment.
+
+Tests that min_cost_assignment() finds the optimal one-to-one matching on
+square and rectangular matrices, compared against brute force, and that
+forbidden (inf) pairs are never matched.
+"""
+
+import itertools
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from backend.assignment import min_cost_assignment
+
+INF = float("inf")
+
+
+def brute_force(cost):
+    """(-matched pairs, total cost) of the best matching, by enumeration."""
+    rows, cols = len(cost), len(cost[0]) if cost else 0
+    best = (0, 0.0)
+    if rows <= cols:
+        options = ([(i, perm[i]) for i in range(rows)] for perm in itertools.permutations(range(cols), rows))
+    else:
+        options = ([(perm[j], j) for j in range(cols)] for perm in itertools.permutations(range(rows), cols))
+    for pairs in options:
+        finite = [(i, j) for i, j in pairs if cost[i][j] < INF]
+        best = min(best, (-len(finite), sum(cost[i][j] for i, j in finite)))
+    return best
+
+
+class TestMinCostAssignment:
+    """Test cases for min_cost_assignment"""
+
+    def test_beats_greedy_choice(self):
+        """Test that the matching gives up a row's best column when that lowers the total"""
+        cost = [[1.0, 2.0], [1.0, 100.0]]
+
+        assert min_cost_assignment(cost) == [(0, 1), (1, 0)]
+
+    def test_forbidden_pairs_are_not_matched(self):
+        """Test that inf entries are left out, even if that leaves a row unmatched"""
+        cost = [[INF, 4.0], [INF, 1.0], [INF, INF]]
+
+        assert min_cost_assignment(cost) == [(1, 1)]
+
+    def test_empty_matrix(self):
+        """Test that an empty matrix gives no pairs"""
+        assert min_cost_assignment(np.zeros((0, 3))) == []
+
+    def test_matches_brute_force(self):
+        """Test optimality against enumeration on random rectangular matrices"""
+        rng = random.Random(7)
+        for _ in range(500):
+            rows, cols = rng.randint(1, 5), rng.randint(1, 5)
+            cost = [
+                [INF if rng.random() < 0.2 else float(rng.randint(0, 30)) for _ in range(cols)]
+                for _ in range(rows)
+            ]
+
+            pairs = min_cost_assignment(cost)
+
+            assert len({i for i, _ in pairs}) == len({j for _, j in pairs}) == len(pairs)
+            assert (-len(pairs), sum(cost[i][j] for i, j in pairs)) == brute_force(cost)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,152 @@
+"""
+Unit tests for the simulation clocks.
+
+Tests the virtual clock semantics and that elevators, dispatcher and simulator
+read time through the injected clock instead of the system time.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from backend.clock import Clock, MonotonicClock, ScaledClock, SteppableClock, VirtualClock, WallClock
+from backend.dispatcher import Dispatcher
+from backend.elevator import Elevator
+from backend.models import DoorState
+from backend.simulator import Simulator
+from backend.api.core import ElevatorAPI
+
+
+class TestVirtualClock:
+    """Test cases for VirtualClock"""
+
+    def test_starts_at_given_time(self):
+        """Test that a virtual clock starts at the requested timestamp"""
+        clock = VirtualClock(start=42.0)
+        assert clock.now() == 42.0
+
+    def test_advance_and_sleep(self):
+        """Test that advance() and sleep() move time forward without blocking"""
+        clock = VirtualClock()
+        clock.advance(1.5)
+        clock.sleep(3600)
+
+        assert clock.now() == 3601.5
+
+    def test_advance_to_never_moves_backwards(self):
+        """Test that advance_to() ignores timestamps in the past"""
+        clock = VirtualClock(start=10.0)
+        clock.advance_to(5.0)
+        assert clock.now() == 10.0
+
+        clock.advance_to(12.0)
+        assert clock.now() == 12.0
+
+    def test_negative_advance_rejected(self):
+        """Test that the clock refuses to go backwards"""
+        clock = VirtualClock()
+        with pytest.raises(ValueError):
+            clock.advance(-1)
+
+
+class TestRealClocks:
+    """Test cases for the real-time clocks"""
+
+    def test_wall_clock_reads_system_time(self):
+        """Test that WallClock follows time.time()"""
+        with patch("time.time", return_value=123.0):
+            assert WallClock().now() == 123.0
+
+    def test_monotonic_clock_is_non_decreasing(self):
+        """Test that MonotonicClock never goes backwards"""
+        clock = MonotonicClock()
+        first = clock.now()
+        assert clock.now() >= first
+
+
+class TestScaledClock:
+    """Test cases for ScaledClock used by --time-scale and --fast-forward"""
+
+    def test_time_runs_scale_times_faster(self):
+        """Test that clock time advances `scale` times faster than real time"""
+        with patch("time.monotonic", side_effect=[100.0, 102.0]):
+            clock = ScaledClock(scale=10.0)
+            assert clock.now() == 20.0
+
+    def test_advance_to_skips_time(self):
+        """Test that advance_to() jumps forward and then keeps the pace"""
+        with patch("time.monotonic", side_effect=[0.0, 1.0, 2.0]):
+            clock = ScaledClock(scale=2.0)
+            assert clock.advance_to(50.0) == 50.0  # now() was 2.0
+            assert clock.now() == 52.0
+
+    def test_invalid_scale_rejected(self):
+        """Test that a non-positive scale is refused"""
+        with pytest.raises(ValueError):
+            ScaledClock(scale=0)
+
+    def test_real_clocks_cannot_jump(self):
+        """Test that real-time clocks cannot skip time and are refused for lockstep runs"""
+        assert not isinstance(MonotonicClock(), SteppableClock)
+        assert isinstance(ScaledClock(), SteppableClock)
+        with pytest.raises(ValueError):
+            Simulator(clock=MonotonicClock(), lockstep=True)
+        with pytest.raises(RuntimeError):
+            Simulator(clock=MonotonicClock()).fast_forward()
+
+    def test_clock_is_abstract(self):
+        """Test that a clock must implement now() and sleep()"""
+        with pytest.raises(TypeError):
+            Clock()
+
+
+class TestClockInjection:
+    """Test cases for threading the clock through the components"""
+
+    def test_elevator_door_cycle_on_virtual_clock(self):
+        """Test a full door cycle driven purely by virtual time"""
+        clock = VirtualClock()
+        api = Mock(spec=ElevatorAPI)
+        elevator = Elevator(1, Mock(spec=Simulator), api, clock)
+
+        elevator.open_door()
+        clock.advance(elevator.door_operation_time + 0.01)
+        elevator.update()
+        assert elevator.door_state == DoorState.OPEN
+        api.send_door_opened_message.assert_called_once_with(1)
+
+        # The door must stay open until the timeout elapses in clock time
+        clock.advance(elevator.door_timeout - 0.1)
+        elevator.update()
+        assert elevator.door_state == DoorState.OPEN
+
+        clock.advance(0.2)
+        elevator.update()
+        assert elevator.door_state == DoorState.CLOSING
+
+    def test_dispatcher_stamps_calls_with_clock_time(self):
+        """Test that calls record their creation time from the dispatcher clock"""
+        clock = VirtualClock(start=50.0)
+        world = Mock()
+        world.elevators = []
+        dispatcher = Dispatcher(world, Mock(), clock)
+
+        call_id = dispatcher.add_outside_call(2, None)
+
+        assert dispatcher.pending_calls[call_id].created_at == 50.0
+
+    def test_simulator_shares_clock_with_components(self):
+        """Test that the simulator hands its clock to elevators and dispatcher"""
+        clock = VirtualClock()
+        simulator = Simulator(clock=clock)
+        simulator.set_api_and_initialize_components(Mock(spec=ElevatorAPI))
+
+        assert simulator.dispatcher.clock is clock
+        assert all(elevator.clock is clock for elevator in simulator.elevators)
+
+    def test_simulator_defaults_to_monotonic_clock(self):
+        """Test that the simulator uses a monotonic clock unless told otherwise"""
+        assert isinstance(Simulator().clock, MonotonicClock)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
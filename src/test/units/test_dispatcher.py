@@ -9,12 +9,15 @@ import pytest
 from unittest.mock import Mock, patch
 from backend.dispatcher import Dispatcher
 from backend.elevator import Elevator
+from backend.task_queue import HALL_DOWN, HALL_UP, TaskQueue
 from backend.models import (
+    BuildingConfig,
     ElevatorState,
     DoorState,
     MoveDirection,
     Task,
     Call,
+    CallIdAllocator,
     CallState,
     validate_floor,
     validate_elevator_id,
@@ -51,6 +54,42 @@ class TestDispatcherCallHandling:
                 except KeyError:
                     pytest.fail(f"Valid direction '{direction}' raised KeyError")
 
+    def test_repeated_presses_join_active_call(self):
+        """Test that pressing a lit hall button again folds into the pending call"""
+        with patch.object(self.dispatcher, "_process_pending_calls") as process:
+            first = self.dispatcher.add_call(2, "up")
+            second = self.dispatcher.add_call(2, "UP")
+            other = self.dispatcher.add_call(2, "down")
+
+        assert first == second != other
+        assert self.dispatcher.pending_calls[first].presses == 2
+        assert len(self.dispatcher.pending_calls) == 2
+        assert len(self.dispatcher.all_calls_log) == 2
+        assert process.call_count == 2  # The repeated press dispatches nothing
+
+    def test_completed_call_frees_hall_button(self):
+        """Test that a press after completion starts a new call"""
+        with patch.object(self.dispatcher, "_process_pending_calls"):
+            first = self.dispatcher.add_call(2, "up")
+            self.dispatcher.complete_call(first)
+            second = self.dispatcher.add_call(2, "up")
+
+        assert second != first
+        assert self.dispatcher.hall_calls == {(2, MoveDirection.UP): second}
+        assert self.dispatcher.all_calls_log[first].presses == 1
+
+    def test_call_ids_are_not_reused_after_reset(self):
+        """Test that call ids keep counting across a reset, as the call log is kept"""
+        dispatcher = Dispatcher(self.mock_world, self.mock_api, call_ids=CallIdAllocator(shard=2))
+        first = dispatcher.add_outside_call(2, MoveDirection.UP)
+        dispatcher.reset()
+        second = dispatcher.add_outside_call(2, MoveDirection.UP)
+
+        assert second > first
+        assert CallIdAllocator.split(second) == (0, 2, 2)
+        assert set(dispatcher.all_calls_log) == {first, second}
+
+
 class TestDispatcherPendingCallsProcessing:
     """Test cases for dispatcher pending calls processing (TC3-TC7)"""
 
@@ -85,6 +124,7 @@ class TestDispatcherPendingCallsProcessing:
         call = Call(floor=2, direction=MoveDirection.UP, call_id="test_call")
         call.state = CallState.PENDING
         self.dispatcher.pending_calls = {"test_call": call}
+        self.dispatcher.waiting = dict(self.dispatcher.pending_calls)
 
         with patch.object(self.dispatcher, "assign_task") as mock_assign:
             self.dispatcher._process_pending_calls()
@@ -106,18 +146,21 @@ class TestDispatcherPendingCallsProcessing:
             "assigned_call": call1,
             "completed_call": call2,
         }
+        self.dispatcher.waiting = dict(self.dispatcher.pending_calls)
 
         with patch.object(self.dispatcher, "assign_task") as mock_assign:
             self.dispatcher._process_pending_calls()
 
             # Should not assign any calls
             mock_assign.assert_not_called()
+        assert self.dispatcher.waiting == {}
 
     def test_process_pending_calls_with_suitable_elevators(self):
         """TC5: Test processing when suitable elevators are found"""
         call = Call(floor=2, direction=MoveDirection.UP, call_id="test_call")
         call.state = CallState.PENDING
         self.dispatcher.pending_calls = {"test_call": call}  # Changed to dict
+        self.dispatcher.waiting = dict(self.dispatcher.pending_calls)
 
         # Mock _can_elevator_serve_call to return True for both elevators
         with patch.object(
@@ -134,6 +177,7 @@ class TestDispatcherPendingCallsProcessing:
         call = Call(floor=2, direction=MoveDirection.UP, call_id="test_call")
         call.state = CallState.PENDING
         self.dispatcher.pending_calls = {"test_call": call}  # Changed to dict
+        self.dispatcher.waiting = dict(self.dispatcher.pending_calls)
 
         # Mock _can_elevator_serve_call to return False for all elevators
         with patch.object(
@@ -150,6 +194,7 @@ class TestDispatcherPendingCallsProcessing:
         call = Call(floor=2, direction=MoveDirection.UP, call_id="test_call")
         call.state = CallState.PENDING
         self.dispatcher.pending_calls = {"test_call": call}  # Changed to dict
+        self.dispatcher.waiting = dict(self.dispatcher.pending_calls)
 
         # Mock _can_elevator_serve_call to return True
         with patch.object(
@@ -162,6 +207,85 @@ class TestDispatcherPendingCallsProcessing:
                 mock_assign.assert_called_with(1, 2, "test_call")  # 0-based index
 
 
+    def test_update_idle_without_free_elevator(self):
+        """Test that waiting calls are not rescanned while no elevator is free"""
+        self.mock_elevator1.task_queue = [Task(floor=3)]
+        self.mock_elevator2.door_state = DoorState.OPEN
+        call_id = self.dispatcher.add_outside_call(2, MoveDirection.UP)
+
+        with patch.object(self.dispatcher, "_process_pending_calls") as process:
+            assert self.dispatcher.update() is False
+        process.assert_not_called()
+        assert call_id in self.dispatcher.waiting
+
+    def test_waiting_call_assigned_when_elevator_frees_up(self):
+        """Test that a deferred call is assigned by the update after a car becomes free"""
+        self.mock_elevator1.task_queue = [Task(floor=3)]
+        self.mock_elevator2.door_state = DoorState.OPEN
+        call_id = self.dispatcher.add_outside_call(2, MoveDirection.UP)
+        self.dispatcher.update()
+
+        self.mock_elevator2.door_state = DoorState.CLOSED
+        with patch.object(self.dispatcher, "assign_task") as mock_assign:
+            assert self.dispatcher.update() is True
+
+        mock_assign.assert_called_once_with(1, 2, call_id)
+        assert self.dispatcher.waiting == {}
+        assert call_id in self.dispatcher.pending_calls
+
+
+    def _two_waiting_calls(self):
+        """Calls at floors 2 (older) and 3 that both prefer elevator 1."""
+        eta = {1: {2: 1.0, 3: 1.0}, 2: {2: 2.0, 3: 100.0}}
+        for elevator in self.mock_world.elevators:
+            elevator.calculate_estimated_time.side_effect = (
+                lambda floor, direction, car=elevator.id: eta[car][floor]
+            )
+        with patch.object(self.dispatcher, "_process_pending_calls"):
+            return [self.dispatcher.add_call(floor, "up") for floor in (2, 3)]
+
+    def _queue_task(self, elevator_idx, floor, call_id):
+        """assign_task stand-in that only queues the stop."""
+        self.mock_world.elevators[elevator_idx].task_queue.append(Task(floor, call_id))
+
+    def test_greedy_assignment_serves_calls_in_order(self):
+        """Test that greedy dispatch gives the older call its best elevator"""
+        first, second = self._two_waiting_calls()
+
+        with patch.object(self.dispatcher, "assign_task", side_effect=self._queue_task) as mock_assign:
+            self.dispatcher._process_pending_calls()
+
+        assert mock_assign.call_args_list == [((0, 2, first),), ((1, 3, second),)]
+
+    def test_batch_assignment_minimizes_total_time(self):
+        """Test that batch dispatch matches calls to elevators for the lowest total ETA"""
+        pytest.importorskip("numpy")
+        first, second = self._two_waiting_calls()
+        self.dispatcher.batch_assignment = True
+
+        with patch.object(self.dispatcher, "assign_task", side_effect=self._queue_task) as mock_assign:
+            self.dispatcher._process_pending_calls()
+
+        assert mock_assign.call_args_list == [((1, 2, first),), ((0, 3, second),)]
+        assert self.dispatcher.waiting == {}
+        assert self.dispatcher.all_calls_log[first].assigned_elevator == 1
+
+    def test_batch_assignment_leaves_unmatched_calls_waiting(self):
+        """Test that calls beyond the number of free elevators keep waiting"""
+        pytest.importorskip("numpy")
+        self.dispatcher.batch_assignment = True
+        self.mock_elevator2.door_state = DoorState.OPEN
+        with patch.object(self.dispatcher, "_process_pending_calls"):
+            calls = [self.dispatcher.add_call(floor, "up") for floor in (2, 3)]
+
+        with patch.object(self.dispatcher, "assign_task") as mock_assign:
+            self.dispatcher._process_pending_calls()
+
+        assert mock_assign.call_count == 1
+        assert len(self.dispatcher.waiting) == 1
+        assert set(self.dispatcher.waiting) < set(calls)
+
+
 class TestDispatcherTaskAssignment:
     """Test cases for dispatcher task assignment (TC8-TC15)"""
 
@@ -264,6 +388,52 @@ class TestDispatcherTaskAssignment:
         # Should request movement
         self.mock_elevator.request_movement_if_needed.assert_called_once()
 
+    def test_assign_task_records_call_direction(self):
+        """Test that an outside call task carries the call direction into the hall stop index"""
+        call_id = self.dispatcher.add_outside_call(3, MoveDirection.DOWN)
+
+        self.dispatcher.assign_task(0, 3, call_id)
+
+        queue = self.mock_elevator.task_queue
+        assert isinstance(queue, TaskQueue)
+        assert queue[0].direction == MoveDirection.DOWN
+        assert queue.masks[HALL_DOWN] and not queue.masks[HALL_UP]
+        assert queue.has_call(call_id)
+
+    def test_call_index_follows_assign_and_complete(self):
+        """Test that the call index tracks the serving car and task until completion"""
+        call_id = self.dispatcher.add_outside_call(3, MoveDirection.UP)
+
+        self.dispatcher.assign_task(0, 3, call_id)
+
+        assignment = self.dispatcher.call_index[call_id]
+        assert assignment.elevator_idx == 0
+        assert assignment.task is self.mock_elevator.task_queue[0]
+        assert self.dispatcher.serving_elevator(call_id) == 0
+
+        assert self.dispatcher.complete_call(call_id) == MoveDirection.UP
+        assert call_id not in self.dispatcher.call_index
+        assert self.dispatcher.serving_elevator(call_id) is None
+        assert self.dispatcher.all_calls_log[call_id].is_completed()
+
+    def test_call_index_prevents_duplicate_assignment(self):
+        """Test that assigning an indexed call to the same car again adds nothing"""
+        call_id = self.dispatcher.add_outside_call(3, MoveDirection.UP)
+        self.dispatcher.assign_task(0, 3, call_id)
+
+        self.dispatcher.assign_task(0, 3, call_id)
+
+        assert len(self.mock_elevator.task_queue) == 1
+
+    def test_reset_clears_call_index(self):
+        """Test that reset drops every assignment"""
+        call_id = self.dispatcher.add_outside_call(3, MoveDirection.UP)
+        self.dispatcher.assign_task(0, 3, call_id)
+
+        self.dispatcher.reset()
+
+        assert self.dispatcher.call_index == {}
+
 
 class TestDispatcherTaskQueueOptimization:
     """Test cases for dispatcher task queue optimization (TC16-TC21)"""
@@ -435,6 +605,54 @@ class TestDispatcherElevatorServiceability:
         # Should accept inside calls even with existing tasks
         assert result is True
 
+    def _moving_up_to(self, floor, call_id=None):
+        """Put the elevator on its way up from floor 2 to a stop at `floor`."""
+        self.mock_elevator.state = ElevatorState.MOVING_UP
+        self.mock_elevator.direction = MoveDirection.UP
+        self.mock_elevator.task_queue = [Task(floor=floor, call_id=call_id)]
+
+    def test_en_route_pickup_takes_calls_ahead(self):
+        """Test that with en-route pickup a moving car takes same-direction calls ahead only"""
+        self._moving_up_to(5)
+        serve = self.dispatcher._can_elevator_serve_call
+
+        assert not serve(self.mock_elevator, 4, MoveDirection.UP)
+
+        self.dispatcher.en_route_pickup = True
+        assert serve(self.mock_elevator, 4, MoveDirection.UP)
+        assert serve(self.mock_elevator, 7, MoveDirection.UP)
+        assert not serve(self.mock_elevator, 4, MoveDirection.DOWN)
+        assert not serve(self.mock_elevator, 1, MoveDirection.UP)
+
+    def test_en_route_pickup_skips_opposite_hall_stop(self):
+        """Test that a car turning at a floor for a down call does not take an up call there"""
+        self.mock_world.elevators = []
+        down_call = self.dispatcher.add_outside_call(5, MoveDirection.DOWN)
+        self._moving_up_to(5, down_call)
+        self.dispatcher.en_route_pickup = True
+
+        assert not self.dispatcher._can_elevator_serve_call(self.mock_elevator, 5, MoveDirection.UP)
+        assert self.dispatcher._can_elevator_serve_call(self.mock_elevator, 4, MoveDirection.UP)
+
+    def test_en_route_pickup_wakes_update(self):
+        """Test that waiting calls are rescanned while a car is on its way under en-route pickup"""
+        self.mock_world.elevators = [self.mock_elevator]
+        self._moving_up_to(5)
+        self.dispatcher.add_outside_call(4, MoveDirection.UP)
+        assert self.dispatcher.update() is False
+
+        self.dispatcher.en_route_pickup = True
+        with patch.object(self.dispatcher, "assign_task") as mock_assign:
+            assert self.dispatcher.update() is True
+        mock_assign.assert_called_once()
+
+    def test_en_route_pickup_from_building_config(self):
+        """Test that the building configuration switches en-route pickup on"""
+        config = BuildingConfig(en_route_pickup=True)
+
+        assert Dispatcher(self.mock_world, self.mock_api, config=config).en_route_pickup
+        assert not self.dispatcher.en_route_pickup
+
 
 class TestDispatcherIntegration:
     """Integration tests for dispatcher functionality"""
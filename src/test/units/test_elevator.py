@@ -9,7 +9,7 @@ from unittest.mock import MagicMock, patch
 from typing import Optional
 
 from backend.elevator import Elevator
-from backend.models import ElevatorState, DoorState, MoveDirection, Task
+from backend.models import BuildingConfig, ElevatorState, DoorState, MoveDirection, Task
 
 
 class TestElevatorUpdate:
@@ -219,6 +219,60 @@ class TestElevatorUpdate:
             mock_request.assert_called_once()
 
 
+class TestElevatorNextDeadline:
+    """Test cases for Elevator.next_deadline() used by the event scheduler"""
+
+    def test_quiescent_elevator_has_no_deadline(self, mock_elevator):
+        """Test that an idle car with closed doors and no tasks never wakes up"""
+        elevator = mock_elevator
+        assert elevator.next_deadline() is None
+
+    def test_moving_deadline_is_floor_travel_end(self, mock_elevator):
+        """Test that a moving car wakes up when the current floor leg finishes"""
+        elevator = mock_elevator
+        elevator.state = ElevatorState.MOVING_UP
+        elevator.moving_since = 100.0
+        elevator.floor_travel_time = 2.0
+
+        assert elevator.next_deadline() == 102.0
+
+    def test_door_deadlines(self, mock_elevator):
+        """Test door operation and door timeout deadlines"""
+        elevator = mock_elevator
+        elevator.last_door_change = 100.0
+
+        elevator.door_state = DoorState.OPENING
+        assert elevator.next_deadline() == 100.0 + elevator.door_operation_time
+
+        elevator.door_state = DoorState.OPEN
+        assert elevator.next_deadline() == 100.0 + elevator.door_timeout
+
+    def test_arrival_delay_holds_door_deadline(self, mock_elevator):
+        """Test that the arrival delay is reported before any door event"""
+        elevator = mock_elevator
+        current_time = time.time()
+        elevator.arrival_time = current_time - 0.1
+        elevator.floor_arrival_announced = True
+        elevator.serviced_current_arrival = False
+
+        with patch("time.time", return_value=current_time):
+            deadline = elevator.next_deadline()
+
+        assert deadline == elevator.arrival_time + elevator.floor_arrival_delay
+
+    def test_update_at_deadline_fires_transition(self, mock_elevator):
+        """Test that update() exactly at the reported deadline performs the transition"""
+        elevator = mock_elevator
+        elevator.door_state = DoorState.OPENING
+        elevator.last_door_change = 100.0
+
+        deadline = elevator.next_deadline()
+        with patch("time.time", return_value=deadline):
+            elevator.update()
+
+        assert elevator.door_state == DoorState.OPEN
+
+
 class TestElevatorDirectionDetermination:
     """Test cases for Elevator._determine_direction() method covering TC41-TC50"""
 
@@ -329,6 +383,48 @@ class TestElevatorDirectionDetermination:
         assert elevator.direction is None
 
 
+class TestElevatorFloorTables:
+    """Test cases for floor arithmetic through the building floor tables"""
+
+    def test_closest_floor_counts_skipped_floor(self, mock_elevator):
+        """Test that -1 is one floor below 1, so it wins over 3"""
+        elevator = mock_elevator
+        elevator.current_floor = 1
+        elevator.task_queue = [Task(floor=3), Task(floor=-1)]
+
+        elevator._determine_direction()
+
+        assert elevator.direction == MoveDirection.DOWN
+
+    def test_floor_zero_is_a_valid_target_when_served(self):
+        """Test that a served floor 0 is considered when picking the closest stop"""
+        config = BuildingConfig(min_floor=0, max_floor=5, skipped_floors=[])
+        elevator = Elevator(1, MagicMock(), MagicMock(), config=config)
+        elevator.current_floor = 2
+        elevator.task_queue = [Task(floor=5), Task(floor=0)]
+
+        elevator._determine_direction()
+
+        assert elevator.direction == MoveDirection.DOWN
+
+    def test_estimate_across_skipped_floor(self, mock_elevator):
+        """Test that travel from -1 to 2 takes two floors, not three"""
+        elevator = mock_elevator
+        elevator.current_floor = -1
+        elevator.floor_travel_time = 2.0
+        elevator.door_operation_time = 1.0
+
+        assert elevator.calculate_estimated_time(2, None) == 2 * 2.0 + 1.0
+
+    def test_estimate_over_express_zone(self):
+        """Test that skipped express-zone floors do not count as travel"""
+        config = BuildingConfig(min_floor=1, max_floor=40, skipped_floors=range(2, 30))
+        elevator = Elevator(1, MagicMock(), MagicMock(), config=config)
+
+        assert elevator.calculate_estimated_time(30, None) == 1 * 2.0 + 1.0
+        assert config.next_floor(1, 1) == 30
+
+
 class TestElevatorTimeEstimation:
     """Test cases for Elevator.calculate_estimated_time() method covering TC51-TC57"""
 
@@ -611,19 +707,16 @@ class TestElevatorHelperMethods:
         elevator.task_queue = [Task(floor=3, call_id="test_call")]
         elevator.current_floor = 3
 
-        # Mock dispatcher methods
-        elevator.world.dispatcher.get_call_direction.return_value = MoveDirection.UP
-        elevator.world.dispatcher.complete_call.return_value = None
+        # Completing the call returns its direction
+        elevator.world.dispatcher.complete_call.return_value = MoveDirection.UP
 
         current_time = time.time()
         elevator._handle_arrival_at_target_floor(current_time)
 
         assert elevator.state == ElevatorState.IDLE
         assert elevator.last_state_change == current_time
-        elevator.world.dispatcher.get_call_direction.assert_called_once_with(
-            "test_call"
-        )
         elevator.world.dispatcher.complete_call.assert_called_once_with("test_call")
+        elevator.world.dispatcher.get_call_direction.assert_not_called()
         elevator.api.send_floor_arrived_message.assert_called_once_with(
             elevator.id, 3, MoveDirection.UP
         )
@@ -642,6 +735,18 @@ class TestElevatorHelperMethods:
             elevator.id, 3, MoveDirection.UP  # Direction determined from next task
         )
 
+    def test_service_arrival_serves_all_stops_at_floor(self, mock_elevator):
+        """Test that one door opening serves an inside stop and a hall call at the same floor"""
+        elevator = mock_elevator
+        elevator.task_queue = [Task(floor=3), Task(floor=3, call_id=7), Task(floor=5)]
+        elevator.current_floor = 3
+
+        elevator._service_current_arrival(time.time())
+
+        assert [task.floor for task in elevator.task_queue] == [5]
+        elevator.world.dispatcher.complete_call.assert_called_once_with(7)
+        assert elevator.door_state == DoorState.OPENING
+
     def test_request_movement_if_needed_with_tasks(self, mock_elevator):
         """Test request_movement_if_needed with tasks"""
         elevator = mock_elevator
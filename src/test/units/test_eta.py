@@ -0,0 +1,310 @@
+"""
+Unit tests for ETA estimation over elevator snapshots.
+
+Tests that snapshots are immutable copies of the car state, that the
+estimate is a pure function of the snapshot, that elevators memoize
+estimates per state version, and that the closed-form estimate and the
+vectorized ETA table equal the step-by-step reference simulation.
+"""
+
+import random
+import threading
+
+import pytest
+from unittest.mock import Mock
+
+from backend.elevator import ETA_CACHE_SIZE, Elevator
+from backend.eta import (
+    TABLE_DIRECTIONS,
+    ElevatorSnapshot,
+    estimate_table,
+    estimate_time,
+    insertion_delay,
+    simulate_time,
+    stop_profile,
+)
+from backend.models import BuildingConfig, DoorState, ElevatorState, MoveDirection, Task
+
+
+def random_snapshot(rng, elevator_id, config, max_stops=8):
+    # Include stops and cars outside the building, as the elevator accepts them
+    floors = config.floors + [config.min_floor - 2, config.max_floor + 3]
+    return ElevatorSnapshot(
+        elevator_id,
+        rng.choice(floors),
+        rng.choice(list(ElevatorState)),
+        rng.choice(list(DoorState)),
+        rng.choice([None, MoveDirection.UP, MoveDirection.DOWN]),
+        *stop_profile(rng.choice(floors) for _ in range(rng.randint(0, max_stops))),
+        rng.choice([2.0, 0.7]),
+        rng.choice([1.0, 0.4]),
+        config,
+    )
+
+
+CONFIGS = [
+    BuildingConfig(),
+    BuildingConfig(min_floor=-2, max_floor=20, skipped_floors=range(3, 10)),
+]
+
+
+@pytest.fixture
+def moving_elevator():
+    elevator = Elevator(1, Mock(), Mock())
+    elevator.current_floor = 1
+    elevator.state = ElevatorState.MOVING_UP
+    elevator.direction = MoveDirection.UP
+    elevator.task_queue = [Task(floor=3)]
+    return elevator
+
+
+class TestElevatorSnapshot:
+    """Test cases for ElevatorSnapshot"""
+
+    def test_snapshot_copies_state(self, moving_elevator):
+        """Test that the snapshot holds the car state and queue floors"""
+        snapshot = moving_elevator.snapshot()
+
+        assert snapshot.current_floor == 1
+        assert snapshot.state == ElevatorState.MOVING_UP
+        assert snapshot.stops == (3,)
+        assert snapshot.stops_below == (0, 1)
+        assert snapshot.floor_travel_time == moving_elevator.floor_travel_time
+
+    def test_snapshot_is_immutable(self, moving_elevator):
+        """Test that a snapshot cannot be modified"""
+        snapshot = moving_elevator.snapshot()
+
+        with pytest.raises(AttributeError):
+            snapshot.current_floor = 2
+
+    def test_snapshot_is_detached_from_elevator(self, moving_elevator):
+        """Test that later changes to the elevator do not affect a snapshot"""
+        snapshot = moving_elevator.snapshot()
+        before = estimate_time(snapshot, 2, MoveDirection.DOWN)
+
+        moving_elevator.current_floor = 3
+        moving_elevator.task_queue.append(Task(floor=-1))
+
+        assert snapshot.stops == (3,)
+        assert estimate_time(snapshot, 2, MoveDirection.DOWN) == before
+
+
+class TestEstimateTime:
+    """Test cases for estimate_time"""
+
+    def test_turnaround_after_sweep(self, moving_elevator):
+        """Test a call behind the car: serve floor 3, then come back down to 2"""
+        # 1 -> 3 (2 floors) + door, 3 -> 2 (1 floor) + door
+        expected = 2 * 2.0 + 1.0 + 1 * 2.0 + 1.0
+
+        assert estimate_time(moving_elevator.snapshot(), 2, MoveDirection.DOWN) == expected
+
+    def test_stop_on_the_way_in_call_direction(self, moving_elevator):
+        """Test that a stop the car makes anyway is reached in its sweep"""
+        assert estimate_time(moving_elevator.snapshot(), 3, MoveDirection.UP) == 2 * 2.0 + 1.0
+
+    def test_estimate_does_not_touch_elevator(self, moving_elevator):
+        """Test that calculate_estimated_time leaves the live elevator untouched"""
+        queue = moving_elevator.task_queue
+
+        moving_elevator.calculate_estimated_time(-1, None)
+
+        assert moving_elevator.task_queue is queue
+        assert moving_elevator.current_floor == 1
+        assert moving_elevator.state == ElevatorState.MOVING_UP
+
+    def test_open_door_at_floor(self):
+        """Test that a car at the floor with open doors needs no time"""
+        snapshot = ElevatorSnapshot(
+            1, 2, ElevatorState.IDLE, DoorState.OPEN, None, (), (0,), 2.0, 1.0,
+            Elevator(1, Mock(), Mock()).config,
+        )
+
+        assert estimate_time(snapshot, 2, MoveDirection.UP) == 0
+
+    @pytest.mark.parametrize("config", CONFIGS)
+    def test_matches_simulation(self, config):
+        """Test the closed form against the step-by-step simulation for random cars"""
+        rng = random.Random(3)
+        for _ in range(500):
+            snapshot = random_snapshot(rng, 1, config, max_stops=20)
+            for floor in config.floors + [config.max_floor + 3]:
+                for direction in (None, MoveDirection.UP, MoveDirection.DOWN):
+                    assert estimate_time(snapshot, floor, direction) == pytest.approx(
+                        simulate_time(snapshot, floor, direction)
+                    )
+
+    def test_duplicate_stops_each_cost_a_door_cycle(self):
+        """Test that two stops at one floor are served as two door cycles"""
+        config = BuildingConfig(min_floor=1, max_floor=10, skipped_floors=())
+        snapshot = ElevatorSnapshot(
+            1, 1, ElevatorState.MOVING_UP, DoorState.CLOSED, MoveDirection.UP,
+            *stop_profile([3, 3, 5]), 2.0, 1.0, config,
+        )
+
+        # 1 -> 3, door, door, 3 -> 5, door: reached on the way up
+        assert estimate_time(snapshot, 5, MoveDirection.UP) == 4 * 2.0 + 3 * 1.0
+
+
+class TestInsertionDelay:
+    """Test cases for insertion_delay"""
+
+    @pytest.fixture
+    def snapshot(self, moving_elevator):
+        moving_elevator.task_queue.append(Task(floor=6))
+        return moving_elevator.snapshot()  # At 1, moving up, stops at 3 and 6
+
+    def test_stop_ahead_delays_later_stops(self, snapshot):
+        """Test that a new stop in the sweep delays only the stops after it"""
+        assert insertion_delay(snapshot, 2) == 2 * 1.0
+        assert insertion_delay(snapshot, 4) == 1 * 1.0
+        assert insertion_delay(snapshot, 7) == 0
+
+    def test_stop_behind_is_served_after_the_sweep(self, snapshot):
+        """Test that a stop behind the car delays nothing"""
+        assert insertion_delay(snapshot, 0) == 0
+
+    def test_existing_stop_adds_no_delay(self, snapshot):
+        """Test that a floor the car stops at anyway costs no extra door cycle"""
+        assert insertion_delay(snapshot, 3) == 0
+
+    def test_idle_car_delays_all_stops(self, moving_elevator):
+        """Test that an idle car going to the new stop first delays every queued stop"""
+        moving_elevator.state = ElevatorState.IDLE
+        moving_elevator.task_queue.append(Task(floor=6))
+
+        assert insertion_delay(moving_elevator.snapshot(), 5) == 2 * 1.0
+
+    def test_empty_queue(self, moving_elevator):
+        """Test that a car without stops has nothing to delay"""
+        moving_elevator.task_queue = []
+
+        assert insertion_delay(moving_elevator.snapshot(), 5) == 0
+
+
+class TestEtaCache:
+    """Test cases for the per-elevator ETA memo"""
+
+    def test_unchanged_car_hits_cache(self, moving_elevator):
+        """Test that a repeated estimate over an unchanged car is a cache hit"""
+        first = moving_elevator.calculate_estimated_time(2, MoveDirection.DOWN)
+        second = moving_elevator.calculate_estimated_time(2, MoveDirection.DOWN)
+
+        stats = moving_elevator.eta_stats
+        assert first == second
+        assert (stats.hits, stats.misses) == (1, 1)
+        assert stats.hit_rate == 0.5
+        assert stats.eval_time > 0
+
+    @pytest.mark.parametrize("mutate", [
+        lambda e: setattr(e, "current_floor", 2),
+        lambda e: setattr(e, "state", ElevatorState.IDLE),
+        lambda e: setattr(e, "door_state", DoorState.OPENING),
+        lambda e: setattr(e, "direction", MoveDirection.DOWN),
+        lambda e: e.task_queue.append(Task(floor=-1)),
+        lambda e: e.task_queue.pop(0),
+        lambda e: setattr(e, "task_queue", [Task(floor=-1)]),
+    ])
+    def test_mutation_invalidates_cache(self, moving_elevator, mutate):
+        """Test that every kind of state change bumps the version and recomputes"""
+        moving_elevator.calculate_estimated_time(2, MoveDirection.DOWN)
+        version = moving_elevator.state_version
+
+        mutate(moving_elevator)
+        eta = moving_elevator.calculate_estimated_time(2, MoveDirection.DOWN)
+
+        assert moving_elevator.state_version > version
+        assert moving_elevator.eta_stats.misses == 2
+        assert eta == estimate_time(moving_elevator.snapshot(), 2, MoveDirection.DOWN)
+
+    def test_unchanged_assignment_keeps_cache(self, moving_elevator):
+        """Test that assigning the current value is not a state change"""
+        moving_elevator.calculate_estimated_time(2, MoveDirection.DOWN)
+        version = moving_elevator.state_version
+
+        moving_elevator.current_floor = moving_elevator.current_floor
+        moving_elevator.state = moving_elevator.state
+        moving_elevator.calculate_estimated_time(2, MoveDirection.DOWN)
+
+        assert moving_elevator.state_version == version
+        assert moving_elevator.eta_stats.hits == 1
+
+    def test_memo_is_bounded(self, moving_elevator):
+        """Test that the memo never holds more than ETA_CACHE_SIZE estimates, dropping the oldest"""
+        for floor in range(ETA_CACHE_SIZE + 10):
+            moving_elevator.calculate_estimated_time(floor, None)
+
+        memo = moving_elevator._eta_memo
+        version = moving_elevator.state_version
+        assert len(memo) == ETA_CACHE_SIZE
+        assert (version, 9, None) not in memo and (version, 10, None) in memo
+
+    def test_estimate_of_older_state_not_returned(self, moving_elevator):
+        """Test that an estimate stored late for an older state version is never a hit"""
+        version = moving_elevator.state_version
+        moving_elevator.current_floor = 2
+        # Finished by the other thread after the car moved on
+        moving_elevator._eta_memo[(version, 3, None)] = -1.0
+
+        eta = moving_elevator.calculate_estimated_time(3, None)
+
+        assert eta == estimate_time(moving_elevator.snapshot(), 3, None)
+        assert moving_elevator.eta_stats.hits == 0
+
+    def test_concurrent_estimates(self, moving_elevator):
+        """Test that estimates from two threads while the car moves neither fail nor go stale"""
+        errors = []
+
+        def estimate():
+            try:
+                for floor in range(2 * ETA_CACHE_SIZE):
+                    moving_elevator.calculate_estimated_time(floor % 40, None)
+            except Exception as error:  # Reported by the main thread
+                errors.append(error)
+
+        threads = [threading.Thread(target=estimate) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for floor in range(2, 200):
+            moving_elevator.current_floor = floor
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert moving_elevator.calculate_estimated_time(5, None) == estimate_time(
+            moving_elevator.snapshot(), 5, None
+        )
+
+
+class TestEstimateTable:
+    """Test cases for the vectorized estimate_table"""
+
+    @pytest.mark.parametrize("config", CONFIGS)
+    def test_table_matches_simulation(self, config):
+        """Test the table against the step-by-step simulation for random fleets"""
+        pytest.importorskip("numpy")
+        rng = random.Random(5)
+        for _ in range(200):
+            snapshots = [
+                random_snapshot(rng, i, config) for i in range(1, rng.randint(2, 5))
+            ]
+
+            table = estimate_table(snapshots, config.floors)
+
+            for c, snapshot in enumerate(snapshots):
+                for j, floor in enumerate(config.floors):
+                    for d, direction in enumerate(TABLE_DIRECTIONS):
+                        assert table[c, j, d] == pytest.approx(
+                            simulate_time(snapshot, floor, direction)
+                        )
+
+    def test_empty_fleet(self):
+        """Test that a building without cars gives an empty table"""
+        pytest.importorskip("numpy")
+
+        assert estimate_table([], [1, 2, 3]).shape == (0, 3, 2)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,212 @@
+"""
+Unit tests for the vectorized fleet engine.
+
+Tests that FleetElevator views read and write the engine arrays and that the
+vectorized update produces the same states and per-car messages as the
+scalar Elevator.update() loop.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+np = pytest.importorskip("numpy")
+
+from backend.clock import VirtualClock
+from backend.dispatcher import Dispatcher
+from backend.elevator import Elevator
+from backend.fleet import FleetEngine, FleetElevator
+from backend.models import BuildingConfig, DoorState, ElevatorState, MoveDirection, Task
+from backend.simulator import Simulator
+from backend.api.core import ElevatorAPI
+
+
+def _fleet(size, clock=None, config=None):
+    clock = clock or VirtualClock()
+    world = Mock(spec=Simulator)
+    world.dispatcher = Mock()
+    api = Mock(spec=ElevatorAPI)
+    fleet = FleetEngine(size, clock, config)
+    fleet.create_elevators(list(range(1, size + 1)), world, api)
+    return fleet, clock, api
+
+
+class TestFleetElevatorView:
+    """Test cases for the array-backed Elevator view"""
+
+    def test_view_defaults_match_elevator(self):
+        """Test that a fresh view reports the same state as a fresh Elevator"""
+        fleet, clock, api = _fleet(1)
+        view = fleet.elevators[0]
+        plain = Elevator(1, Mock(), api, clock)
+
+        for name in (
+            "current_floor", "state", "door_state", "direction", "moving_since",
+            "arrival_time", "door_timeout", "floor_travel_time", "door_operation_time",
+        ):
+            assert getattr(view, name) == getattr(plain, name)
+        assert isinstance(view, Elevator)
+
+    def test_view_writes_through_to_arrays(self):
+        """Test that attribute assignment lands in the engine arrays"""
+        fleet, _, _ = _fleet(2)
+        view = fleet.elevators[1]
+
+        view.current_floor = 3
+        view.state = ElevatorState.MOVING_DOWN
+        view.door_state = DoorState.OPEN
+        view.direction = MoveDirection.DOWN
+        view.moving_since = 4.0
+
+        assert fleet.current_floor.tolist() == [1, 3]
+        assert view.state == ElevatorState.MOVING_DOWN
+        assert view.door_state == DoorState.OPEN
+        assert view.direction == MoveDirection.DOWN
+        assert view.moving_since == 4.0
+        view.moving_since = None
+        assert view.moving_since is None
+
+    def test_views_work_with_dispatcher(self):
+        """Test that the dispatcher can assign work to fleet views"""
+        fleet, _, api = _fleet(2)
+        world = Mock()
+        world.elevators = fleet.elevators
+        dispatcher = Dispatcher(world, api, fleet.clock)
+
+        dispatcher.add_call(3, "up")
+
+        assert [task.floor for task in fleet.elevators[0].task_queue] == [3]
+        assert fleet.elevators[0].state == ElevatorState.MOVING_UP
+
+
+class TestFleetEngineUpdate:
+    """Test cases for the vectorized update step"""
+
+    def test_all_moving_cars_advance_in_one_step(self):
+        """Test that every moving car changes floor in a single update, skipping floor 0"""
+        fleet, clock, _ = _fleet(64)
+        for view in fleet.elevators[:32]:
+            view.task_queue = [Task(floor=3)]
+            view.request_movement_if_needed()
+        for view in fleet.elevators[32:]:
+            view.task_queue = [Task(floor=-1)]
+            view.request_movement_if_needed()
+
+        clock.advance(fleet.elevators[0].floor_travel_time)
+        fleet.update()
+
+        assert fleet.current_floor[:32].tolist() == [2] * 32
+        assert fleet.current_floor[32:].tolist() == [-1] * 32
+        assert fleet.floor_changed.all()
+
+    def test_vectorized_moves_bump_state_versions(self):
+        """Test that floor steps made in the arrays invalidate the cars' ETA memos"""
+        fleet, clock, _ = _fleet(2)
+        moving = fleet.elevators[0]
+        moving.task_queue = [Task(floor=3)]
+        moving.request_movement_if_needed()
+        versions = [view.state_version for view in fleet.elevators]
+
+        clock.advance(moving.floor_travel_time)
+        fleet.update()
+
+        assert moving.state_version > versions[0]
+        assert fleet.elevators[1].state_version == versions[1]
+
+    def test_moving_cars_use_floor_tables(self):
+        """Test that the vectorized floor step jumps over an express zone"""
+        config = BuildingConfig(min_floor=1, max_floor=40, skipped_floors=range(2, 30))
+        fleet, clock, _ = _fleet(2, config=config)
+        fleet.elevators[0].task_queue = [Task(floor=35)]
+        fleet.elevators[0].request_movement_if_needed()
+        fleet.elevators[1].current_floor = 30
+        fleet.elevators[1].task_queue = [Task(floor=1)]
+        fleet.elevators[1].request_movement_if_needed()
+
+        clock.advance(2.0)
+        fleet.update()
+
+        assert fleet.current_floor.tolist() == [30, 1]
+
+    def test_update_can_be_limited_to_slots(self):
+        """Test that only the requested cars are advanced"""
+        fleet, clock, api = _fleet(3)
+        for view in fleet.elevators:
+            view.open_door()
+
+        clock.advance(1.0)
+        fleet.update([0, 2])
+
+        assert [view.door_state for view in fleet.elevators] == [
+            DoorState.OPEN, DoorState.OPENING, DoorState.OPEN,
+        ]
+        assert [c.args for c in api.send_door_opened_message.call_args_list] == [(1,), (3,)]
+
+    def test_next_deadlines_match_scalar(self):
+        """Test that the vectorized deadlines equal each view's next_deadline()"""
+        fleet, clock, _ = _fleet(4)
+        fleet.elevators[0].open_door()
+        fleet.elevators[1].task_queue = [Task(floor=3)]
+        fleet.elevators[1].request_movement_if_needed()
+        fleet.elevators[2].task_queue = [Task(floor=2)]
+        fleet.elevators[3].task_queue = [Task(floor=1)]  # Nowhere to depart to
+        clock.advance(0.2)
+
+        expected = [view.next_deadline() for view in fleet.elevators]
+        actual = [None if d == float("inf") else d for d in fleet.next_deadlines().tolist()]
+
+        assert actual == expected
+        assert expected[3] is None
+
+    def test_missing_numpy_is_reported(self, monkeypatch):
+        """Test that the engine refuses to start without NumPy"""
+        import backend.fleet as fleet_module
+
+        monkeypatch.setattr(fleet_module, "np", None)
+        with pytest.raises(ImportError):
+            FleetEngine(2, VirtualClock())
+
+
+class TestVectorizedSimulator:
+    """Test cases for Simulator(vectorized=True)"""
+
+    def _run(self, api, vectorized):
+        world = Simulator(lockstep=True, vectorized=vectorized)
+        world.set_api_and_initialize_components(api)
+        api.world = world
+        for command in (
+            "call_up@-1", "step@1500", "call_down@3", "select_floor@2#2",
+            "step@6000", "select_floor@3#1", "step@20000",
+        ):
+            api._parse_and_execute(command)
+        states = [(e.current_floor, e.state, e.door_state) for e in world.elevators]
+        messages = [c.args[0] for c in api.zmq_client.send_msg.call_args_list]
+        api.zmq_client.send_msg.reset_mock()
+        return world, states, messages
+
+    def test_matches_scalar_engine(self, api_without_zmq):
+        """Test that the vectorized engine reaches the same states with the same per-car messages"""
+        _, scalar_states, scalar_messages = self._run(api_without_zmq, vectorized=False)
+        world, states, messages = self._run(api_without_zmq, vectorized=True)
+
+        assert all(isinstance(e, FleetElevator) for e in world.elevators)
+        assert states == scalar_states
+        for car in ("#1", "#2"):
+            assert [m for m in messages if m.endswith(car)] == [
+                m for m in scalar_messages if m.endswith(car)
+            ]
+
+    def test_fetch_states_reports_plain_values(self, api_without_zmq):
+        """Test that fetch_states serializes fleet views like ordinary elevators"""
+        world = Simulator(vectorized=True)
+        world.set_api_and_initialize_components(api_without_zmq)
+        api_without_zmq.world = world
+
+        states = api_without_zmq.fetch_states()
+
+        assert states[0]["floor"] == 1
+        assert type(states[0]["floor"]) is int
+        assert states[0]["state"] == "IDLE"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
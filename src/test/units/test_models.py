@@ -5,14 +5,22 @@ Tests the data models including Call, Task, validation functions,
 and model behavior as specified in validation documentation (TC93-TC111).
 """
 
+import copy
+import json
+import pickle
+import threading
 import pytest
 from backend.models import (
+    BuildingConfig,
     Call,
+    CallIdAllocator,
     CallState,
     Task,
     ElevatorState,
     DoorState,
     MoveDirection,
+    MoveRequest,
+    Zone,
     validate_floor,
     validate_elevator_id,
     validate_direction,
@@ -95,6 +103,56 @@ class TestCallModel:
         assert call.is_completed() is False
 
 
+class TestCallIdAllocator:
+    """Test cases for call id allocation"""
+
+    def test_ids_are_increasing_ints(self):
+        """Test that an unprefixed allocator counts up from 1"""
+        ids = CallIdAllocator()
+
+        assert [ids.next_id() for _ in range(3)] == [1, 2, 3]
+
+    def test_prefixes_keep_allocators_apart(self):
+        """Test that allocators with distinct prefixes never issue the same id"""
+        allocators = [CallIdAllocator(), CallIdAllocator(shard=1), CallIdAllocator(process=1)]
+
+        issued = [a.next_id() for a in allocators for _ in range(100)]
+
+        assert len(set(issued)) == len(issued)
+        assert CallIdAllocator.split(CallIdAllocator(process=7, shard=3).next_id()) == (7, 3, 1)
+
+    def test_threads_never_share_an_id(self):
+        """Test that ids handed out concurrently from several threads are distinct"""
+        ids = CallIdAllocator()
+        issued = []
+
+        def allocate():
+            issued.extend(ids.next_id() for _ in range(10000))
+
+        threads = [threading.Thread(target=allocate) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(issued) == list(range(1, 40001))
+
+    def test_copies_continue_the_sequence(self):
+        """Test that copied and unpickled allocators continue on their own"""
+        ids = CallIdAllocator(shard=1)
+        ids.next_id()
+
+        for twin in (copy.copy(ids), pickle.loads(pickle.dumps(ids))):
+            assert CallIdAllocator.split(twin.next_id()) == (0, 1, 2)
+        assert CallIdAllocator.split(ids.next_id()) == (0, 1, 2)
+
+    @pytest.mark.parametrize("options", [{"process": -1}, {"shard": -1}, {"shard": 1 << 12}])
+    def test_invalid_prefix_rejected(self, options):
+        """Test that prefixes outside their bit fields raise ValueError"""
+        with pytest.raises(ValueError):
+            CallIdAllocator(**options)
+
+
 class TestTaskModel:
     """Test cases for Task model (TC101-TC102)"""
 
@@ -110,6 +168,17 @@ class TestTaskModel:
 
         assert task.is_outside_call is False
 
+    def test_models_have_no_instance_dict(self):
+        """Test that the high-volume models are slotted (no per-instance __dict__)"""
+        for instance in (
+            Task(floor=3),
+            Call("call_1", 2, MoveDirection.UP, 0.0),
+            MoveRequest(1, MoveDirection.DOWN),
+        ):
+            assert not hasattr(instance, "__dict__")
+            with pytest.raises(AttributeError):
+                instance.unexpected = 1
+
 
 class TestFloorValidation:
     """Test cases for floor validation (TC103-TC105)"""
@@ -135,6 +204,144 @@ class TestFloorValidation:
         """TC105: Test validate_floor returns False for floor above maximum"""
         assert validate_floor(MAX_FLOOR + 1) is False
 
+    def test_validate_floor_rejects_skipped_floor(self):
+        """Test that floor 0, which the building does not have, is invalid"""
+        assert validate_floor(0) is False
+
+    def test_validate_floor_with_custom_building(self):
+        """Test validation against a given building configuration"""
+        config = BuildingConfig(min_floor=1, max_floor=50, skipped_floors=[13])
+
+        assert validate_floor(50, config) is True
+        assert validate_floor(13, config) is False
+        assert validate_floor(-1, config) is False
+
+
+class TestBuildingConfig:
+    """Test cases for BuildingConfig"""
+
+    def test_defaults_match_original_building(self):
+        """Test that the default configuration is floors -1..3 without 0 and two cars"""
+        config = BuildingConfig()
+
+        assert config.floors == [-1, 1, 2, 3]
+        assert config.elevator_ids == [1, 2]
+        assert config.timing_for(1)["floor_travel_time"] == 2.0
+        assert config.dispatch_strategy == "idle-eta"
+
+    def test_next_floor_skips_missing_floors(self):
+        """Test that moving one floor jumps over skipped floors"""
+        config = BuildingConfig(min_floor=-2, max_floor=20, skipped_floors=[0, 13, 14])
+
+        assert config.next_floor(-1, 1) == 1
+        assert config.next_floor(12, 1) == 15
+        assert config.next_floor(15, -1) == 12
+
+    def test_floor_index_tables(self):
+        """Test label/index tables and distances across the skipped floor 0"""
+        config = BuildingConfig()
+
+        assert config.floor_index == {-1: 0, 1: 1, 2: 2, 3: 3}
+        assert config.distance(-1, 1) == 1
+        assert config.distance(3, -1) == 3
+        assert config.next_floor(1, -1) == -1
+
+    @pytest.mark.parametrize(
+        "options, home",
+        [
+            ({}, 1),
+            ({"min_floor": 2, "max_floor": 10}, 2),
+            ({"min_floor": -5, "max_floor": -1}, -1),
+            ({"min_floor": -2, "max_floor": 5, "skipped_floors": [1]}, 0),
+        ],
+    )
+    def test_home_floor_is_served(self, options, home):
+        """Test that cars start at floor 1, or the served floor nearest it"""
+        config = BuildingConfig(**options)
+
+        assert config.home_floor == home
+        assert config.is_valid_floor(config.home_floor)
+
+    def test_distance_outside_building_uses_labels(self):
+        """Test that labels beyond the building continue one index per floor"""
+        config = BuildingConfig()
+
+        assert config.distance(3, 5) == 2
+        assert config.distance(-1, 5) == 5
+        assert config.next_floor(3, 1) == 4
+
+    def test_per_car_timing_overrides(self):
+        """Test that car_timing overrides the shared timing for one car only"""
+        config = BuildingConfig(
+            num_elevators=3,
+            timing={"door_timeout": 5.0},
+            car_timing={3: {"floor_travel_time": 1.0}},
+        )
+
+        assert config.timing_for(1)["door_timeout"] == 5.0
+        assert config.timing_for(1)["floor_travel_time"] == 2.0
+        assert config.timing_for(3)["floor_travel_time"] == 1.0
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"min_floor": 3, "max_floor": 1},
+            {"num_elevators": 0},
+            {"skipped_floors": [3]},
+            {"timing": {"door_timeout": 0}},
+            {"timing": {"speed": 1.0}},
+            {"car_timing": {5: {"door_timeout": 1.0}}},
+            {"dispatch_strategy": ""},
+            {"en_route_pickup": "yes"},
+            {"zones": []},
+            {"zones": [{"floors": [-1, 3]}]},
+            {"zones": [{"floors": [0, 3], "elevators": [1, 2]}]},
+            {"zones": [{"floors": [-1, 1], "elevators": [1, 2]}]},
+            {"zones": [{"floors": [-1, 3], "elevators": [1]}]},
+            {"zones": [{"floors": [-1, 1], "elevators": [1, 2]}, {"floors": [1, 3], "elevators": [2]}]},
+        ],
+    )
+    def test_invalid_configuration_rejected(self, options):
+        """Test that inconsistent configurations raise ValueError"""
+        with pytest.raises(ValueError):
+            BuildingConfig(**options)
+
+    def test_load_from_file(self, tmp_path):
+        """Test loading a JSON building file, including string car ids"""
+        path = tmp_path / "building.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "min_floor": 1,
+                    "max_floor": 10,
+                    "skipped_floors": [],
+                    "num_elevators": 4,
+                    "car_timing": {"4": {"door_timeout": 1.5}},
+                    "dispatch_strategy": "collective",
+                    "en_route_pickup": True,
+                    "zones": [
+                        {"floors": [1, 6], "elevators": [1, 2]},
+                        {"floors": [6, 10], "elevators": [3, 4]},
+                    ],
+                }
+            )
+        )
+
+        config = BuildingConfig.from_file(str(path))
+
+        assert config.floors == list(range(1, 11))
+        assert config.timing_for(4)["door_timeout"] == 1.5
+        assert config.dispatch_strategy == "collective"
+        assert config.en_route_pickup is True
+        assert config.zones[1] == Zone(6, 10, (3, 4))
+        assert config.zones[1].covers(6) and not config.zones[1].covers(5)
+        assert BuildingConfig.from_dict(config.to_dict()).to_dict() == config.to_dict()
+
+    def test_unknown_option_rejected(self):
+        """Test that typos in a building file are reported"""
+        with pytest.raises(ValueError):
+            BuildingConfig.from_dict({"max_floors": 10})
+
 
 class TestElevatorIdValidation:
     """Test cases for elevator ID validation (TC106-TC108)"""
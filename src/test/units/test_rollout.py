@@ -0,0 +1,249 @@
+"""
+Unit tests for simulator clones and lookahead rollout dispatch.
+
+Tests that Simulator.clone() gives a detached copy that evolves exactly like
+the original and survives pickling, that rollout_cost() scores assignments
+by the resulting waits, and that the RolloutPlanner and the dispatcher keep
+to the decision budget.
+"""
+
+import pickle
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from unittest.mock import Mock
+
+from backend.api.core import ElevatorAPI
+from backend.api.null import NullAPI
+from backend.clock import VirtualClock
+from backend.elevator import Elevator
+from backend.models import BuildingConfig, CallState
+from backend.rollout import RolloutPlanner, rollout_cost
+from backend.simulator import Simulator
+from .conftest import StubPool
+
+CONFIG = BuildingConfig(min_floor=1, max_floor=10, num_elevators=3)
+
+
+def busy_simulator(**options):
+    """Lockstep simulator with cars on their way and hall calls open."""
+    simulator = Simulator(clock=VirtualClock(), lockstep=True, config=CONFIG, **options)
+    simulator.set_api_and_initialize_components(Mock(spec=ElevatorAPI))
+    dispatcher = simulator.dispatcher
+    dispatcher.assign_task(0, 9)
+    dispatcher.add_call(7, "down")
+    dispatcher.add_call(3, "up")
+    simulator.step(3.0)
+    dispatcher.assign_task(1, 6)
+    return simulator
+
+
+def car_states(simulator):
+    return [
+        (car.current_floor, car.state, car.door_state, car.direction, [task.floor for task in car.task_queue])
+        for car in simulator.elevators
+    ]
+
+
+class TestSimulatorClone:
+    """Test cases for Simulator.clone"""
+
+    def test_clone_is_detached(self):
+        """Test that running the clone leaves the original simulator untouched"""
+        simulator = busy_simulator()
+        before = car_states(simulator)
+        calls = {call_id: call.state for call_id, call in simulator.dispatcher.pending_calls.items()}
+        messages = list(simulator.api.mock_calls)
+
+        clone = simulator.clone()
+        clone.dispatcher.add_call(2, "up")
+        clone.step(60.0)
+
+        assert isinstance(clone.api, NullAPI)
+        assert simulator.clock.now() == 3.0
+        assert car_states(simulator) == before
+        assert {call_id: call.state for call_id, call in simulator.dispatcher.pending_calls.items()} == calls
+        assert simulator.api.mock_calls == messages  # The clone's messages went nowhere
+
+    def test_clone_has_every_simulator_field(self, capsys):
+        """Test that a clone is built through __init__, without the start-up message"""
+        simulator = busy_simulator()
+        capsys.readouterr()
+
+        clone = simulator.clone()
+
+        assert vars(clone).keys() == vars(simulator).keys()
+        assert capsys.readouterr().out == ""
+
+    def test_clone_evolves_like_original(self):
+        """Test that the clone sends the same messages as the original over the same run"""
+        simulator = busy_simulator()
+        clone = simulator.clone(api=Mock(spec=ElevatorAPI))
+        simulator.api.reset_mock()
+
+        for sim in (simulator, clone):
+            sim.step(20.0)
+            sim.dispatcher.add_call(5, "down")
+            sim.step(60.0)
+
+        assert clone.api.mock_calls == simulator.api.mock_calls
+        assert car_states(clone) == car_states(simulator)
+
+    def test_clone_of_vectorized_simulator(self):
+        """Test that a fleet simulator is cloned into plain elevators with the same state"""
+        pytest.importorskip("numpy")
+        simulator = busy_simulator(vectorized=True)
+
+        clone = simulator.clone()
+
+        assert clone.fleet is None
+        assert all(type(car) is Elevator for car in clone.elevators)
+        assert car_states(clone) == car_states(simulator)
+
+    def test_pickled_clone_runs(self):
+        """Test that a clone sent through pickle runs like the clone itself"""
+        clone = busy_simulator().clone()
+        copy = pickle.loads(pickle.dumps(clone))
+
+        for sim in (clone, copy):
+            sim.step(60.0)
+
+        assert car_states(copy) == car_states(clone)
+        assert copy.dispatcher.pending_calls.keys() == clone.dispatcher.pending_calls.keys()
+
+
+class TestRolloutCost:
+    """Test cases for rollout_cost"""
+
+    def test_nearer_car_costs_less(self):
+        """Test that sending the idle car next to the call beats the one far away"""
+        simulator = Simulator(clock=VirtualClock(), lockstep=True, config=CONFIG)
+        simulator.set_api_and_initialize_components(Mock(spec=ElevatorAPI))
+        simulator.elevators[2].current_floor = 9
+        call_id = simulator.dispatcher.add_outside_call(8, None)
+
+        near = rollout_cost(simulator.clone(), call_id, 2)
+        far = rollout_cost(simulator.clone(), call_id, 0)
+
+        assert near < far
+        # 9 -> 8 (one floor), then the call completes after the arrival delay
+        timing = CONFIG.timing
+        assert near == pytest.approx(timing["floor_travel_time"] + timing["floor_arrival_delay"])
+        assert simulator.dispatcher.pending_calls[call_id].state == CallState.PENDING
+
+    def test_deadline_stops_rollout(self):
+        """Test that a rollout still running at its wall-clock deadline gives no cost"""
+        simulator = busy_simulator()
+        call_id = simulator.dispatcher.add_outside_call(8, None)
+
+        assert rollout_cost(simulator.clone(), call_id, 2, deadline=time.perf_counter()) is None
+        assert rollout_cost(simulator.clone(), call_id, 2, deadline=time.perf_counter() + 10.0) > 0
+
+
+class TestRolloutPlanner:
+    """Test cases for RolloutPlanner and the dispatcher's rollout mode"""
+
+    def _waiting_call(self):
+        simulator = Simulator(clock=VirtualClock(), lockstep=True, config=CONFIG)
+        simulator.set_api_and_initialize_components(Mock(spec=ElevatorAPI))
+        simulator.elevators[2].current_floor = 9
+        return simulator, simulator.dispatcher.add_outside_call(8, None)
+
+    def test_chooses_lowest_cost_in_process(self):
+        """Test that the in-process planner picks the candidate with the lowest rollout cost"""
+        simulator, call_id = self._waiting_call()
+        planner = RolloutPlanner(budget=10.0, workers=0)
+
+        assert planner.choose(simulator, call_id, [0, 1, 2]) == 2
+        assert (planner.decisions, planner.timeouts) == (1, 0)
+
+    def test_pool_matches_in_process(self):
+        """Test that rollouts in worker processes reach the same decision"""
+        simulator, call_id = self._waiting_call()
+        planner = RolloutPlanner(budget=10.0, workers=1)
+        planner.start()
+        try:
+            assert planner.choose(simulator, call_id, [0, 1, 2]) == 2
+        finally:
+            planner.close()
+
+    def test_exhausted_budget_keeps_strategy_choice(self):
+        """Test that the dispatcher keeps its own choice when no rollout fits the budget"""
+        simulator = Simulator(clock=VirtualClock(), lockstep=True, config=CONFIG)
+        simulator.set_api_and_initialize_components(Mock(spec=ElevatorAPI))
+        planner = RolloutPlanner(budget=0.0, workers=0)
+        simulator.dispatcher.rollout = planner
+
+        call_id = simulator.dispatcher.add_call(3, "up")
+
+        assert (planner.decisions, planner.timeouts) == (1, 1)
+        assert simulator.dispatcher.all_calls_log[call_id].assigned_elevator == 0
+
+    def test_failed_rollouts_count_as_unfinished(self):
+        """Test that a rollout failing in its worker is dropped like one over budget"""
+        simulator, call_id = self._waiting_call()
+        planner = RolloutPlanner(budget=10.0, workers=1)
+        planner._pool = pool = StubPool(ValueError("boom"))
+
+        assert planner.choose(simulator, call_id, [0, 1, 2]) is None
+        assert (planner.decisions, planner.timeouts) == (1, 1)
+        assert planner._pool is pool
+
+    def test_broken_pool_keeps_strategy_choice(self):
+        """Test that a dead worker drops the pool and later decisions keep the strategy's choice"""
+        simulator, call_id = self._waiting_call()
+        planner = RolloutPlanner(budget=10.0, workers=1)
+        planner._pool = StubPool(BrokenProcessPool("worker died"))
+
+        assert planner.choose(simulator, call_id, [0, 1, 2]) is None
+        assert planner._pool is None
+        assert planner.choose(simulator, call_id, [0, 1, 2]) is None  # Not restarted mid-run
+        assert planner._pool is None
+        assert (planner.decisions, planner.timeouts) == (2, 2)
+
+    def test_decisions_of_a_pass_share_one_budget(self):
+        """Test that the decisions of one dispatch pass draw on a single budget"""
+        simulator, call_id = self._waiting_call()
+        planner = RolloutPlanner(budget=0.5, workers=0)
+
+        with planner.dispatch_pass():
+            assert planner.choose(simulator, call_id, [0, 1, 2]) == 2
+            time.sleep(0.5)
+            assert planner.choose(simulator, call_id, [0, 1, 2]) is None
+        assert planner.choose(simulator, call_id, [0, 1, 2]) == 2  # Outside a pass: a budget of its own
+
+    def test_pool_not_started_in_a_decision(self):
+        """Test that a decision does not start the workers but keeps the strategy's choice"""
+        simulator, call_id = self._waiting_call()
+        planner = RolloutPlanner(budget=10.0, workers=1)
+
+        assert planner.choose(simulator, call_id, [0, 1, 2]) is None
+        assert planner._pool is None
+
+    def test_call_completed_during_rollouts_is_not_assigned(self):
+        """Test that a call the API thread completes while rollouts run is left alone"""
+        simulator, call_id = self._waiting_call()
+        dispatcher = simulator.dispatcher
+        planner = dispatcher.rollout = RolloutPlanner(budget=10.0, workers=0)
+
+        def choose(world, call_id, candidates):
+            dispatcher.complete_call(call_id)  # Meanwhile, from the API thread
+            return 2
+
+        planner.choose = choose
+        assert dispatcher._process_pending_calls() == []
+        assert dispatcher.serving_elevator(call_id) is None
+        assert not any(car.task_queue for car in simulator.elevators)
+        assert dispatcher.assign_call(call_id, 0) is False
+
+    def test_invalid_settings_rejected(self):
+        """Test that a non-positive horizon or negative budget raises ValueError"""
+        with pytest.raises(ValueError):
+            RolloutPlanner(horizon=0)
+        with pytest.raises(ValueError):
+            RolloutPlanner(budget=-1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -7,6 +7,8 @@ as specified in the validation documentation (TC112-TC115).
 
 import pytest
 from unittest.mock import Mock, patch
+from backend.clock import VirtualClock
+from backend.models import BuildingConfig, DoorState, ElevatorState
 from backend.simulator import Simulator
 from backend.api.core import ElevatorAPI
 
@@ -46,6 +48,59 @@ class TestSimulatorAPIIntegration:
         assert hasattr(simulator, "elevators")
 
 
+class TestSimulatorBuildingConfig:
+    """Test cases for building the simulation from a BuildingConfig"""
+
+    def test_creates_configured_number_of_cars(self):
+        """Test that one elevator is created per configured car, with its timing"""
+        config = BuildingConfig(
+            min_floor=1, max_floor=20, num_elevators=5, car_timing={5: {"door_timeout": 7.0}}
+        )
+        simulator = Simulator(config=config)
+        simulator.set_api_and_initialize_components(Mock(spec=ElevatorAPI))
+
+        assert [e.id for e in simulator.elevators] == [1, 2, 3, 4, 5]
+        assert simulator.elevators[4].door_timeout == 7.0
+        assert simulator.dispatcher.config is config
+
+    def test_cars_skip_configured_floors(self):
+        """Test that a car travels over floors the building does not have"""
+        config = BuildingConfig(min_floor=1, max_floor=20, skipped_floors=[13])
+        simulator = Simulator(clock=VirtualClock(), config=config)
+        simulator.set_api_and_initialize_components(Mock(spec=ElevatorAPI))
+        elevator = simulator.elevators[0]
+        elevator.current_floor = 12
+
+        simulator.dispatcher.assign_task(0, 14, None)
+        while elevator.current_floor == 12:
+            simulator.clock.advance_to(simulator.next_event_time())
+            simulator.process_due_events()
+
+        assert elevator.current_floor == 14
+        assert elevator.previous_floor == 12
+
+
+    @pytest.mark.parametrize("vectorized", [False, True])
+    def test_cars_start_on_a_served_floor(self, vectorized):
+        """Test that in a building without floor 1 the cars start and reset on its lowest floor"""
+        if vectorized:
+            pytest.importorskip("numpy")
+        config = BuildingConfig(min_floor=2, max_floor=10, num_elevators=2)
+        simulator = Simulator(clock=VirtualClock(), vectorized=vectorized, config=config)
+        simulator.set_api_and_initialize_components(Mock(spec=ElevatorAPI))
+        elevator = simulator.elevators[0]
+
+        assert [e.current_floor for e in simulator.elevators] == [2, 2]
+        simulator.dispatcher.add_call(5, "down")
+        while elevator.current_floor != 5:
+            simulator.clock.advance_to(simulator.next_event_time())
+            simulator.process_due_events()
+        assert elevator.previous_floor == 4
+
+        elevator.reset()
+        assert elevator.current_floor == 2
+
+
 class TestSimulatorUpdate:
     """Test cases for simulator update behavior (TC114-TC115)"""
 
@@ -77,6 +132,138 @@ class TestSimulatorUpdate:
             pytest.fail(f"update() raised an exception with None dispatcher: {e}")
 
 
+class TestSimulatorEventScheduling:
+    """Test cases for the discrete-event scheduler"""
+
+    def setup_method(self):
+        self.clock = VirtualClock()
+        self.simulator = Simulator(clock=self.clock)
+        self.simulator.set_api_and_initialize_components(Mock(spec=ElevatorAPI))
+
+    def test_idle_building_has_no_events(self):
+        """Test that an idle building schedules nothing"""
+        assert self.simulator.next_event_time() is None
+        assert not self.simulator.process_due_events()
+
+    def test_door_command_schedules_event(self):
+        """Test that a door command followed by notify() schedules its completion"""
+        elevator = self.simulator.elevators[0]
+        elevator.open_door()
+        self.simulator.notify()
+
+        assert self.simulator.next_event_time() == elevator.door_operation_time
+
+    def test_only_due_elevators_are_updated(self):
+        """Test that process_due_events() leaves cars without due deadlines alone"""
+        self.simulator.elevators[0].open_door()
+        self.simulator.notify()
+
+        with patch.object(self.simulator.elevators[1], "update") as idle_update:
+            self.clock.advance_to(self.simulator.next_event_time())
+            assert self.simulator.process_due_events()
+            idle_update.assert_not_called()
+
+        assert self.simulator.elevators[0].door_state == DoorState.OPEN
+
+    def test_wait_advances_virtual_clock_to_next_event(self):
+        """Test that waiting on a virtual clock jumps straight to the next deadline"""
+        self.simulator.elevators[0].open_door()
+        self.simulator.notify()
+
+        self.simulator.wait_for_next_event(max_wait=10.0)
+
+        assert self.clock.now() == self.simulator.elevators[0].door_operation_time
+
+    def test_call_served_through_events(self):
+        """Test that a hall call is served end to end by stepping from event to event"""
+        self.simulator.dispatcher.add_call(3, "down")
+        self.simulator.notify()
+
+        for _ in range(100):
+            self.simulator.process_due_events()
+            next_event = self.simulator.next_event_time()
+            if next_event is None:
+                break
+            self.clock.advance_to(next_event)
+
+        elevator = self.simulator.elevators[0]
+        assert elevator.current_floor == 3
+        assert elevator.door_state == DoorState.CLOSED
+        assert not self.simulator.dispatcher.pending_calls
+
+
+class TestSimulatorFastForward:
+    """Test cases for fast-forwarding over idle time"""
+
+    def _build(self):
+        clock = VirtualClock()
+        simulator = Simulator(clock=clock)
+        api = Mock(spec=ElevatorAPI)
+        messages = []
+        api.send_door_opened_message.side_effect = lambda i: messages.append(
+            f"door_opened#{i}"
+        )
+        api.send_door_closed_message.side_effect = lambda i: messages.append(
+            f"door_closed#{i}"
+        )
+        api.send_floor_arrived_message.side_effect = lambda i, f, d: messages.append(
+            f"floor_arrived@{f}#{i}"
+        )
+        simulator.set_api_and_initialize_components(api)
+        return clock, simulator, messages
+
+    def test_no_jump_while_elevator_moving(self):
+        """Test that fast-forward refuses to skip time while a car is moving"""
+        clock, simulator, _ = self._build()
+        simulator.dispatcher.add_call(3, "down")
+        simulator.notify()
+        simulator.process_due_events()
+
+        assert simulator.elevators[0].state != ElevatorState.IDLE
+        assert not simulator.fast_forward()
+
+    def test_no_jump_with_queued_command(self):
+        """Test that fast-forward waits for a pending command to be handled"""
+        clock, simulator, _ = self._build()
+        simulator.elevators[0].open_door()
+        simulator.notify()
+
+        assert not simulator.fast_forward()
+        assert clock.now() == 0.0
+
+    def test_jump_to_next_door_event(self):
+        """Test that an idle building jumps straight to the next door event"""
+        clock, simulator, _ = self._build()
+        simulator.elevators[0].open_door()
+        simulator.notify()
+        simulator.wait_for_next_event(max_wait=0)  # Consume the wake-up
+
+        assert simulator.fast_forward()
+        assert clock.now() == simulator.elevators[0].door_operation_time
+
+    def test_same_message_sequence_as_ticking(self):
+        """Test that fast-forwarding emits exactly the messages of a ticked run"""
+        clock, simulator, ticked = self._build()
+        simulator.dispatcher.add_call(2, "up")
+        simulator.dispatcher.assign_task(1, -1, None)
+        for _ in range(3000):
+            simulator.update()
+            clock.advance(0.01)
+
+        clock, simulator, skipped = self._build()
+        simulator.dispatcher.add_call(2, "up")
+        simulator.dispatcher.assign_task(1, -1, None)
+        simulator.notify()
+        simulator.wait_for_next_event(max_wait=0)
+        while clock.now() < 30.0:
+            simulator.process_due_events()
+            if not simulator.fast_forward():
+                simulator.wait_for_next_event(max_wait=0.01)
+
+        assert skipped == ticked
+        assert "door_closed#1" in skipped and "door_closed#2" in skipped
+
+
 class TestSimulatorIntegration:
     """Integration tests for simulator with multiple components"""
 
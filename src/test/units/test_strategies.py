@@ -0,0 +1,140 @@
+"""
+Unit tests for dispatch strategies.
+
+Tests the strategy registry and its selection from the building
+configuration, which cars each strategy lets take a hall call, and how the
+strategies rank eligible cars.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from backend.dispatcher import Dispatcher
+from backend.elevator import Elevator
+from backend.models import BuildingConfig, DoorState, ElevatorState, MoveDirection, Task
+from backend.strategies import (
+    DISPATCH_STRATEGIES,
+    CollectiveControlStrategy,
+    EtdStrategy,
+    IdleEtaStrategy,
+    NearestCarStrategy,
+    create_strategy,
+)
+
+
+def make_car(floor, state=ElevatorState.IDLE, tasks=()):
+    car = Mock(spec=Elevator)
+    car.current_floor = floor
+    car.state = state
+    car.door_state = DoorState.CLOSED
+    car.task_queue = list(tasks)
+    return car
+
+
+@pytest.fixture
+def dispatcher():
+    world = Mock()
+    world.elevators = []
+    return Dispatcher(world, Mock(), config=BuildingConfig(min_floor=1, max_floor=10))
+
+
+class TestStrategyRegistry:
+    """Test cases for the strategy registry"""
+
+    def test_shipped_strategies_registered(self):
+        """Test that the four strategies are registered under their names"""
+        assert DISPATCH_STRATEGIES == {
+            "idle-eta": IdleEtaStrategy,
+            "nearest-car": NearestCarStrategy,
+            "collective": CollectiveControlStrategy,
+            "etd": EtdStrategy,
+        }
+
+    def test_unknown_strategy_rejected(self):
+        """Test that an unknown name raises ValueError listing the choices"""
+        with pytest.raises(ValueError, match="nearest-car"):
+            create_strategy("fastest")
+
+    def test_dispatcher_uses_building_strategy(self, dispatcher):
+        """Test that the dispatcher defaults to idle-eta and follows the building setting"""
+        world = Mock()
+        world.elevators = []
+        config = BuildingConfig(dispatch_strategy="etd")
+
+        assert isinstance(dispatcher.strategy, IdleEtaStrategy)
+        assert isinstance(Dispatcher(world, Mock(), config=config).strategy, EtdStrategy)
+
+
+class TestStrategyEligibility:
+    """Test cases for which cars a strategy lets take a call"""
+
+    def test_idle_eta_takes_only_free_cars(self, dispatcher):
+        """Test that the original policy ignores moving cars"""
+        strategy = IdleEtaStrategy()
+        moving = make_car(2, ElevatorState.MOVING_UP, [Task(floor=8)])
+
+        assert strategy.can_serve(dispatcher, make_car(2), 5, MoveDirection.UP)
+        assert not strategy.can_serve(dispatcher, moving, 5, MoveDirection.UP)
+        assert not strategy.may_serve(dispatcher, moving)
+
+    def test_nearest_car_takes_cars_heading_for_the_call(self, dispatcher):
+        """Test that a moving car takes calls ahead of it in its direction only"""
+        strategy = NearestCarStrategy()
+        moving = make_car(4, ElevatorState.MOVING_UP, [Task(floor=8)])
+
+        assert strategy.may_serve(dispatcher, moving)
+        assert strategy.can_serve(dispatcher, moving, 6, MoveDirection.UP)
+        assert not strategy.can_serve(dispatcher, moving, 6, MoveDirection.DOWN)
+        assert not strategy.can_serve(dispatcher, moving, 2, MoveDirection.UP)
+
+    def test_stopped_busy_car_is_not_eligible(self, dispatcher):
+        """Test that a car idle at a stop with tasks left cannot take a hall call"""
+        strategy = CollectiveControlStrategy()
+        car = make_car(4, tasks=[Task(floor=8)])
+        car.door_state = DoorState.OPEN
+
+        assert not strategy.may_serve(dispatcher, car)
+        assert not strategy.can_serve(dispatcher, car, 6, MoveDirection.UP)
+
+
+class TestStrategyCost:
+    """Test cases for how strategies rank cars"""
+
+    def test_nearest_car_prefers_passing_car(self, dispatcher):
+        """Test that a car passing by beats a free car at the same distance"""
+        strategy = NearestCarStrategy()
+        moving = make_car(4, ElevatorState.MOVING_UP, [Task(floor=8)])
+
+        assert strategy.cost(dispatcher, moving, 6, MoveDirection.UP) == 2
+        assert strategy.cost(dispatcher, make_car(8), 6, MoveDirection.UP) == 3
+
+    def test_collective_ranks_by_estimated_time(self, dispatcher):
+        """Test that collective control costs a car its ETA"""
+        car = make_car(4, ElevatorState.MOVING_UP, [Task(floor=8)])
+        car.calculate_estimated_time.return_value = 7.0
+
+        assert CollectiveControlStrategy().cost(dispatcher, car, 6, MoveDirection.UP) == 7.0
+        car.calculate_estimated_time.assert_called_once_with(6, MoveDirection.UP)
+
+    def test_etd_adds_delay_to_queued_stops(self):
+        """Test that ETD charges the door cycle the new stop costs the car's stops"""
+        world = Mock()
+        world.elevators = []
+        dispatcher = Dispatcher(world, Mock())
+        car = Elevator(1, world, Mock())
+        car.current_floor = 1
+        car.state = ElevatorState.MOVING_UP
+        car.direction = MoveDirection.UP
+        car.task_queue = [Task(floor=3)]
+        eta = car.calculate_estimated_time(2, MoveDirection.UP)
+
+        assert EtdStrategy().cost(dispatcher, car, 2, MoveDirection.UP) == (
+            eta + car.door_operation_time
+        )
+        assert EtdStrategy().cost(dispatcher, car, 3, MoveDirection.UP) == (
+            car.calculate_estimated_time(3, MoveDirection.UP)
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,208 @@
+"""
+Unit tests for the elevator task queue.
+
+Tests the list behaviour and LOOK ordering of TaskQueue and that its stop
+bitmasks and pivot counters follow every mutation, including the lookups used
+for direction decisions and duplicate checks.
+"""
+
+import random
+
+import pytest
+from unittest.mock import Mock
+
+from backend.elevator import Elevator
+from backend.eta import stop_profile
+from backend.models import MoveDirection, Task
+from backend.task_queue import HALL_DOWN, HALL_UP, INSIDE, TaskQueue
+
+
+class TestTaskQueueList:
+    """Test cases for the list behaviour of TaskQueue"""
+
+    def test_behaves_like_list(self):
+        """Test indexing, len, iteration, pop and comparison with a list"""
+        tasks = [Task(floor=3), Task(floor=4), Task(floor=1)]
+        queue = TaskQueue(tasks, floor=2)
+
+        assert len(queue) == 3
+        assert queue[0] is tasks[0]
+        assert list(queue) == tasks
+        assert queue == tasks
+        assert queue.pop(0) is tasks[0]
+        assert queue == tasks[1:]
+
+    def test_mutations_update_masks(self):
+        """Test that every mutation keeps the bitmasks in step"""
+        queue = TaskQueue(base=-1)
+        queue.append(Task(floor=3))
+        queue.insert(0, Task(floor=-1))
+        queue[1] = Task(floor=2)
+        assert [queue.has_stop_at(f) for f in (-1, 2, 3)] == [True, True, False]
+
+        del queue[0]
+        assert queue.stops == 1 << (2 - queue.base)
+
+        queue.clear()
+        assert queue.stops == 0 and not queue
+
+    def test_base_moves_down_for_lower_floors(self):
+        """Test that a floor below the base rebases the masks"""
+        queue = TaskQueue([Task(floor=2)], base=1)
+        queue.append(Task(floor=-3))
+
+        assert queue.base == -3
+        assert queue.nearest_above(-3) == 2
+        assert queue.nearest_below(2) == -3
+
+
+class TestTaskQueueScan:
+    """Test cases for the LOOK ordering of the two heaps"""
+
+    def test_inserts_follow_sweep_order(self):
+        """Test that stops are served up the sweep first, then back down"""
+        queue = TaskQueue(floor=3)
+        for floor in (5, 1, 8, 2, 4):
+            queue.append(Task(floor=floor))
+
+        assert [task.floor for task in queue] == [4, 5, 8, 2, 1]
+
+    def test_schedule_turns_sweep(self):
+        """Test that scheduling a down sweep serves the stops below first"""
+        queue = TaskQueue([Task(floor=f) for f in (4, 1, 2)], floor=3)
+
+        queue.schedule(3, MoveDirection.DOWN)
+
+        assert [task.floor for task in queue] == [2, 1, 4]
+
+    def test_schedule_moves_passed_stops(self):
+        """Test that stops the car has passed move behind the turn"""
+        queue = TaskQueue([Task(floor=f) for f in (2, 4, 6)], floor=1)
+
+        queue.schedule(5, MoveDirection.UP)
+
+        assert [task.floor for task in queue] == [6, 4, 2]
+
+    def test_stop_at_car_floor_comes_first(self):
+        """Test that a stop at the car's floor leads the queue in either sweep"""
+        queue = TaskQueue([Task(floor=f) for f in (5, 3, 1)], floor=2)
+
+        queue.schedule(3, MoveDirection.DOWN)
+
+        assert queue[0].floor == 3
+        assert [task.floor for task in queue] == [3, 1, 5]
+
+    def test_equal_floors_keep_arrival_order(self):
+        """Test that stops at the same floor are served in the order they arrived"""
+        first, second = Task(floor=4, call_id="a"), Task(floor=4)
+        queue = TaskQueue(floor=1)
+        queue.append(first)
+        queue.append(second)
+
+        assert queue.pop(0) is first
+        assert queue.pop(0) is second
+
+    def test_clone_serves_stops_in_same_order(self):
+        """Test that a clone keeps the order and indexes but changes independently"""
+        queue = TaskQueue([Task(floor=f) for f in (2, 4, 6)], floor=1)
+        queue.schedule(5, MoveDirection.UP)
+
+        twin = queue.clone()
+        twin.append(Task(floor=7, call_id=9, direction=MoveDirection.UP))
+        twin.pop(0)
+
+        assert [task.floor for task in queue] == [6, 4, 2]
+        assert [task.floor for task in twin] == [7, 4, 2]
+        assert not queue.has_call(9) and twin.has_call(9)
+        assert queue.masks != twin.masks
+
+
+class TestTaskQueueLookups:
+    """Test cases for the bitset stop lookups"""
+
+    def test_nearest_stops(self):
+        """Test nearest stop above and below a floor"""
+        queue = TaskQueue([Task(floor=f) for f in (-1, 2, 5, 9)])
+
+        assert queue.nearest_above(2) == 5
+        assert queue.nearest_below(2) == -1
+        assert queue.nearest_above(9) is None
+        assert queue.nearest_below(-1) is None
+        assert queue.nearest_above(-5) == -1
+        assert queue.has_stop_above(5) and not queue.has_stop_below(-1)
+
+    def test_stop_kinds(self):
+        """Test that inside, hall up and hall down stops use separate masks"""
+        queue = TaskQueue([
+            Task(floor=1),
+            Task(floor=2, call_id="a", direction=MoveDirection.UP),
+            Task(floor=3, call_id="b", direction=MoveDirection.DOWN),
+            Task(floor=4, call_id="c"),
+        ], base=1)
+
+        assert queue.masks[INSIDE] == 0b0001
+        assert queue.masks[HALL_UP] == 0b1010
+        assert queue.masks[HALL_DOWN] == 0b1100
+        assert queue.has_inside_stop(1) and not queue.has_inside_stop(2)
+
+    def test_shared_floor_keeps_bit_until_last_stop_leaves(self):
+        """Test that two stops at one floor keep the bit set until both are removed"""
+        first = Task(floor=3, call_id="a", direction=MoveDirection.UP)
+        second = Task(floor=3, call_id="b", direction=MoveDirection.UP)
+        queue = TaskQueue([first, second])
+
+        queue.remove(first)
+        assert queue.has_stop_at(3)
+        assert not queue.has_call("a") and queue.has_call("b")
+
+        queue.remove(second)
+        assert not queue.has_stop_at(3)
+
+
+
+class TestTaskQueueDirectionBookkeeping:
+    """Test cases for the live counters around the pivot"""
+
+    def _check(self, queue):
+        floors = [task.floor for task in queue]
+        pivot = queue.pivot
+        assert queue.count_above == sum(f > pivot for f in floors)
+        assert queue.count_below == sum(f < pivot for f in floors)
+        assert queue.count_here == floors.count(pivot)
+        assert queue.next_above == min((f for f in floors if f > pivot), default=None)
+        assert queue.next_below == max((f for f in floors if f < pivot), default=None)
+        assert queue.stop_profile() == stop_profile(floors)
+
+    def test_counters_follow_inserts_removals_and_moves(self):
+        """Test the counters and the stop profile against a recount after random operations"""
+        rng = random.Random(7)
+        queue = TaskQueue(base=-1, floor=1)
+        for _ in range(500):
+            op = rng.random()
+            if op < 0.4:
+                queue.append(Task(floor=rng.randint(-1, 12)))
+            elif op < 0.6 and queue:
+                queue.pop(0)
+            elif op < 0.7 and queue:
+                queue.remove(rng.choice(list(queue)))
+            elif op < 0.9:
+                queue.move_to(rng.randint(-1, 12))
+            else:
+                queue.schedule(rng.randint(-1, 12), rng.choice(list(MoveDirection)))
+            self._check(queue)
+
+    def test_direction_uses_counters_after_car_moves(self):
+        """Test that the elevator's direction decision follows the car's floor"""
+        elevator = Elevator(1, Mock(), Mock())
+        elevator.task_queue = [Task(floor=3)]
+        elevator.current_floor = 3
+        elevator.task_queue.append(Task(floor=-1))
+
+        elevator._determine_direction()
+
+        assert elevator.direction == MoveDirection.DOWN
+        assert elevator.task_queue.pivot == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
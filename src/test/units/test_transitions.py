@@ -0,0 +1,141 @@
+"""
+Unit tests for the elevator transition table.
+
+Tests the table structure, the step and deadline functions, and the
+correspondence of the table with the Elevator template of the UPPAAL model.
+"""
+
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+from unittest.mock import Mock
+
+from backend import transitions
+from backend.clock import VirtualClock
+from backend.elevator import Elevator
+from backend.models import DoorState, ElevatorState, Task
+from backend.transitions import TRANSITION_TABLE, UPPAAL_LOCATIONS
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "..", "model", "system.xml")
+
+
+def _uppaal_elevator_edges():
+    """(source, target) location names of the Elevator template, skipping committed locations."""
+    root = ET.parse(MODEL_PATH).getroot()
+    template = next(t for t in root.iter("template") if t.findtext("name") == "Elevator")
+    names = {loc.get("id"): loc.findtext("name") for loc in template.iter("location")}
+    committed = {loc.findtext("name") for loc in template.iter("location") if loc.find("committed") is not None}
+    edges = {
+        (names[t.find("source").get("ref")], names[t.find("target").get("ref")])
+        for t in template.iter("transition")
+    }
+    # Collapse paths through committed locations (e.g. D_Opening -> Call_Completing -> D_Open)
+    for src, mid in list(edges):
+        if mid in committed:
+            edges |= {(src, dst) for m, dst in edges if m == mid}
+    return edges
+
+
+def _elevator():
+    clock = VirtualClock()
+    world = Mock()
+    return Elevator(1, world, Mock(), clock), clock
+
+
+class TestTransitionTable:
+    """Test cases for the structure of the transition table"""
+
+    def test_every_state_pair_has_a_row(self):
+        """Test that the table covers all (state, door state) combinations"""
+        assert set(TRANSITION_TABLE) == {(s, d) for s in ElevatorState for d in DoorState}
+
+    def test_rows_map_to_uppaal_locations(self):
+        """Test that every row corresponds to a location of the UPPAAL Elevator template"""
+        edges = _uppaal_elevator_edges()
+        locations = {name for edge in edges for name in edge}
+
+        assert set(UPPAAL_LOCATIONS.values()) <= locations
+
+    def test_transitions_are_edges_of_the_uppaal_model(self):
+        """Test that each table transition with a target is an edge of the UPPAAL model"""
+        edges = _uppaal_elevator_edges()
+        for key, row in TRANSITION_TABLE.items():
+            for transition in row:
+                if transition.hold or key[0] is not ElevatorState.IDLE and key[1] is not DoorState.CLOSED:
+                    continue
+                if transition.target is None:
+                    target = key
+                elif transition.target[0] is None:
+                    target = (ElevatorState.MOVING_UP, transition.target[1])
+                else:
+                    target = transition.target
+                edge = (UPPAAL_LOCATIONS[key], UPPAAL_LOCATIONS[target])
+                assert edge in edges, f"{transition.event}: {edge} not in model"
+
+
+class TestTransitionFunctions:
+    """Test cases for the step and deadline functions"""
+
+    def test_door_cycle(self):
+        """Test that the door opens, times out and closes on its deadlines"""
+        elevator, clock = _elevator()
+        elevator.open_door()
+
+        assert transitions.next_deadline(elevator, clock.now()) == 1.0
+        clock.advance(1.0)
+        transitions.step(elevator, clock.now())
+        assert elevator.door_state == DoorState.OPEN
+        assert transitions.next_deadline(elevator, clock.now()) == 4.0
+
+        clock.advance(3.0)
+        transitions.step(elevator, clock.now())
+        assert elevator.door_state == DoorState.CLOSING
+
+    def test_step_before_deadline_does_nothing(self):
+        """Test that a transition whose timer has not expired is not fired"""
+        elevator, clock = _elevator()
+        elevator.task_queue = [Task(floor=3)]
+        elevator.request_movement_if_needed()
+
+        clock.advance(1.9)
+        transitions.step(elevator, clock.now())
+
+        assert elevator.current_floor == 1
+        assert transitions.next_deadline(elevator, clock.now()) == 2.0
+
+    def test_arrival_stops_car_and_continues_in_idle_row(self):
+        """Test that an announcement which stops the car is followed by the idle row"""
+        elevator, clock = _elevator()
+        elevator.task_queue = [Task(floor=2)]
+        elevator.request_movement_if_needed()
+        clock.advance(2.0)
+        transitions.step(elevator, clock.now())  # Reaches floor 2
+        transitions.step(elevator, clock.now())  # Processes the floor change
+
+        clock.advance(0.5)
+        transitions.step(elevator, clock.now())  # Announced: stops, then services the arrival
+
+        assert elevator.state == ElevatorState.IDLE
+        assert elevator.door_state == DoorState.OPENING
+        elevator.api.send_floor_arrived_message.assert_called_with(1, 2, None)
+
+    def test_quiescent_elevator_has_no_deadline(self):
+        """Test that an idle car without work reports no deadline"""
+        elevator, clock = _elevator()
+
+        assert transitions.next_deadline(elevator, clock.now()) is None
+
+    def test_no_departure_deadline_without_stop_elsewhere(self):
+        """Test that a car whose only stop is its own floor is not due to depart"""
+        elevator, clock = _elevator()
+        elevator.task_queue = [Task(floor=1)]
+        clock.advance(1.0)
+
+        assert transitions.next_deadline(elevator, clock.now()) is None
+        elevator.task_queue.append(Task(floor=3))
+        assert transitions.next_deadline(elevator, clock.now()) == 0.5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
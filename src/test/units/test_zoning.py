@@ -0,0 +1,276 @@
+"""
+Unit tests for zoned dispatch.
+
+Tests that split_zones() divides a building into stacked bands, that the
+ZonedDispatcher hands hall calls to the cars of the zone owning their floor
+and cross-zone calls to the best car of any owning zone, and that copies of
+a zoned building and zone passes in worker processes give the same
+assignments as in process, also when the workers fail or are too slow.
+"""
+
+import pickle
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from unittest.mock import Mock
+
+from backend.api.core import ElevatorAPI
+from backend.clock import VirtualClock
+from backend.models import BuildingConfig, Zone
+from backend.rollout import RolloutPlanner
+from backend.simulator import Simulator
+from backend.zoning import ZonedDispatcher, _zone_pass, split_zones
+from .conftest import StubPool
+
+# Floors 1-5 served by cars 1 and 2, floors 5-10 by cars 3 and 4; floor 5 is shared
+CONFIG = BuildingConfig(
+    min_floor=1,
+    max_floor=10,
+    num_elevators=4,
+    zones=[
+        {"floors": [1, 5], "elevators": [1, 2]},
+        {"floors": [5, 10], "elevators": [3, 4]},
+    ],
+)
+
+
+def zoned_simulator(floors=(1, 1, 10, 10)):
+    """Lockstep simulator of CONFIG with the cars parked at `floors`."""
+    simulator = Simulator(clock=VirtualClock(), lockstep=True, config=CONFIG)
+    simulator.set_api_and_initialize_components(Mock(spec=ElevatorAPI))
+    for elevator, floor in zip(simulator.elevators, floors):
+        elevator.current_floor = floor
+    return simulator
+
+
+def busy_zoned_simulator():
+    """Every car on a trip and hall calls waiting in both zones."""
+    simulator = zoned_simulator()
+    dispatcher = simulator.dispatcher
+    for elevator_idx, floor in enumerate((4, 3, 6, 8)):
+        dispatcher.assign_task(elevator_idx, floor)
+    for floor, direction in ((2, "up"), (3, "down"), (7, "up"), (9, "down"), (8, "down")):
+        dispatcher.add_call(floor, direction)
+    return simulator
+
+
+class InlinePool(Executor):
+    """Worker pool stand-in that runs each job here, then calls `after_submit` (the API thread)."""
+
+    def __init__(self, after_submit):
+        self.after_submit = after_submit
+
+    def submit(self, fn, *args, **kwargs):
+        job = Future()
+        job.set_result(fn(*args, **kwargs))
+        self.after_submit()
+        return job
+
+
+def assignments(simulator):
+    return {
+        call_id: call.assigned_elevator
+        for call_id, call in simulator.dispatcher.all_calls_log.items()
+    }
+
+
+class TestSplitZones:
+    """Test cases for split_zones"""
+
+    def test_stacked_bands_share_boundary_floors(self):
+        """Test that bands of about equal height meet at a shared floor and get blocks of cars"""
+        config = BuildingConfig(min_floor=1, max_floor=13, num_elevators=5)
+
+        zones = split_zones(config, 3)
+
+        assert zones == [Zone(1, 5, (1,)), Zone(5, 9, (2, 3)), Zone(9, 13, (4, 5))]
+        assert BuildingConfig(min_floor=1, max_floor=13, num_elevators=5, zones=zones).zones
+
+    @pytest.mark.parametrize("count", [0, 3])
+    def test_impossible_split_rejected(self, count):
+        """Test that more zones than cars (or none) raise ValueError"""
+        with pytest.raises(ValueError):
+            split_zones(BuildingConfig(min_floor=1, max_floor=10, num_elevators=2), count)
+
+
+class TestZonedDispatcher:
+    """Test cases for the ZonedDispatcher coordinator and its zones"""
+
+    def test_zoned_building_gets_coordinator(self):
+        """Test that a building with zones is dispatched per zone"""
+        dispatcher = zoned_simulator().dispatcher
+
+        assert isinstance(dispatcher, ZonedDispatcher)
+        assert [zone.elevator_indices for zone in dispatcher.zones] == [[0, 1], [2, 3]]
+        assert not isinstance(Simulator(config=BuildingConfig()).dispatcher, ZonedDispatcher)
+
+    def test_call_goes_to_car_of_its_zone(self):
+        """Test that a hall call is served by its zone even if another zone's car is nearer"""
+        simulator = zoned_simulator(floors=(1, 1, 6, 10))
+
+        call_id = simulator.dispatcher.add_call(4, "up")
+
+        assert simulator.dispatcher.serving_elevator(call_id) in (0, 1)
+
+    def test_cross_zone_call_takes_best_car_of_owning_zones(self):
+        """Test that a call at a shared floor goes to the nearest car of either zone"""
+        dispatcher = zoned_simulator(floors=(1, 1, 6, 10)).dispatcher
+
+        up = dispatcher.add_call(5, "up")
+        down = dispatcher.add_call(5, "down")
+
+        assert dispatcher.serving_elevator(up) == 2
+        assert dispatcher.serving_elevator(down) in (0, 1)  # Car 3 is taken; 4 is farther
+
+    def test_waiting_call_waits_for_its_zone(self):
+        """Test that a call waits for a car of its zone while the other zone's cars are idle"""
+        simulator = zoned_simulator()
+        dispatcher = simulator.dispatcher
+        dispatcher.assign_task(0, 4)
+        dispatcher.assign_task(1, 3)
+
+        call_id = dispatcher.add_call(2, "up")
+
+        assert call_id in dispatcher.zones[0].waiting
+        assert dispatcher.waiting_count() == 1
+        simulator.step(30.0)
+        assert dispatcher.waiting_count() == 0
+        assert dispatcher.all_calls_log[call_id].assigned_elevator in (0, 1)
+
+    def test_repeated_press_joins_call_in_zone(self):
+        """Test that the lit hall button of a zone is shared with the coordinator"""
+        simulator = zoned_simulator()
+        dispatcher = simulator.dispatcher
+        dispatcher.assign_task(2, 6)
+        dispatcher.assign_task(3, 6)
+
+        first = dispatcher.add_call(9, "down")
+        second = dispatcher.add_call(9, "down")
+
+        assert first == second
+        assert dispatcher.pending_calls[first].presses == 2
+
+    def test_options_apply_to_every_zone(self):
+        """Test that options set on the coordinator reach the zone dispatchers"""
+        dispatcher = zoned_simulator().dispatcher
+        planner = RolloutPlanner(workers=0)
+
+        strategy = Mock()
+
+        dispatcher.en_route_pickup = True
+        dispatcher.batch_assignment = True
+        dispatcher.rollout = planner
+        dispatcher.strategy = strategy
+
+        assert dispatcher.strategy is strategy and dispatcher.batch_assignment
+        assert all(
+            zone.en_route_pickup and zone.batch_assignment and zone.rollout is planner and zone.strategy is strategy
+            for zone in dispatcher.zones
+        )
+
+
+class TestZonedCopies:
+    """Test cases for cloning zoned buildings and zone passes in worker processes"""
+
+    def test_clone_keeps_zone_queues(self):
+        """Test that a copy keeps each zone's waiting calls and then runs on its own"""
+        simulator = busy_zoned_simulator()
+        waiting = [list(zone.waiting) for zone in simulator.dispatcher.zones]
+
+        clone = simulator.clone()
+        assert isinstance(clone.dispatcher, ZonedDispatcher)
+        assert [list(zone.waiting) for zone in clone.dispatcher.zones] == waiting
+
+        clone.step(60.0)
+        assert clone.dispatcher.waiting_count() == 0
+        assert [list(zone.waiting) for zone in simulator.dispatcher.zones] == waiting
+
+    def test_rollout_on_zoned_building(self):
+        """Test that rollouts choose between the cars of the call's zone"""
+        simulator = zoned_simulator(floors=(1, 4, 10, 10))
+        simulator.dispatcher.rollout = RolloutPlanner(budget=10.0, workers=0)
+
+        call_id = simulator.dispatcher.add_call(3, "down")
+
+        assert simulator.dispatcher.serving_elevator(call_id) == 1
+        assert simulator.dispatcher.rollout.decisions == 1
+
+    def test_zone_pass_on_copy_matches_in_process(self):
+        """Test that a zone pass run on a pickled copy makes the same assignments"""
+        simulator = busy_zoned_simulator()
+        for elevator, floor in zip(simulator.elevators, (1, 4, 6, 10)):
+            elevator.reset()  # Every car frees up at once
+            elevator.current_floor = floor
+        state = pickle.dumps(simulator.clone())
+
+        results = [_zone_pass(state, index) for index in range(2)]
+        simulator.dispatcher.update()
+
+        for result in results:
+            assert result  # Each zone assigned calls
+            assert result == [
+                (call_id, simulator.dispatcher.serving_elevator(call_id)) for call_id, _ in result
+            ]
+        assert sum(map(len, results)) == len(simulator.dispatcher.call_index)
+
+    def test_worker_pool_matches_in_process(self):
+        """Test that zone passes in worker processes give the same run as in process"""
+        inline, pooled = busy_zoned_simulator(), busy_zoned_simulator()
+        pooled.dispatcher.workers = 1
+        pooled.dispatcher.MIN_WORKER_CALLS = 0
+        pooled.dispatcher.start()
+        try:
+            for simulator in (inline, pooled):
+                simulator.step(120.0)
+        finally:
+            pooled.dispatcher.close()
+
+        assert assignments(pooled) == assignments(inline)
+        assert pooled.api.mock_calls == inline.api.mock_calls
+
+    @pytest.mark.parametrize("error", [None, RuntimeError("worker crashed"), BrokenProcessPool()])
+    def test_failed_or_late_zone_passes_run_in_process(self, error):
+        """Test that zone passes the workers do not deliver in time are run in process"""
+        inline, pooled = busy_zoned_simulator(), busy_zoned_simulator()
+        pooled.dispatcher._pool = StubPool(error)
+        pooled.dispatcher.MIN_WORKER_CALLS = 0
+        pooled.dispatcher.WORKER_BUDGET = 0.0
+        for simulator in (inline, pooled):
+            simulator.step(120.0)
+
+        assert assignments(pooled) == assignments(inline)
+        assert pooled.api.mock_calls == inline.api.mock_calls
+        # A broken pool is dropped: later passes stay in process
+        assert (pooled.dispatcher._pool is None) == isinstance(error, BrokenProcessPool)
+
+    @pytest.mark.parametrize("change", ["complete_call", "busy_car"])
+    def test_stale_worker_assignments_are_dropped(self, change):
+        """Test that worker assignments of calls or cars changed meanwhile are not applied"""
+        simulator = busy_zoned_simulator()
+        dispatcher = simulator.dispatcher
+        for elevator, floor in zip(simulator.elevators, (1, 4, 6, 10)):
+            elevator.reset()  # Every car frees up at once
+            elevator.current_floor = floor
+        call_id = next(iter(dispatcher.zones[0].waiting))
+
+        def api_thread():
+            if change == "complete_call":
+                dispatcher.complete_call(call_id)
+            else:
+                dispatcher.assign_task(0, 5)  # Car 1 takes a trip and is no longer free
+
+        dispatcher._pool = InlinePool(api_thread)
+        dispatcher.MIN_WORKER_CALLS = 0
+        dispatcher.update()
+
+        assigned = dict(assignments(simulator))
+        if change == "complete_call":
+            assert assigned[call_id] is None and call_id not in dispatcher.call_index
+        else:
+            # Car 1 takes none of the calls; the zone's other car takes one
+            assert 0 not in assigned.values() and 1 in assigned.values()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])